@@ -0,0 +1,259 @@
+"""
+Extraction and Analysis Result Cache
+Content-addressed cache for the PDF -> text -> analysis pipeline:
+- sha256 of the PDF bytes -> extracted text and page count
+- (sha256 of the text, target level, scorer version, model fingerprint) -> analyze_resume() result
+Results live in a byte-bounded in-memory LRU, optionally backed by an SQLite file
+shared by all workers. Analyses from another scorer version are never returned
+and are purged from SQLite when the service starts with a new version.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from model_registry import get_model_fingerprint
+from chunked_encoding import CHUNKED_ENCODING
+from pdf_text_extract import extract_pdf_document, read_pdf_stream, PDF_MAX_PAGES
+
+# Configuration
+ANALYSIS_CACHE_MB = float(os.environ.get('ANALYSIS_CACHE_MB', '32'))
+# Path of the SQLite tier; empty disables it
+ANALYSIS_CACHE_DB = os.environ.get('ANALYSIS_CACHE_DB', '')
+
+# Entries are {'text', 'pages'} (plain text under the previous 'pdf' namespace)
+PDF_NAMESPACE = 'pdf-document'
+ANALYSIS_NAMESPACE = 'analysis'
+
+
+def content_hash(data) -> str:
+    """sha256 of bytes or of a str (UTF-8)"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class _SQLiteTier:
+    """Results persisted in SQLite; one connection per process, WAL so workers can share the file"""
+
+    def __init__(self, path: str, scorer_version: str):
+        self.path = path
+        self.scorer_version = scorer_version
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+        with self._lock:
+            self._invalidate_other_versions()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'namespace TEXT NOT NULL, key TEXT NOT NULL, version TEXT NOT NULL, '
+                'value TEXT NOT NULL, created REAL NOT NULL, PRIMARY KEY (namespace, key))'
+            )
+            self._pid = os.getpid()
+        return self._connection
+
+    def _invalidate_other_versions(self) -> None:
+        connection = self._connect()
+        with connection:
+            deleted = connection.execute(
+                'DELETE FROM results WHERE namespace = ? AND version != ?',
+                (ANALYSIS_NAMESPACE, self.scorer_version)
+            ).rowcount
+        if deleted:
+            print(f"🧹 Dropped {deleted} cached analyses from older scorer versions")
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT value FROM results WHERE namespace = ? AND key = ?', (namespace, key)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, namespace: str, key: str, version: str, value: str) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                    (namespace, key, version, value, time.time())
+                )
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                if namespace:
+                    connection.execute('DELETE FROM results WHERE namespace = ?', (namespace,))
+                else:
+                    connection.execute('DELETE FROM results')
+
+
+class ResultCache:
+    """
+    Byte-bounded LRU of JSON-encoded results with an optional SQLite tier
+
+    Values are stored as JSON text, so every hit returns a fresh copy that the
+    caller may modify (the routes add extractedText to analysis results).
+    """
+
+    def __init__(self, max_bytes: int, scorer_version: str, db_path: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.scorer_version = scorer_version
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk = _SQLiteTier(db_path, scorer_version) if db_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get((namespace, key))
+            if value is not None:
+                self._entries.move_to_end((namespace, key))
+                self.hits += 1
+                return json.loads(value)
+
+        if self._disk is not None:
+            value = self._disk.get(namespace, key)
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._put_memory((namespace, key), value)
+                return json.loads(value)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, namespace: str, key: str, result: Any) -> None:
+        value = json.dumps(result)
+        with self._lock:
+            self._put_memory((namespace, key), value)
+        if self._disk is not None:
+            version = self.scorer_version if namespace == ANALYSIS_NAMESPACE else ''
+            self._disk.put(namespace, key, version, value)
+
+    def _put_memory(self, key: tuple, value: str) -> None:
+        old_value = self._entries.pop(key, None)
+        if old_value is not None:
+            self._bytes -= len(old_value)
+        self._entries[key] = value
+        self._bytes += len(value)
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop cached results (one namespace, or everything) from memory and disk"""
+        with self._lock:
+            for key in [key for key in self._entries if namespace in (None, key[0])]:
+                self._bytes -= len(self._entries.pop(key))
+        if self._disk is not None:
+            self._disk.clear(namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory use, for /health"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'memoryBytes': self._bytes,
+                'maxBytes': self.max_bytes,
+                'hits': self.hits,
+                'diskHits': self.disk_hits,
+                'misses': self.misses,
+                'hitRate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                'diskEnabled': self._disk is not None,
+                'scorerVersion': self.scorer_version
+            }
+
+
+def extract_document_cached(source) -> Optional[Dict[str, Any]]:
+    """
+    extract_pdf_document(source), reusing the text and page count of PDFs seen before
+
+    Args:
+        source: Path to the PDF file, the PDF bytes, or a binary stream
+
+    Returns:
+        dict: {'text': extracted text, 'pages': pages extracted}, or None if error
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            return extract_pdf_document(source)  # Reports the missing file
+        with open(source, 'rb') as f:
+            data = read_pdf_stream(f)
+    elif hasattr(source, 'read'):
+        # Oversized uploads are cut at the budget and rejected by extract_pdf_document
+        data = read_pdf_stream(source)
+    else:
+        data = bytes(source)
+
+    cache = get_result_cache()
+    # The page budget changes what is extracted, so it is part of the key
+    key = f"{content_hash(data)}:{PDF_MAX_PAGES}"
+    document = cache.get(PDF_NAMESPACE, key)
+    if document is None:
+        document = extract_pdf_document(data)
+        if document is not None:
+            cache.put(PDF_NAMESPACE, key, document)
+    return document
+
+
+def extract_text_cached(source) -> Optional[str]:
+    """The text of extract_document_cached(source), or None if error"""
+    document = extract_document_cached(source)
+    return document['text'] if document else None
+
+
+def analyze_cached(analyzer, text: str, target_level: Optional[str] = None) -> Dict[str, Any]:
+    """analyzer.analyze_resume(text, target_level), reusing the result for unchanged resumes"""
+    cache = get_result_cache()
+    model_fingerprint = get_model_fingerprint(analyzer.model) if analyzer.model is not None else 'rules'
+    if CHUNKED_ENCODING and analyzer.model is not None:
+        # Long resumes embed differently with chunking on
+        model_fingerprint += ':chunked'
+    key = f"{content_hash(text)}:{target_level}:{cache.scorer_version}:{model_fingerprint}"
+
+    result = cache.get(ANALYSIS_NAMESPACE, key)
+    if result is not None:
+        return result
+
+    result = analyzer.analyze_resume(text, target_level)
+    if result.get('success'):
+        cache.put(ANALYSIS_NAMESPACE, key, result)
+    return result
+
+
+# Singleton instance
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    """Get or create the process-wide result cache (singleton pattern)"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                from resume_analyzer_ml import SCORER_VERSION
+                _cache_instance = ResultCache(
+                    max_bytes=int(ANALYSIS_CACHE_MB * 1024 * 1024),
+                    scorer_version=SCORER_VERSION,
+                    db_path=ANALYSIS_CACHE_DB or None
+                )
+    return _cache_instance
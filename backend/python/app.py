@@ -3,29 +3,265 @@ Python Flask Server for Resume Analysis
 Runs independently from the TypeScript backend
 """
 
-from flask import Flask, request, jsonify
+# The autotuned configuration (python autotune.py) provides defaults for the
+# environment variables read by the modules imported below
+from autotune import apply_tuning, set_torch_threads, torch_threads_per_worker
+apply_tuning()
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
 import json
-from pdf_text_extract import extract_pdf_text
+import time
+import threading
+from model_registry import model_memory_report
+from embedding_cache import get_embedding_cache
+from encode_batcher import encoder_stats
+from analysis_cache import get_result_cache, extract_document_cached, analyze_cached
+from job_index import get_job_index, job_index_stats, SEARCH_MODES, JOB_INDEX_MODE
+from tracing import get_logger, start_trace
+from metrics import (
+    span, render as render_metrics, register_collector, sample_lines, start_request, request_timings,
+    server_timing, REQUEST_SECONDS, METRICS_ENABLED, SERVER_TIMING
+)
+
+# Configuration
+# Rule-only fast boot: serve extraction and rule-based scoring without loading models
+RULES_ONLY = os.environ.get('RULES_ONLY', '0') == '1'
+# Load the models on a background thread at startup, serving the rule-based fallbacks
+# (flagged "degraded") until they are warm; 0 loads them before serving
+BACKGROUND_WARMUP = os.environ.get('BACKGROUND_WARMUP', '1') == '1'
+# Seconds before a warm-up that failed after the model loaded is retried (a failed model load is not retried)
+WARM_UP_RETRY_SECONDS = float(os.environ.get('WARM_UP_RETRY_SECONDS', '30'))
 
-# Import ML modules
+# Import ML modules (torch and sentence_transformers are imported on first use)
 try:
-    from resume_analyzer_ml import get_analyzer as get_ml_analyzer
-    from job_matcher_ml import get_matcher as get_ml_matcher
-    ML_ENABLED = True
-    print("✅ ML modules loaded successfully")
+    from resume_analyzer_ml import get_analyzer as get_ml_analyzer, get_rule_analyzer, ML_AVAILABLE
+    from job_matcher_ml import get_matcher as get_ml_matcher, get_keyword_matcher, MATCH_STREAM_CHUNK_SIZE
+    from batch_analysis import analyze_batch, read_ndjson
+    ML_ENABLED = ML_AVAILABLE and not RULES_ONLY
+    if RULES_ONLY:
+        print("⚡ Rule-only mode: extraction and rule-based scoring, ML endpoints disabled")
+    elif ML_ENABLED:
+        print("✅ ML modules available")
+    else:
+        print("⚠️  ML libraries not installed - using rule-based scoring, ML endpoints disabled")
 except ImportError as e:
     ML_ENABLED = False
     print(f"⚠️  ML modules not available: {e}")
     print("   Service will not be available")
 
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, timing response serialization as the 'serialize' stage"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        with span('serialize'):
+            return super().dumps(obj, **kwargs)
+
+
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 CORS(app)  # Enable CORS for TypeScript backend to communicate
 
-# Configuration
-UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'temp')
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+logger = get_logger(__name__)
+
+# Set once the models are loaded and warm (see /ready); requests switch to ML when it is set
+_models_ready = threading.Event()
+# Set once warm-up will not run again: it succeeded, or the model failed to load
+_warm_up_finished = threading.Event()
+_warm_up_lock = threading.Lock()
+_warm_up_thread = None
+# Why the models are not ready (reported by /ready), and when a retryable warm-up last failed
+_warm_up_error = None
+_warm_up_failed_at = 0.0
+
+# Primes the encoder kernels for the shapes requests use and the scoring paths
+WARM_UP_RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567
+Experience
+Software Engineer, Acme Corp - Jan 2020 - Present
+- Built Python and Flask REST APIs serving 10,000+ users, cutting latency by 40%
+- Led migration of batch jobs to AWS with Docker and Kubernetes
+Education
+B.S. Computer Science, State University, 2019
+Skills
+Python, JavaScript, SQL, React, Docker, AWS"""
+WARM_UP_JOB = "Backend engineer to build Python services and REST APIs on AWS"
+
+
+def warm_up():
+    """
+    Load the analyzer and matcher, then run warm-up encodes and one analysis and match,
+    so no request pays for the model load or the first forward passes
+    Called by serve.py before forking workers, or on a background thread (start_warm_up)
+    A failed model load is final; other failures are retried after WARM_UP_RETRY_SECONDS.
+    """
+    global _warm_up_error, _warm_up_failed_at
+    with _warm_up_lock:
+        if _models_ready.is_set() or _warm_up_finished.is_set():
+            return
+        if not ML_ENABLED:
+            _models_ready.set()  # Nothing to load
+            _warm_up_finished.set()
+            return
+
+        start_time = time.time()
+        try:
+            analyzer = get_ml_analyzer()
+            matcher = get_ml_matcher()
+        except Exception as e:
+            logger.exception("❌ Model load failed: %s", e)
+            matcher = None
+        if matcher is None or matcher.model is None:
+            print("⚠️  Warm-up skipped: model failed to load, /ready will report not ready")
+            _warm_up_error = 'Model failed to load'
+            _warm_up_finished.set()
+            return
+
+        try:
+            # A single text, a padded batch and a full window - the shapes requests send
+            matcher.model.encode(["warm-up"], convert_to_numpy=True)
+            matcher.model.encode([WARM_UP_JOB] * 8, convert_to_numpy=True)
+            matcher.model.encode([WARM_UP_RESUME * 4], convert_to_numpy=True)
+            analyzer.analyze_resume(WARM_UP_RESUME)
+            matcher.calculate_match_score(WARM_UP_RESUME, WARM_UP_JOB, "Backend Engineer")
+            # Requests read this once, so each is served entirely by ML or by the fallbacks
+            _models_ready.set()
+            _warm_up_finished.set()
+            _warm_up_error = None
+            print(f"🔥 Models warm in {time.time() - start_time:.1f}s")
+        except Exception as e:
+            _warm_up_error = f'Warm-up failed: {e}'
+            _warm_up_failed_at = time.time()
+            logger.exception("❌ Warm-up failed, retrying in %gs: %s", WARM_UP_RETRY_SECONDS, e)
+
+
+def _warm_up_due() -> bool:
+    """True if no warm-up is running and one has not run yet, or failed and may be retried now"""
+    if _models_ready.is_set() or _warm_up_finished.is_set():
+        return False
+    if _warm_up_thread is not None and _warm_up_thread.is_alive():
+        return False
+    return time.time() - _warm_up_failed_at >= WARM_UP_RETRY_SECONDS
+
+
+def start_warm_up(background: bool = BACKGROUND_WARMUP) -> None:
+    """
+    Warm up on a background thread - requests are served by the degraded fallbacks until
+    the models are ready - or inline when background is False
+    """
+    global _warm_up_thread
+    if not background:
+        warm_up()
+        return
+    with _warm_up_lock:
+        if not _warm_up_due():
+            return
+        _warm_up_thread = threading.Thread(target=warm_up, name='model-warm-up', daemon=True)
+        _warm_up_thread.start()
+    print("⏳ Loading models in the background - serving rule-based fallbacks until warm")
+
+
+def _models_warm() -> bool:
+    """
+    True if this request should be served by the models
+    While a background warm-up runs it is False (the caller uses the fallback and flags the
+    response degraded). Without one - the app imported directly, e.g. in scripts - the
+    first request warms the models up, as before. A failed warm-up is retried the same way
+    once WARM_UP_RETRY_SECONDS have passed.
+    """
+    if _models_ready.is_set():
+        return True
+    if _warm_up_due():
+        start_warm_up(background=_warm_up_thread is not None)
+    return _models_ready.is_set()
+
+
+def _models_loading_response():
+    """503 for endpoints that have no fallback while the models load"""
+    response = jsonify({
+        'success': False,
+        'error': 'Models are loading, retry shortly',
+        'degraded': True
+    })
+    response.headers['Retry-After'] = '5'
+    return response, 503
+
+def _service_metrics():
+    """Gauges and counters for /metrics, from the stats also reported on /health"""
+    models = model_memory_report()
+    embedding_cache = get_embedding_cache().stats()
+    result_cache = get_result_cache().stats()
+    encoders = encoder_stats()
+    caches = [('embedding', embedding_cache['hits'] + embedding_cache['spillHits'], embedding_cache),
+              ('result', result_cache['hits'] + result_cache['diskHits'], result_cache)]
+    return (
+        sample_lines('jobhunter_model_load_seconds', 'Seconds it took to load each resident model',
+                     [({'model': model['model'], 'device': model['device']}, model['loadSeconds']) for model in models])
+        + sample_lines('jobhunter_model_memory_bytes', 'Memory used by each resident model',
+                       [({'model': model['model'], 'device': model['device']}, model['memoryBytes']) for model in models])
+        + sample_lines('jobhunter_models_ready', '1 once the models are loaded and warm',
+                       [({}, 1 if _models_ready.is_set() else 0)])
+        + sample_lines('jobhunter_cache_hits_total', 'Cache lookups answered from the cache',
+                       [({'cache': name}, hits) for name, hits, _ in caches], 'counter')
+        + sample_lines('jobhunter_cache_misses_total', 'Cache lookups that had to be computed',
+                       [({'cache': name}, stats['misses']) for name, _, stats in caches], 'counter')
+        + sample_lines('jobhunter_cache_hit_ratio', 'Share of cache lookups that were hits',
+                       [({'cache': name}, stats['hitRate']) for name, _, stats in caches])
+        + sample_lines('jobhunter_cache_memory_bytes', 'Memory used by each cache',
+                       [({'cache': name}, stats['memoryBytes']) for name, _, stats in caches])
+        + sample_lines('jobhunter_encode_queue_depth', 'Texts waiting for the batching encoder',
+                       [({'fingerprint': encoder['fingerprint']}, encoder['queueDepth']) for encoder in encoders])
+        + sample_lines('jobhunter_encode_avg_batch_size', 'Average texts per batched forward pass',
+                       [({'fingerprint': encoder['fingerprint']}, encoder['avgBatchSize']) for encoder in encoders])
+        + sample_lines('jobhunter_job_index_jobs', 'Jobs in each job index',
+                       [({'directory': index['directory']}, index['jobs']) for index in job_index_stats()])
+    )
+
+
+if METRICS_ENABLED:
+    register_collector(_service_metrics)
+
+    @app.before_request
+    def _start_request_metrics():
+        g.request_start = time.perf_counter()
+        start_request()
+
+    @app.after_request
+    def _record_request_metrics(response):
+        # Streamed responses are measured up to their headers
+        elapsed = time.perf_counter() - g.get('request_start', time.perf_counter())
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(elapsed, endpoint, request.method, response.status_code)
+        if SERVER_TIMING and request_timings():
+            response.headers['Server-Timing'] = server_timing(request_timings(), elapsed)
+        return response
+
+def _resume_analyzer():
+    """
+    (analyzer, degraded): the ML analyzer, or the rule-based one in rule-only mode,
+    without the ML libraries, or - degraded - while the models are loading
+    """
+    if not ML_ENABLED:
+        return get_rule_analyzer(), False
+    if _models_warm():
+        return get_ml_analyzer(), False
+    return get_rule_analyzer(), True
+
+def _job_matcher():
+    """(matcher, degraded): the ML matcher, or the keyword matcher while the models are loading"""
+    if _models_warm():
+        return get_ml_matcher(), False
+    return get_keyword_matcher(), True
+
+def _mark_degraded(result, degraded: bool):
+    """Flag a result served by a fallback while the models load (cached results are not modified)"""
+    return {**result, 'degraded': True} if degraded else result
+
+def _debug_requested(data) -> bool:
+    """debug=true in the JSON body or the query string returns the score breakdown"""
+    return (isinstance(data, dict) and data.get('debug') is True) or request.args.get('debug') == 'true'
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -33,9 +269,28 @@ def health_check():
     return jsonify({
         'status': 'ok',
         'service': 'Python Resume Analysis Service',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'models': model_memory_report(),
+        'embeddingCache': get_embedding_cache().stats(),
+        'encodeBatcher': encoder_stats(),
+        'resultCache': get_result_cache().stats(),
+        'jobIndex': job_index_stats()
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Stage latency histograms, request latency, model and cache stats in Prometheus text format"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 200 only once the models are loaded and warm, 503 before (requests get the degraded fallbacks)"""
+    if _models_ready.is_set():
+        return jsonify({'ready': True})
+    if _warm_up_error:
+        return jsonify({'ready': False, 'error': _warm_up_error}), 503
+    return jsonify({'ready': False}), 503
+
 @app.route('/api/extract-text', methods=['POST'])
 def extract_text():
     """Extract text from PDF file"""
@@ -45,7 +300,7 @@ def extract_text():
             # Check if file path is provided
             data = request.get_json()
             if data and 'filePath' in data:
-                pdf_path = data['filePath']
+                pdf_source = data['filePath']
             else:
                 return jsonify({
                     'success': False,
@@ -60,18 +315,18 @@ def extract_text():
                     'error': 'No file selected'
                 }), 400
             
-            # Save file temporarily
-            pdf_path = os.path.join(UPLOAD_FOLDER, file.filename)
-            file.save(pdf_path)
+            # Extract from the upload buffer - nothing is written to disk
+            pdf_source = file.stream
         
         # Extract text
-        text = extract_pdf_text(pdf_path)
+        document = extract_document_cached(pdf_source)
         
-        if text:
+        if document:
             return jsonify({
                 'success': True,
-                'text': text,
-                'length': len(text)
+                'text': document['text'],
+                'length': len(document['text']),
+                'pageCount': document['pages']
             })
         else:
             return jsonify({
@@ -87,14 +342,8 @@ def extract_text():
 
 @app.route('/api/analyze-text', methods=['POST'])
 def analyze_text():
-    """Analyze resume text and provide ATS score (ML-based)"""
+    """Analyze resume text and provide ATS score (ML-based; rule-based in rule-only mode)"""
     try:
-        if not ML_ENABLED:
-            return jsonify({
-                'success': False,
-                'error': 'ML modules not available'
-            }), 503
-            
         data = request.get_json()
         
         if not data or 'text' not in data:
@@ -106,11 +355,10 @@ def analyze_text():
         text = data['text']
         target_level = data.get('targetLevel', 'experienced')
         
-        # Use ML analyzer
-        analyzer = get_ml_analyzer()
-        result = analyzer.analyze_resume(text, target_level)
+        analyzer, degraded = _resume_analyzer()
+        result = analyze_cached(analyzer, text, target_level)
         
-        return jsonify(result)
+        return jsonify(_mark_degraded(result, degraded))
         
     except Exception as e:
         return jsonify({
@@ -120,20 +368,14 @@ def analyze_text():
 
 @app.route('/api/analyze-pdf', methods=['POST'])
 def analyze_pdf():
-    """Complete pipeline: extract text from PDF and analyze (ML-based)"""
+    """Complete pipeline: extract text from PDF and analyze (ML-based; rule-based in rule-only mode)"""
     try:
-        if not ML_ENABLED:
-            return jsonify({
-                'success': False,
-                'error': 'ML modules not available'
-            }), 503
-            
         # Check if file is in request
         if 'file' not in request.files:
             # Check if file path is provided
             data = request.get_json()
             if data and 'filePath' in data:
-                pdf_path = data['filePath']
+                pdf_source = data['filePath']
                 target_level = data.get('targetLevel', 'experienced')
             else:
                 return jsonify({
@@ -149,27 +391,28 @@ def analyze_pdf():
                     'error': 'No file selected'
                 }), 400
             
-            # Save file temporarily
-            pdf_path = os.path.join(UPLOAD_FOLDER, file.filename)
-            file.save(pdf_path)
+            # Extract from the upload buffer - nothing is written to disk
+            pdf_source = file.stream
             target_level = 'experienced'
         
         # Step 1: Extract text
-        text = extract_pdf_text(pdf_path)
+        document = extract_document_cached(pdf_source)
         
-        if not text:
+        if not document:
             return jsonify({
                 'success': False,
                 'error': 'Failed to extract text from PDF'
             }), 500
+        text = document['text']
         
-        # Step 2: Analyze text using ML
-        analyzer = get_ml_analyzer()
-        analysis_result = analyzer.analyze_resume(text, target_level)
+        # Step 2: Analyze text (ML unless in rule-only mode or while the models load)
+        analyzer, degraded = _resume_analyzer()
+        analysis_result = _mark_degraded(analyze_cached(analyzer, text, target_level), degraded)
         
         # Add extracted text to response
         analysis_result['extractedText'] = text
         analysis_result['textLength'] = len(text)
+        analysis_result['pageCount'] = document['pages']
         
         return jsonify(analysis_result)
         
@@ -186,15 +429,23 @@ def root():
         'service': 'Python Resume Analysis API',
         'version': '1.0.0',
         'mlEnabled': ML_ENABLED,
+        'mode': 'rules' if RULES_ONLY else 'ml',
         'endpoints': {
             'health': '/health',
+            'ready': '/ready',
+            'metrics': '/metrics',
             'extractText': '/api/extract-text',
             'analyzeText': '/api/analyze-text',
             'analyzePdf': '/api/analyze-pdf',
             'analyzeTextML': '/api/ml/analyze-text',
             'analyzePdfML': '/api/ml/analyze-pdf',
             'matchJob': '/api/ml/match-job',
-            'batchMatchJobs': '/api/ml/batch-match-jobs'
+            'batchMatchJobs': '/api/ml/batch-match-jobs',
+            'batchAnalyze': '/api/ml/batch-analyze',
+            'upsertJobs': '/api/ml/jobs/upsert',
+            'ingestJobs': '/api/ml/jobs/ingest',
+            'removeJobs': '/api/ml/jobs/remove',
+            'recommendJobs': '/api/ml/recommend-jobs'
         }
     })
 
@@ -223,11 +474,11 @@ def analyze_text_ml():
         text = data['text']
         target_level = data.get('targetLevel', None)  # 'entry', 'mid', 'senior'
         
-        # Use ML analyzer
-        analyzer = get_ml_analyzer()
-        result = analyzer.analyze_resume(text, target_level)
+        # Use ML analyzer (rule-based while the models load)
+        analyzer, degraded = _resume_analyzer()
+        result = analyze_cached(analyzer, text, target_level)
         
-        return jsonify(result)
+        return jsonify(_mark_degraded(result, degraded))
         
     except Exception as e:
         return jsonify({
@@ -250,7 +501,7 @@ def analyze_pdf_ml():
             # Check if file path is provided
             data = request.get_json()
             if data and 'filePath' in data:
-                pdf_path = data['filePath']
+                pdf_source = data['filePath']
             else:
                 return jsonify({
                     'success': False,
@@ -265,33 +516,33 @@ def analyze_pdf_ml():
                     'error': 'No file selected'
                 }), 400
             
-            # Save file temporarily
-            pdf_path = os.path.join(UPLOAD_FOLDER, file.filename)
-            file.save(pdf_path)
+            # Extract from the upload buffer - nothing is written to disk
+            pdf_source = file.stream
         
         # Step 1: Extract text
-        text = extract_pdf_text(pdf_path)
+        document = extract_document_cached(pdf_source)
         
-        if not text:
+        if not document:
             return jsonify({
                 'success': False,
                 'error': 'Failed to extract text from PDF'
             }), 500
+        text = document['text']
         
         # Get target level from form data or JSON
         target_level = request.form.get('targetLevel') if request.files else request.get_json().get('targetLevel')
         
-        # Step 2: Analyze text with ML
-        analyzer = get_ml_analyzer()
-        analysis_result = analyzer.analyze_resume(text, target_level)
+        # Step 2: Analyze text with ML (rule-based while the models load)
+        analyzer, degraded = _resume_analyzer()
+        analysis_result = _mark_degraded(analyze_cached(analyzer, text, target_level), degraded)
         
         # Add extracted text to response
         analysis_result['extractedText'] = text
         analysis_result['textLength'] = len(text)
+        analysis_result['pageCount'] = document['pages']
         
-        # DEBUG: Log what we're returning
-        print(f"🔍 PYTHON RETURNING extractedInfo.skills: {analysis_result.get('extractedInfo', {}).get('skills', [])}") 
-        print(f"🔍 PYTHON skills count: {len(analysis_result.get('extractedInfo', {}).get('skills', []))}")
+        logger.debug("🔍 Returning %d skills: %s", len(analysis_result.get('extractedInfo', {}).get('skills', [])),
+                     analysis_result.get('extractedInfo', {}).get('skills', []))
         
         return jsonify(analysis_result)
         
@@ -326,16 +577,18 @@ def match_job_ml():
         experience_level = data.get('experienceLevel', 'entry')
         years_of_experience = data.get('yearsOfExperience', 0)
         
-        print(f"\n🎯 API: Single Job Match Request")
-        print(f"   Job: {job_title[:60] if job_title else 'N/A'}")
-        print(f"   Resume: {len(resume_text)} chars, ATS: {ats_score}")
+        logger.debug("🎯 Single job match: %r, resume %d chars, ATS %s",
+                     job_title[:60] if job_title else 'N/A', len(resume_text), ats_score)
         
-        # Use ML matcher
-        matcher = get_ml_matcher()
-        result = matcher.calculate_match_score(
-            resume_text, job_description, job_title, ats_score,
-            experience_level, years_of_experience
-        )
+        # Use ML matcher (keyword matching while the models load)
+        matcher, degraded = _job_matcher()
+        with start_trace('match-job', _debug_requested(data)) as trace:
+            result = _mark_degraded(matcher.calculate_match_score(
+                resume_text, job_description, job_title, ats_score,
+                experience_level, years_of_experience
+            ), degraded)
+        if trace.debug:
+            result['debug'] = trace.breakdown()
         
         return jsonify(result)
         
@@ -347,7 +600,12 @@ def match_job_ml():
 
 @app.route('/api/ml/batch-match-jobs', methods=['POST'])
 def batch_match_jobs_ml():
-    """Calculate match scores for multiple jobs (batch processing)"""
+    """
+    Calculate match scores for multiple jobs (batch processing)
+    Jobs are sent in full ('jobs') or referenced by index id ('jobIds', see /api/ml/jobs/ingest).
+    With "stream": true (or Accept: application/x-ndjson) results are streamed as NDJSON,
+    one line per job as each chunk is scored, then a summary line.
+    """
     if not ML_ENABLED:
         return jsonify({
             'success': False,
@@ -357,44 +615,322 @@ def batch_match_jobs_ml():
     try:
         data = request.get_json()
         
-        if not data or 'resumeText' not in data or 'jobs' not in data:
+        if not data or 'resumeText' not in data or ('jobs' not in data and 'jobIds' not in data):
             return jsonify({
                 'success': False,
-                'error': 'resumeText and jobs array are required'
+                'error': 'resumeText and a jobs or jobIds array are required'
             }), 400
         
         resume_text = data['resumeText']
-        jobs = data['jobs']
+        jobs = data['jobs'] if 'jobs' in data else data['jobIds']
         ats_score = data.get('atsScore', 0)
         experience_level = data.get('experienceLevel', 'entry')
         years_of_experience = data.get('yearsOfExperience', 0)
         
+        if not isinstance(jobs, list) or len(jobs) == 0:
+            return jsonify({
+                'success': False,
+                'error': f"{'jobs' if 'jobs' in data else 'jobIds'} must be a non-empty array"
+            }), 400
+        
+        logger.debug("🚀 Batch job match: %d %s, resume %d chars, ATS %s, candidate %s level with %s years",
+                     len(jobs), 'jobs' if 'jobs' in data else 'indexed jobs', len(resume_text), ats_score,
+                     experience_level, years_of_experience)
+        debug = _debug_requested(data)
+        
+        # Use ML matcher for batch processing (keyword matching while the models load)
+        matcher, degraded = _job_matcher()
+        if 'jobs' not in data and degraded:
+            return _models_loading_response()
+        if 'jobs' not in data and matcher.model is None:
+            return jsonify({
+                'success': False,
+                'error': 'Model not available'
+            }), 503
+        
+        if data.get('stream') is True or request.accept_mimetypes.best == 'application/x-ndjson':
+            chunk_size = int(data.get('chunkSize', MATCH_STREAM_CHUNK_SIZE))
+            job_ids = [str(job_id) for job_id in jobs] if 'jobs' not in data else None
+            
+            def generate():
+                try:
+                    with start_trace('batch-match-jobs', debug) as trace:
+                        for result in matcher.iter_batch_matches(
+                            resume_text, jobs if job_ids is None else None, ats_score,
+                            experience_level, years_of_experience, job_ids, chunk_size
+                        ):
+                            if result.get('summary') and degraded:
+                                result['degraded'] = True
+                            if result.get('summary') and trace.debug:
+                                result['debug'] = trace.breakdown()
+                            yield json.dumps(result) + '\n'
+                except Exception as e:
+                    logger.exception("❌ Error in batch matching: %s", e)
+                    yield json.dumps({'success': False, 'error': str(e)}) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        with start_trace('batch-match-jobs', debug) as trace:
+            if 'jobs' in data:
+                results = matcher.batch_calculate_matches(
+                    resume_text, jobs, ats_score,
+                    experience_level, years_of_experience
+                )
+            else:
+                results = matcher.match_indexed_jobs(
+                    resume_text, [str(job_id) for job_id in jobs], ats_score,
+                    experience_level, years_of_experience
+                )
+        
+        response = _mark_degraded({
+            'success': True,
+            'results': results,
+            'count': len(results)
+        }, degraded)
+        if trace.debug:
+            response['debug'] = trace.breakdown()
+        return jsonify(response)
+        
+    except Exception as e:
+        logger.exception("❌ Error in batch matching: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/ml/batch-analyze', methods=['POST'])
+def batch_analyze_ml():
+    """
+    Analyze many resumes (for backfills after a scoring change)
+    Body: {"resumes": [{"id", "text" | "filePath", "targetLevel"?}], "targetLevel"?} or the same
+    items as NDJSON (Content-Type: application/x-ndjson, targetLevel as a query parameter).
+    Streams one NDJSON result line per resume, in input order, then a summary line.
+    """
+    if not ML_ENABLED:
+        return jsonify({
+            'success': False,
+            'error': 'ML modules not available. Install: pip install sentence-transformers torch'
+        }), 503
+    if not _models_warm():
+        # Backfills should not store rule-based scores
+        return _models_loading_response()
+    
+    if request.mimetype == 'application/x-ndjson':
+        # Read lazily - the first results are written before the whole body has arrived
+        items = read_ndjson(request.stream)
+        target_level = request.args.get('targetLevel')
+    else:
+        data = request.get_json(silent=True)
+        if not data or not isinstance(data.get('resumes'), list):
+            return jsonify({
+                'success': False,
+                'error': 'resumes array (or an NDJSON body) is required'
+            }), 400
+        items = data['resumes']
+        target_level = data.get('targetLevel')
+    
+    def generate():
+        try:
+            for result in analyze_batch(items, target_level):
+                yield json.dumps(result) + '\n'
+        except Exception as e:
+            logger.exception("❌ Error in batch analysis: %s", e)
+            yield json.dumps({'success': False, 'error': str(e)}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/ml/jobs/upsert', methods=['POST'])
+def upsert_jobs_ml():
+    """Add or update jobs in the job index - each job is encoded once, not on every match request"""
+    if not ML_ENABLED:
+        return jsonify({
+            'success': False,
+            'error': 'ML modules not available. Install: pip install sentence-transformers torch'
+        }), 503
+    
+    try:
+        data = request.get_json()
+        jobs = data.get('jobs') if data else None
+        
         if not isinstance(jobs, list) or len(jobs) == 0:
             return jsonify({
                 'success': False,
                 'error': 'jobs must be a non-empty array'
             }), 400
+        if any(not isinstance(job, dict) or job.get('id') in (None, '') for job in jobs):
+            return jsonify({
+                'success': False,
+                'error': 'every job needs an id'
+            }), 400
+        
+        if not _models_warm():
+            return _models_loading_response()
+        matcher = get_ml_matcher()
+        if matcher.model is None:
+            return jsonify({
+                'success': False,
+                'error': 'Model not available'
+            }), 503
+        index = get_job_index(matcher.model)
+        counts = index.upsert(jobs)
+        
+        return jsonify({
+            'success': True,
+            **counts,
+            'total': index.stats()['jobs']
+        })
+        
+    except Exception as e:
+        logger.exception("❌ Error upserting jobs: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/ml/jobs/ingest', methods=['POST'])
+def ingest_jobs_ml():
+    """
+    Ingest fetched jobs (e.g. a Jooble refresh) into the job index, deduped by URL and text
+    Ids are optional; the response maps each input job to its indexed id ('ids'),
+    which /api/ml/batch-match-jobs accepts as jobIds.
+    """
+    if not ML_ENABLED:
+        return jsonify({
+            'success': False,
+            'error': 'ML modules not available. Install: pip install sentence-transformers torch'
+        }), 503
+    
+    try:
+        data = request.get_json()
+        jobs = data.get('jobs') if data else None
+        
+        if not isinstance(jobs, list) or len(jobs) == 0:
+            return jsonify({
+                'success': False,
+                'error': 'jobs must be a non-empty array'
+            }), 400
+        if any(not isinstance(job, dict) or not (job.get('title') or job.get('description')) for job in jobs):
+            return jsonify({
+                'success': False,
+                'error': 'every job needs a title or description'
+            }), 400
+        
+        if not _models_warm():
+            return _models_loading_response()
+        matcher = get_ml_matcher()
+        if matcher.model is None:
+            return jsonify({
+                'success': False,
+                'error': 'Model not available'
+            }), 503
+        index = get_job_index(matcher.model)
+        counts = index.upsert(jobs, dedupe=True)
+        
+        return jsonify({
+            'success': True,
+            **counts,
+            'total': index.stats()['jobs']
+        })
+        
+    except Exception as e:
+        logger.exception("❌ Error ingesting jobs: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/ml/jobs/remove', methods=['POST'])
+def remove_jobs_ml():
+    """Remove jobs from the job index by id"""
+    if not ML_ENABLED:
+        return jsonify({
+            'success': False,
+            'error': 'ML modules not available. Install: pip install sentence-transformers torch'
+        }), 503
+    
+    try:
+        data = request.get_json()
+        ids = data.get('ids') if data else None
         
-        print(f"\n🚀 API: Batch Job Match Request")
-        print(f"   Jobs: {len(jobs)}")
-        print(f"   Resume: {len(resume_text)} chars, ATS: {ats_score}")
-        print(f"   Candidate: {experience_level} level, {years_of_experience} years\n")
+        if not isinstance(ids, list):
+            return jsonify({
+                'success': False,
+                'error': 'ids array is required'
+            }), 400
         
-        # Use ML matcher for batch processing
+        if not _models_warm():
+            return _models_loading_response()
         matcher = get_ml_matcher()
-        results = matcher.batch_calculate_matches(
-            resume_text, jobs, ats_score,
-            experience_level, years_of_experience
-        )
+        if matcher.model is None:
+            return jsonify({
+                'success': False,
+                'error': 'Model not available'
+            }), 503
+        index = get_job_index(matcher.model)
+        removed = index.remove(ids)
         
         return jsonify({
+            'success': True,
+            'removed': removed,
+            'total': index.stats()['jobs']
+        })
+        
+    except Exception as e:
+        logger.exception("❌ Error removing jobs: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/ml/recommend-jobs', methods=['POST'])
+def recommend_jobs_ml():
+    """Top-K jobs from the job index for a resume: one resume encode, one similarity search"""
+    if not ML_ENABLED:
+        return jsonify({
+            'success': False,
+            'error': 'ML modules not available. Install: pip install sentence-transformers torch'
+        }), 503
+    
+    try:
+        data = request.get_json()
+        
+        if not data or 'resumeText' not in data:
+            return jsonify({
+                'success': False,
+                'error': 'resumeText is required'
+            }), 400
+        
+        mode = data.get('mode', JOB_INDEX_MODE)
+        if mode not in SEARCH_MODES:
+            return jsonify({
+                'success': False,
+                'error': f"mode must be one of {', '.join(SEARCH_MODES)}"
+            }), 400
+        
+        if not _models_warm():
+            return _models_loading_response()
+        matcher = get_ml_matcher()
+        with start_trace('recommend-jobs', _debug_requested(data)) as trace:
+            results = matcher.recommend_jobs(
+                data['resumeText'],
+                int(data.get('k', 20)),
+                data.get('atsScore', 0),
+                data.get('experienceLevel', 'entry'),
+                data.get('yearsOfExperience', 0),
+                mode
+            )
+        
+        response = {
             'success': True,
             'results': results,
             'count': len(results)
-        })
+        }
+        if trace.debug:
+            response['debug'] = trace.breakdown()
+        return jsonify(response)
         
     except Exception as e:
-        print(f"❌ Error in batch matching: {e}")
+        logger.exception("❌ Error recommending jobs: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -408,10 +944,13 @@ if __name__ == '__main__':
     print('=' * 60)
     print('🐍 Python Resume Analysis Service')
     print('=' * 60)
-    print(f'ML Enabled: {"✅ Yes" if ML_ENABLED else "⚠️  No (using rule-based fallback)"}')
+    print(f'ML Enabled: {"✅ Yes" if ML_ENABLED else "⚠️  No (using rule-based fallback)"}'
+          f'{" - rule-only mode" if RULES_ONLY else ""}')
     print('Server running on: http://localhost:5000')
     print('Endpoints:')
     print('  GET  /health - Health check')
+    print('  GET  /ready - Readiness probe')
+    print('  GET  /metrics - Prometheus metrics')
     print('  POST /api/extract-text - Extract text from PDF')
     print('  POST /api/analyze-text - Analyze resume text (rule-based)')
     print('  POST /api/analyze-pdf - Complete analysis pipeline (rule-based)')
@@ -420,6 +959,18 @@ if __name__ == '__main__':
         print('  POST /api/ml/analyze-pdf - Complete analysis pipeline (ML)')
         print('  POST /api/ml/match-job - Match resume to job (ML)')
         print('  POST /api/ml/batch-match-jobs - Batch match jobs (ML)')
+        print('  POST /api/ml/batch-analyze - Bulk resume analysis, streamed as NDJSON (ML)')
+        print('  POST /api/ml/jobs/upsert - Add/update jobs in the job index (ML)')
+        print('  POST /api/ml/jobs/ingest - Ingest fetched jobs, deduped by URL/text (ML)')
+        print('  POST /api/ml/jobs/remove - Remove jobs from the job index (ML)')
+        print('  POST /api/ml/recommend-jobs - Top-K indexed jobs for a resume (ML)')
+    print('Development server - for production use: python serve.py')
     print('=' * 60)
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Debug mode (and its reloader, which loads the models twice) is opt-in
+    debug = os.environ.get('FLASK_DEBUG') == '1'
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        # One process: the whole CPU, or TORCH_THREADS (explicit or autotuned)
+        set_torch_threads(torch_threads_per_worker(1))
+        start_warm_up()
+    app.run(host='0.0.0.0', port=5000, debug=debug, use_reloader=debug, threaded=True)
@@ -0,0 +1,281 @@
+"""
+Encoder Autotuner
+Benchmarks representative encodes on this host across worker counts, torch threads
+per worker and encode batch sizes, and writes the fastest configuration to
+AUTOTUNE_FILE. serve.py and app.py apply that file at startup, as defaults for
+WEB_WORKERS, TORCH_THREADS and ENCODE_MAX_BATCH - variables that are set explicitly
+still win - and size each process's torch thread pool with set_torch_threads().
+
+Each trial forks `workers` processes sharing the loaded model (as serve.py's preloading
+does), pins each to `threads` torch threads and has them serve a mix of analyze-style
+requests (one resume) and batch-match-style requests (JOBS_PER_REQUEST jobs, encoded
+`batch_size` texts per forward pass) for a fixed time. Reported per trial: texts per
+second over all workers and p50/p99 latency per request.
+
+Usage: python autotune.py [--workers 1,2,4] [--threads 1,2,4] [--batch-sizes 8,16,32,64]
+                          [--seconds 5] [--max-p99-ms MS] [--output PATH] [--dry-run]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import multiprocessing
+from typing import Any, Dict, List, Optional
+
+# Configuration
+# Host-specific, so kept with the other generated artifacts rather than in the source tree
+AUTOTUNE_FILE = os.environ.get('AUTOTUNE_FILE', os.path.expanduser('~/.cache/huggingface/jobhunter/autotune.json'))
+# Jobs per batch-match-style request in the tuning workload
+JOBS_PER_REQUEST = 32
+
+# Tuned setting -> environment variable it provides the default for
+_SETTINGS = {
+    'workers': 'WEB_WORKERS',
+    'torchThreads': 'TORCH_THREADS',
+    'encodeMaxBatch': 'ENCODE_MAX_BATCH',
+}
+
+
+def load_tuning(path: str = AUTOTUNE_FILE) -> Optional[Dict[str, Any]]:
+    """The tuned configuration, or None if there is none for this host"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as handle:
+            tuning = json.load(handle)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring {path}: {e}")
+        return None
+    cpus = tuning.get('host', {}).get('cpus')
+    if cpus != os.cpu_count():
+        print(f"⚠️  Ignoring {path}: tuned for {cpus} CPUs, this host has {os.cpu_count()} - rerun autotune.py")
+        return None
+    return tuning
+
+
+def apply_tuning(path: str = AUTOTUNE_FILE) -> Dict[str, str]:
+    """
+    Use the tuned configuration as environment defaults
+    Must run before the modules reading those variables are imported; repeated calls are no-ops.
+
+    Returns:
+        The variables that were set from the file
+    """
+    tuning = load_tuning(path)
+    if not tuning:
+        return {}
+    applied = {}
+    for setting, variable in _SETTINGS.items():
+        if setting in tuning and variable not in os.environ:
+            os.environ[variable] = applied[variable] = str(int(tuning[setting]))
+    if applied:
+        print(f"⚙️  Autotuned config: {', '.join(f'{name}={value}' for name, value in applied.items())}")
+    return applied
+
+
+def torch_threads_per_worker(workers: int) -> int:
+    """
+    Torch intra-op threads for each worker so workers together do not oversubscribe the CPU:
+    TORCH_THREADS (explicit or autotuned), else the CPU cores split evenly between workers
+    """
+    threads = int(os.environ.get('TORCH_THREADS', '0'))
+    if threads > 0:
+        return threads
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def set_torch_threads(threads: int) -> None:
+    if os.environ.get('RULES_ONLY') == '1':
+        return  # Would import torch for nothing
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+# ========== Tuning ==========
+
+def _workload(count: int = 200) -> Dict[str, List[str]]:
+    """Synthetic resumes and job texts, as the endpoints encode them"""
+    from synthetic_corpus import generate_jobs, generate_resumes
+    from job_index import job_text
+    return {
+        'resumes': generate_resumes(count),
+        'jobs': [job_text(job) for job in generate_jobs(count * 4)]
+    }
+
+
+def _load_model():
+    from model_registry import get_model
+    from onnx_encoder import get_backend_encoder
+    return get_backend_encoder(get_model())
+
+
+# Loaded in the parent before forking, so trial workers share it copy-on-write
+_model = None
+
+
+def _trial_worker(seed: int, threads: int, batch_size: int, seconds: float,
+                  texts: Dict[str, List[str]], barrier, results) -> None:
+    """One worker process of a trial: serve requests for `seconds`, report texts and latencies"""
+    import torch
+    torch.set_num_threads(threads)
+    model = _model if _model is not None else _load_model()
+    rng = random.Random(seed)
+
+    def request() -> int:
+        if rng.random() < 0.5:
+            batch = [rng.choice(texts['resumes'])]
+        else:
+            batch = rng.sample(texts['jobs'], JOBS_PER_REQUEST)
+        model.encode(batch, convert_to_numpy=True, batch_size=batch_size, show_progress_bar=False)
+        return len(batch)
+
+    for _ in range(3):
+        request()  # Warm this process's thread pool and kernels
+    barrier.wait()
+
+    latencies, encoded = [], 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        began = time.perf_counter()
+        encoded += request()
+        latencies.append(time.perf_counter() - began)
+    results.put((encoded, time.perf_counter() - start, latencies))
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+def run_trial(workers: int, threads: int, batch_size: int, seconds: float,
+              texts: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Run one configuration; returns its throughput and latency"""
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+    context = multiprocessing.get_context(method)
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_trial_worker,
+                        args=(seed, threads, batch_size, seconds, texts, barrier, results))
+        for seed in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    encoded = sum(outcome[0] for outcome in outcomes)
+    elapsed = max(outcome[1] for outcome in outcomes)
+    latencies = [latency for outcome in outcomes for latency in outcome[2]]
+    return {
+        'workers': workers,
+        'torchThreads': threads,
+        'encodeMaxBatch': batch_size,
+        'textsPerSecond': round(encoded / elapsed, 1),
+        'requests': len(latencies),
+        'p50Ms': round(_percentile(latencies, 50) * 1000, 2),
+        'p99Ms': round(_percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def _candidates(values: Optional[str], default: List[int]) -> List[int]:
+    if values:
+        return sorted({int(value) for value in values.split(',') if value.strip()})
+    return default
+
+
+def _powers_of_two(limit: int) -> List[int]:
+    values, value = [], 1
+    while value <= limit:
+        values.append(value)
+        value *= 2
+    return sorted(set(values) | {limit})
+
+
+def pick_best(trials: List[Dict[str, Any]], max_p99_ms: Optional[float] = None) -> Dict[str, Any]:
+    """Highest throughput, among the trials within the p99 budget if one is given"""
+    eligible = [trial for trial in trials if max_p99_ms is None or trial['p99Ms'] <= max_p99_ms]
+    if not eligible:
+        print(f"⚠️  No configuration met p99 <= {max_p99_ms} ms - picking the lowest p99")
+        return min(trials, key=lambda trial: trial['p99Ms'])
+    return max(eligible, key=lambda trial: (trial['textsPerSecond'], -trial['p99Ms']))
+
+
+def main(argv=None) -> int:
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description='Tune workers, torch threads and encode batch size for this host')
+    parser.add_argument('--workers', help='Comma-separated worker counts (default: powers of two up to the CPU count)')
+    parser.add_argument('--threads', help='Comma-separated torch threads per worker (default: powers of two, '
+                                          'at most CPU count / workers)')
+    parser.add_argument('--batch-sizes', default='8,16,32,64', help='Comma-separated encode batch sizes')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Measured seconds per configuration')
+    parser.add_argument('--max-p99-ms', type=float, help='Only pick configurations with a p99 under this')
+    parser.add_argument('--output', default=AUTOTUNE_FILE, help='Where to write the tuned configuration')
+    parser.add_argument('--dry-run', action='store_true', help='Report only, do not write the file')
+    args = parser.parse_args(argv)
+
+    global _model
+    _model = _load_model()
+    if _model is None:
+        print("❌ No model could be loaded - nothing to tune")
+        return 1
+    texts = _workload()
+
+    worker_counts = _candidates(args.workers, _powers_of_two(cpus))
+    batch_sizes = _candidates(args.batch_sizes, [32])
+    configs = [
+        (workers, threads, batch_size)
+        for workers in worker_counts
+        # Without --threads, only configurations that do not oversubscribe the CPU
+        for threads in _candidates(args.threads, _powers_of_two(max(1, cpus // workers)))
+        for batch_size in batch_sizes
+    ]
+    print(f"🔧 Tuning on {cpus} CPUs: {len(configs)} configurations x {args.seconds:g}s\n")
+    print(f"{'workers':>8}{'threads':>9}{'batch':>7}{'texts/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+
+    trials = []
+    for workers, threads, batch_size in configs:
+        trial = run_trial(workers, threads, batch_size, args.seconds, texts)
+        trials.append(trial)
+        print(f"{workers:>8}{threads:>9}{batch_size:>7}{trial['textsPerSecond']:>10.1f}"
+              f"{trial['p50Ms']:>10.1f}{trial['p99Ms']:>10.1f}")
+
+    best = pick_best(trials, args.max_p99_ms)
+    print(f"\n🏆 Best: {best['workers']} workers x {best['torchThreads']} torch threads, "
+          f"batch size {best['encodeMaxBatch']} - {best['textsPerSecond']:.1f} texts/s, "
+          f"p50 {best['p50Ms']:.1f} ms, p99 {best['p99Ms']:.1f} ms")
+
+    if args.dry_run:
+        return 0
+    from model_registry import get_model_fingerprint
+    tuning = {
+        **best,
+        'host': {
+            'cpus': cpus,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'encoderBackend': getattr(_model, 'backend', 'torch'),
+            'model': get_model_fingerprint(_model),
+        },
+        'tunedAt': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'maxP99Ms': args.max_p99_ms,
+        'trials': trials,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as handle:
+        json.dump(tuning, handle, indent=2)
+    print(f"💾 Wrote {args.output} - applied by serve.py and app.py at startup")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
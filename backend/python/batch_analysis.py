@@ -0,0 +1,231 @@
+"""
+Bulk Resume Analysis
+Scores many resumes in one run (e.g. re-scoring the resume table after a scoring change):
+PDFs are extracted on a process pool, resumes are encoded in batches of BATCH_CHUNK_SIZE
+against the shared reference embeddings, and one result per resume is streamed back as
+soon as its batch is scored, followed by a summary with throughput and per-stage timings.
+
+Used by POST /api/ml/batch-analyze and as a CLI:
+    python -m batch_analysis resumes.ndjson > results.ndjson
+Each input line is {"id": ..., "text": ...} or {"id": ..., "filePath": ...},
+optionally with a "targetLevel".
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from pdf_text_extract import extract_pdf_text_timed
+
+# Configuration
+# PDF extraction processes (0 or 1 extracts in-process)
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Resumes encoded in one pass and scored before their results are written
+BATCH_CHUNK_SIZE = int(os.environ.get('BATCH_CHUNK_SIZE', '64'))
+
+_pool = None
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared extraction pool (spawned: workers import only pdf_text_extract, not the model)"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def _extract(items: Iterable[Dict[str, Any]], workers: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one record per input item, in input order, with its resume text (None on failure)
+
+    PDFs are submitted to the pool up to a bounded window ahead of the consumer, so
+    extraction overlaps encoding and scoring without reading the whole input first.
+    """
+    pool = _get_pool(workers) if workers > 1 else None
+    window: "deque[Dict[str, Any]]" = deque()
+
+    def resolve(record: Dict[str, Any]) -> Dict[str, Any]:
+        future = record.pop('future', None)
+        if future is not None:
+            record['text'], record['extractSeconds'] = future.result()
+        elif record['text'] is None and record['filePath']:
+            record['text'], record['extractSeconds'] = extract_pdf_text_timed(record['filePath'])
+        return record
+
+    for index, item in enumerate(items):
+        record = {
+            'index': index,
+            'id': item.get('id', index),
+            'targetLevel': item.get('targetLevel'),
+            'filePath': item.get('filePath'),
+            'text': item.get('text'),
+            'extractSeconds': 0.0
+        }
+        if record['text'] is None and record['filePath'] and pool is not None:
+            record['future'] = pool.submit(extract_pdf_text_timed, record['filePath'])
+        window.append(record)
+        while len(window) > workers * 4:
+            yield resolve(window.popleft())
+    while window:
+        yield resolve(window.popleft())
+
+
+def _chunks(records: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def analyze_batch(
+    items: Iterable[Dict[str, Any]],
+    target_level: Optional[str] = None,
+    workers: int = BATCH_WORKERS,
+    chunk_size: int = BATCH_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze many resumes, yielding results as each batch is scored
+
+    Args:
+        items: Dicts with 'text' or 'filePath', and optionally 'id' and 'targetLevel'
+        target_level: Default target level for items without one
+        workers: PDF extraction processes (0 or 1 extracts in-process)
+        chunk_size: Resumes encoded in one pass
+
+    Yields:
+        One analyze_resume() result per item, in input order, with 'id', 'index' and
+        'timings' added; then a final {'summary': True, ...} dict
+    """
+    # Imported here, not at the top: spawned extraction workers re-import this module
+    # (it is __main__ for the CLI) and must not load torch and the model
+    from chunked_encoding import encode_texts
+    from resume_analyzer_ml import get_analyzer
+
+    analyzer = get_analyzer()
+    totals = {'extract': 0.0, 'encode': 0.0, 'score': 0.0}
+    processed = succeeded = 0
+    start_time = time.perf_counter()
+
+    for chunk in _chunks(_extract(items, workers), max(1, chunk_size)):
+        encodable = [record for record in chunk if record['text'] and record['text'].strip()]
+
+        # One batched encode for the whole chunk (in chunked encoding mode: for the sections
+        # of all its long resumes); the reference embeddings are shared
+        encode_seconds = 0.0
+        embeddings = [None] * len(encodable)
+        if analyzer.model is not None and encodable:
+            encode_start = time.perf_counter()
+            embeddings = encode_texts(analyzer.model, [record['text'] for record in encodable])
+            encode_seconds = time.perf_counter() - encode_start
+        embedding_by_index = {record['index']: embedding for record, embedding in zip(encodable, embeddings)}
+        totals['encode'] += encode_seconds
+
+        for record in chunk:
+            score_start = time.perf_counter()
+            if record['text'] is None:
+                result = {'success': False, 'error': 'Failed to extract text from PDF'
+                          if record['filePath'] else 'No text or filePath provided'}
+            else:
+                result = analyzer.analyze_resume(
+                    record['text'],
+                    record['targetLevel'] or target_level,
+                    embedding_by_index.get(record['index'])
+                )
+                result['textLength'] = len(record['text'])
+            score_seconds = time.perf_counter() - score_start
+
+            totals['extract'] += record['extractSeconds']
+            totals['score'] += score_seconds
+            processed += 1
+            succeeded += bool(result.get('success'))
+            result['id'] = record['id']
+            result['index'] = record['index']
+            result['timings'] = {
+                'extractMs': round(record['extractSeconds'] * 1000, 2),
+                # The chunk's encode pass, shared evenly by its resumes
+                'encodeMs': round(encode_seconds / max(1, len(encodable)) * 1000, 2)
+                if record['index'] in embedding_by_index else 0.0,
+                'scoreMs': round(score_seconds * 1000, 2)
+            }
+            yield result
+
+    seconds = time.perf_counter() - start_time
+    yield {
+        'summary': True,
+        'processed': processed,
+        'succeeded': succeeded,
+        'failed': processed - succeeded,
+        'seconds': round(seconds, 3),
+        'resumesPerSecond': round(processed / seconds, 2) if seconds > 0 else 0.0,
+        'workers': workers,
+        'chunkSize': chunk_size,
+        # Extraction runs in parallel with the other stages, so the stages can add up to more than 'seconds'
+        'stageSeconds': {stage: round(value, 3) for stage, value in totals.items()}
+    }
+
+
+def read_ndjson(lines: Iterable) -> Iterator[Dict[str, Any]]:
+    """Parse NDJSON input lines (str or bytes), skipping blank ones"""
+    for line_number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}")
+        if not isinstance(item, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object")
+        yield item
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze many resumes from an NDJSON file")
+    parser.add_argument("input", nargs="?", default="-",
+                        help='NDJSON file with {"id", "text"} or {"id", "filePath"} lines (default: stdin)')
+    parser.add_argument("--output", "-o", default="-", help="Where to write the NDJSON results (default: stdout)")
+    parser.add_argument("--target-level", choices=["entry", "mid", "senior"],
+                        help="Target level for lines without a targetLevel")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="PDF extraction processes")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE, help="Resumes encoded per pass")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    # Model loading and analyzer messages go to stderr, so stdout carries only NDJSON
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            _write_results(analyze_batch(read_ndjson(source), args.target_level, args.workers, args.chunk_size), output)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if output is not sys.stdout:
+                output.close()
+    return 0
+
+
+def _write_results(results: Iterator[Dict[str, Any]], output) -> None:
+    for result in results:
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+        if result.get('summary'):
+            stages = ", ".join(f"{stage} {value:.2f}s" for stage, value in result['stageSeconds'].items())
+            print(f"✅ {result['processed']} resumes ({result['failed']} failed) in {result['seconds']:.2f}s - "
+                  f"{result['resumesPerSecond']:.1f}/s ({stages})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Encode Batching Benchmark
+Simulates concurrent request threads that each encode one or two texts (as the
+analyze-text and match-job endpoints do) and compares calling the model directly
+with going through the micro-batching encoder
+
+Usage: python benchmarks/encode_batching_benchmark.py [threads] [calls_per_thread]
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+
+from model_registry import get_model  # noqa: E402
+from encode_batcher import BatchingEncoder, ENCODE_MAX_BATCH, ENCODE_MAX_LATENCY_MS  # noqa: E402
+from synthetic_corpus import generate_jobs  # noqa: E402
+
+
+def run_clients(encoder, texts, threads: int, calls: int):
+    """Run `threads` clients making `calls` encode calls each; returns (seconds, latencies)"""
+    latencies = []
+    lock = threading.Lock()
+
+    def client(seed: int):
+        rng = random.Random(seed)
+        mine = []
+        for _ in range(calls):
+            batch = rng.sample(texts, rng.choice([1, 2]))
+            start = time.perf_counter()
+            encoder.encode(batch, convert_to_numpy=True)
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+
+    workers = [threading.Thread(target=client, args=(seed,)) for seed in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start, latencies
+
+
+def max_cosine_drift(model, encoder, texts) -> float:
+    """Largest 1 - cosine between batched and one-at-a-time embeddings (padding noise)"""
+    direct = np.stack([model.encode(text, convert_to_numpy=True) for text in texts])
+    batched = encoder.encode(texts, convert_to_numpy=True)
+    cosine = (direct * batched).sum(axis=1) / (
+        np.linalg.norm(direct, axis=1) * np.linalg.norm(batched, axis=1)
+    )
+    return float((1 - cosine).max())
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    texts = [f"{job['title']}. {job['description']}" for job in generate_jobs(200)]
+
+    model = get_model()
+    if model is None:
+        sys.exit("No model available")
+    batcher = BatchingEncoder(model, ENCODE_MAX_BATCH, ENCODE_MAX_LATENCY_MS)
+    model.encode(texts[:4])  # Warm-up
+
+    print(f"{threads} threads x {calls} calls, max batch {ENCODE_MAX_BATCH}, max latency {ENCODE_MAX_LATENCY_MS} ms")
+    print(f"Max cosine drift batched vs direct: {max_cosine_drift(model, batcher, texts[:ENCODE_MAX_BATCH - 1]):.2e}")
+    direct_seconds = None
+    for label, encoder in [('Direct', model), ('Batched', batcher)]:
+        seconds, latencies = run_clients(encoder, texts, threads, calls)
+        direct_seconds = direct_seconds or seconds
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        print(f"{label + ':':<10}{threads * calls / seconds:8.1f} calls/s  p50 {p50:6.1f} ms  p99 {p99:6.1f} ms  "
+              f"({direct_seconds / seconds:.2f}x)")
+    print(f"Batcher stats: {batcher.stats()}")
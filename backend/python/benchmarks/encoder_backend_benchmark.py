@@ -0,0 +1,69 @@
+"""
+Encoder Backend Benchmark
+Compares the torch, ONNX fp32 and ONNX int8 encoders on synthetic resumes and jobs:
+cosine drift against torch for every text, single-text latency and batch throughput
+
+Usage: python benchmarks/encoder_backend_benchmark.py [text_count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+
+from model_registry import get_model  # noqa: E402
+from onnx_encoder import get_backend_encoder, cosine_drift, ONNX_AVAILABLE  # noqa: E402
+from synthetic_corpus import generate_jobs, generate_resumes  # noqa: E402
+
+
+def time_single(encoder, texts, repeats: int = 3) -> float:
+    """Best-of-N median seconds per single-text encode"""
+    best = float('inf')
+    for _ in range(repeats):
+        latencies = []
+        for text in texts:
+            start = time.perf_counter()
+            encoder.encode(text, convert_to_numpy=True)
+            latencies.append(time.perf_counter() - start)
+        best = min(best, float(np.median(latencies)))
+    return best
+
+
+def time_batch(encoder, texts, repeats: int = 3) -> float:
+    """Best-of-N seconds to encode all texts with batch_size 32"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encoder.encode(texts, batch_size=32, convert_to_numpy=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    text_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    texts = generate_resumes(text_count // 4) + [
+        f"{job['title']}. {job['description']}" for job in generate_jobs(text_count - text_count // 4)
+    ]
+
+    model = get_model()
+    if model is None or not ONNX_AVAILABLE:
+        sys.exit("Needs the model and onnxruntime")
+    reference = model.encode(texts, convert_to_numpy=True)
+
+    baseline_batch = None
+    for backend in ['torch', 'onnx', 'onnx-int8']:
+        encoder = get_backend_encoder(model, backend)
+        if backend != 'torch' and encoder is model:
+            print(f"{backend}: unavailable (export or parity check failed)")
+            continue
+        encoder.encode(texts[:8])  # Warm-up (session creation)
+        drift = cosine_drift(reference, encoder.encode(texts, convert_to_numpy=True))
+        single = time_single(encoder, texts[:50])
+        batch = time_batch(encoder, texts)
+        baseline_batch = baseline_batch or batch
+        print(f"{backend + ':':<11} drift max {drift.max():.2e} mean {drift.mean():.2e}  "
+              f"single p50 {single * 1000:6.2f} ms  batch {len(texts) / batch:7.1f} texts/s "
+              f"({baseline_batch / batch:.2f}x)")
@@ -0,0 +1,97 @@
+"""
+Resume Extraction Benchmark
+Times ResumeAnalyzerML._extract_resume_info per resume on a synthetic corpus, for the
+working tree and for resume_analyzer_ml.py at a git revision, and checks both
+extract the same information
+
+Usage: python benchmarks/extraction_benchmark.py resume_count baseline_ref
+       (baseline_ref is required: the revision before the change being checked, e.g.
+       the commit preceding an extraction refactor; HEAD only compares uncommitted changes)
+"""
+
+import os
+import sys
+import time
+import random
+import subprocess
+import importlib.util
+import tempfile
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+
+import resume_analyzer_ml  # noqa: E402
+from synthetic_corpus import generate_resumes  # noqa: E402
+
+
+def load_baseline(ref: str):
+    """Import resume_analyzer_ml.py as it was at a git revision"""
+    source = subprocess.run(
+        ['git', 'show', f'{ref}:./resume_analyzer_ml.py'],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as handle:
+        handle.write(source)
+    try:
+        spec = importlib.util.spec_from_file_location('baseline_resume_analyzer_ml', handle.name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.remove(handle.name)
+    return module
+
+
+def extractor(module):
+    """Analyzer without a model - extraction is rule-based and never touches it"""
+    return module.ResumeAnalyzerML.__new__(module.ResumeAnalyzerML)
+
+
+def reordered(resumes, seed: int = 0):
+    """The same resumes with their lines shuffled - sections in unusual orders, headers
+    mid-section and dates away from their roles exercise the section boundary rules"""
+    rng = random.Random(seed)
+    shuffled = []
+    for text in resumes:
+        lines = text.split('\n')
+        rng.shuffle(lines)
+        shuffled.append('\n'.join(lines))
+    return shuffled
+
+
+def time_it(analyzer, resumes, repeats: int = 3) -> float:
+    """Best-of-N wall time for extracting every resume"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in resumes:
+            analyzer._extract_resume_info(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        # Defaulting to HEAD would compare a clean tree with itself and always pass
+        sys.exit("Usage: python benchmarks/extraction_benchmark.py resume_count baseline_ref")
+    resume_count = int(sys.argv[1])
+    baseline_ref = sys.argv[2]
+    resumes = generate_resumes(resume_count)
+
+    current = extractor(resume_analyzer_ml)
+    baseline = extractor(load_baseline(baseline_ref))
+
+    parity_resumes = resumes + reordered(resumes)
+    mismatches = sum(
+        1 for text in parity_resumes
+        if current._extract_resume_info(text) != baseline._extract_resume_info(text)
+    )
+    print(f"Parity: {len(parity_resumes) - mismatches}/{len(parity_resumes)} identical extractions "
+          f"(half with shuffled lines)")
+
+    baseline_seconds = time_it(baseline, resumes)
+    current_seconds = time_it(current, resumes)
+    for label, seconds in [(baseline_ref, baseline_seconds), ('working tree', current_seconds)]:
+        print(f"{label + ':':<15}{seconds * 1000:8.1f} ms ({seconds / len(resumes) * 1000:.3f} ms/resume, "
+              f"{baseline_seconds / seconds:.2f}x)")
+
+    sys.exit(1 if mismatches else 0)
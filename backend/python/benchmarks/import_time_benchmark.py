@@ -0,0 +1,88 @@
+"""
+Import Time Benchmark
+Imports a module of this service in a fresh interpreter with `python -X importtime`
+and reports the cost per first-party module (self and cumulative) and the heaviest
+other packages, to catch a heavy import creeping back onto the boot path
+
+Usage: python benchmarks/import_time_benchmark.py [module] [--rules-only] [--top N] [--budget-ms MS]
+       (module defaults to app; --budget-ms exits 1 if its cumulative import time is over budget)
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+FIRST_PARTY = {
+    name[:-3] for name in os.listdir(BACKEND_DIR) if name.endswith('.py')
+}
+
+
+def import_times(module: str, rules_only: bool = False) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every module imported by `import module`"""
+    env = dict(os.environ)
+    if rules_only:
+        env['RULES_ONLY'] = '1'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+
+    # Lines look like "import time:   self [us] |  cumulative | imported package"
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def summarize(times: List[Tuple[str, int, int]]) -> Tuple[List[Tuple[str, int, int]], Dict[str, int]]:
+    """First-party modules, and other top-level packages (stdlib and third-party) with their total self time"""
+    first_party = [entry for entry in times if entry[0] in FIRST_PARTY]
+    other: Dict[str, int] = {}
+    for name, self_us, _ in times:
+        package = name.split('.')[0]
+        if package not in FIRST_PARTY:
+            other[package] = other.get(package, 0) + self_us
+    return first_party, other
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('module', nargs='?', default='app')
+    parser.add_argument('--rules-only', action='store_true', help='Import with RULES_ONLY=1')
+    parser.add_argument('--top', type=int, default=10, help='Third-party packages to list')
+    parser.add_argument('--budget-ms', type=float, default=0, help='Fail above this cumulative import time')
+    args = parser.parse_args()
+
+    times = import_times(args.module, args.rules_only)
+    first_party, other = summarize(times)
+    total_ms = next((cumulative for name, _, cumulative in times if name == args.module), 0) / 1000
+
+    print(f"import {args.module}{' (RULES_ONLY=1)' if args.rules_only else ''}: {total_ms:.1f} ms")
+    print(f"\n{'first-party module':<28}{'self ms':>10}{'cumul. ms':>12}")
+    for name, self_us, cumulative_us in sorted(first_party, key=lambda entry: -entry[2]):
+        print(f"{name:<28}{self_us / 1000:>10.1f}{cumulative_us / 1000:>12.1f}")
+    print(f"\n{'other package':<28}{'self ms':>10}")
+    for package, self_us in sorted(other.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<28}{self_us / 1000:>10.1f}")
+
+    heavy = sorted(package for package in ('torch', 'sentence_transformers', 'transformers', 'onnxruntime', 'fitz')
+                   if package in other)
+    print(f"\nheavy packages imported: {', '.join(heavy) if heavy else 'none'}")
+
+    if args.budget_ms and total_ms > args.budget_ms:
+        print(f"❌ over budget: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
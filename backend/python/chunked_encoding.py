@@ -0,0 +1,172 @@
+"""
+Chunked Resume Encoding
+Resumes longer than the encoder's token window are truncated by the model, so their
+later sections (usually projects, skills, certifications) never reach the embedding.
+In chunked mode a long resume is instead:
+- split into chunks along its section headings (the SECTION_KEYWORDS that
+  _extract_resume_info looks for), packed up to the model's token budget
+- encoded together with the chunks of every other text in the request or batch in one
+  padded pass, with each chunk cached on its own in the embedding cache, so editing
+  one section only re-encodes that section's chunk
+- pooled into one document vector (mean weighted by chunk token counts)
+Texts that fit the window are encoded whole, exactly as without chunking.
+"""
+
+import os
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    ML_AVAILABLE = True
+except ImportError:
+    ML_AVAILABLE = False
+
+from resume_segmenter import is_section_heading
+from embedding_cache import get_embedding_cache
+from model_registry import get_model_fingerprint
+from metrics import span
+
+# Configuration
+CHUNKED_ENCODING = os.environ.get('CHUNKED_ENCODING', '0') == '1'
+# Tokens per chunk (0 = the model's max_seq_length minus the [CLS]/[SEP] tokens)
+CHUNK_MAX_TOKENS = int(os.environ.get('CHUNK_MAX_TOKENS', '0'))
+
+DEFAULT_MAX_SEQ_LENGTH = 256
+
+
+def token_budget(model) -> int:
+    """Tokens of text per chunk for a model"""
+    if CHUNK_MAX_TOKENS > 0:
+        return CHUNK_MAX_TOKENS
+    max_seq_length = getattr(model, 'max_seq_length', None) or DEFAULT_MAX_SEQ_LENGTH
+    return max(16, int(max_seq_length) - 2)
+
+
+def _token_counts(model, lines: List[str]) -> List[int]:
+    """Tokens per line in one tokenizer call (word counts if the model exposes no tokenizer)"""
+    tokenizer = getattr(model, 'tokenizer', None)
+    if tokenizer is not None and lines:
+        try:
+            encoded = tokenizer(lines, add_special_tokens=False)['input_ids']
+            return [len(ids) for ids in encoded]
+        except Exception:
+            pass
+    return [len(line.split()) for line in lines]
+
+
+def _split_long_line(line: str, tokens: int, budget: int) -> List[Tuple[str, int]]:
+    """Cut a line longer than the budget into word runs (token counts estimated per word)"""
+    words = line.split()
+    per_word = tokens / max(1, len(words))
+    step = max(1, int(budget / per_word))
+    pieces = []
+    for start in range(0, len(words), step):
+        piece = words[start:start + step]
+        pieces.append((' '.join(piece), int(round(len(piece) * per_word))))
+    return pieces
+
+
+def split_chunks(model, text: str) -> Tuple[List[str], List[int]]:
+    """
+    Section-aligned chunks of a text that fit the model's token window
+
+    Returns:
+        (chunks, token counts); a text that fits is returned whole and unchanged
+    """
+    budget = token_budget(model)
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line]
+    counts = _token_counts(model, lines)
+    if sum(counts) <= budget:
+        return [text], [max(1, sum(counts))]
+
+    # Sections start at heading lines; the text before the first heading is its own section
+    sections: List[List[Tuple[str, int]]] = [[]]
+    for line, tokens in zip(lines, counts):
+        if is_section_heading(line) and sections[-1]:
+            sections.append([])
+        if tokens > budget:
+            sections[-1].extend(_split_long_line(line, tokens, budget))
+        else:
+            sections[-1].append((line, tokens))
+
+    # Pack each section's lines up to the budget; chunks never span two sections
+    chunks, chunk_counts = [], []
+    for section in sections:
+        current, current_tokens = [], 0
+        for line, tokens in section:
+            if current and current_tokens + tokens > budget:
+                chunks.append('\n'.join(current))
+                chunk_counts.append(current_tokens)
+                current, current_tokens = [], 0
+            current.append(line)
+            current_tokens += tokens
+        if current:
+            chunks.append('\n'.join(current))
+            chunk_counts.append(max(1, current_tokens))
+    return chunks, chunk_counts
+
+
+def _pool(vectors: "np.ndarray", weights: Sequence[int]) -> "np.ndarray":
+    """Token-weighted mean, rescaled to the chunks' average norm (unit vectors stay unit)"""
+    weights = np.asarray(weights, dtype=np.float32)
+    weights = weights / weights.sum()
+    pooled = weights @ vectors
+    norm = float(np.linalg.norm(pooled))
+    if norm > 0:
+        pooled = pooled * (float(weights @ np.linalg.norm(vectors, axis=1)) / norm)
+    return pooled.astype(np.float32)
+
+
+def encode_documents(model, texts: List[str], chunk_mask: Optional[Sequence[bool]] = None) -> "np.ndarray":
+    """
+    One embedding per text, chunking and pooling texts longer than the token window
+
+    All chunks of all texts go through one embedding_cache.encode() call, so the
+    chunks that are not cached yet are encoded in a single padded pass.
+
+    Args:
+        model: Encoder with a SentenceTransformer-compatible encode()
+        texts: Texts to embed
+        chunk_mask: Which texts may be chunked (default all; e.g. resumes but not jobs)
+
+    Returns:
+        float32 array of shape (len(texts), dim), in input order
+    """
+    cache = get_embedding_cache()
+    namespace = f"{get_model_fingerprint(model)}:pooled-{token_budget(model)}"
+
+    vectors: List[Optional["np.ndarray"]] = [None] * len(texts)
+    plans: List[Tuple[int, int, List[int]]] = []  # (text index, first chunk, token counts)
+    all_chunks: List[str] = []
+    with span("chunk"):
+        for i, text in enumerate(texts):
+            if chunk_mask is not None and not chunk_mask[i]:
+                plans.append((i, len(all_chunks), [1]))
+                all_chunks.append(text)
+                continue
+            pooled = cache.lookup(namespace, text)
+            if pooled is not None:
+                vectors[i] = pooled
+                continue
+            chunks, counts = split_chunks(model, text)
+            plans.append((i, len(all_chunks), counts))
+            all_chunks.extend(chunks)
+
+    if all_chunks:
+        encoded = cache.encode(model, all_chunks)
+        for i, first, counts in plans:
+            if len(counts) == 1:
+                vectors[i] = encoded[first]
+                continue
+            vectors[i] = _pool(encoded[first:first + len(counts)], counts)
+            cache.store(namespace, texts[i], vectors[i])
+
+    return np.stack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+
+def encode_texts(model, texts: List[str], chunk_mask: Optional[Sequence[bool]] = None) -> "np.ndarray":
+    """encode_documents() in chunked mode, otherwise the plain cached encode"""
+    if CHUNKED_ENCODING:
+        return encode_documents(model, texts, chunk_mask)
+    return get_embedding_cache().encode(model, texts)
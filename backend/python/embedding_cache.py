@@ -0,0 +1,224 @@
+"""
+Content-Addressed Embedding Cache
+LRU cache of text embeddings keyed by (model fingerprint, sha256 of normalized text)
+Only cache misses are sent to the model; evicted vectors can spill to a
+memory-mapped float16 matrix on disk
+"""
+
+import os
+import re
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import numpy as np
+    ML_AVAILABLE = True
+except ImportError:
+    ML_AVAILABLE = False
+
+from model_registry import get_model_fingerprint
+from metrics import span
+
+# Configuration
+EMBEDDING_CACHE_MB = float(os.environ.get('EMBEDDING_CACHE_MB', '64'))
+EMBEDDING_CACHE_SPILL_DIR = os.environ.get('EMBEDDING_CACHE_SPILL_DIR', '')
+EMBEDDING_CACHE_SPILL_ROWS = int(os.environ.get('EMBEDDING_CACHE_SPILL_ROWS', '100000'))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def text_key(text: str) -> str:
+    """sha256 of the text with whitespace collapsed (tokenization ignores it anyway)"""
+    normalized = _WHITESPACE_RE.sub(' ', text).strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class _SpillTier:
+    """
+    Fixed-size ring of float16 rows in a memory-mapped file
+
+    Owned by a single process; the key -> row index lives in memory and the
+    file is removed when the process exits.
+    """
+
+    def __init__(self, directory: str, fingerprint: str, dim: int, capacity: int):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"embeddings-{fingerprint}-{os.getpid()}.f16")
+        self.matrix = np.memmap(self.path, dtype=np.float16, mode='w+', shape=(capacity, dim))
+        self.capacity = capacity
+        self.index: Dict[str, int] = {}
+        self.row_keys: List[Optional[str]] = [None] * capacity
+        self.next_row = 0
+        atexit.register(self.close)
+
+    def put(self, key: str, vector) -> None:
+        if key in self.index:
+            return
+        row = self.next_row
+        old_key = self.row_keys[row]
+        if old_key is not None:
+            del self.index[old_key]
+        self.matrix[row] = vector
+        self.row_keys[row] = key
+        self.index[key] = row
+        self.next_row = (row + 1) % self.capacity
+
+    def get(self, key: str):
+        row = self.index.get(key)
+        if row is None:
+            return None
+        return np.asarray(self.matrix[row], dtype=np.float32)
+
+    def close(self) -> None:
+        try:
+            del self.matrix
+            os.remove(self.path)
+        except (AttributeError, OSError):
+            pass
+
+
+class EmbeddingCache:
+    """Bounded LRU cache of embeddings with an optional on-disk spill tier"""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        spill_dir: Optional[str] = None,
+        spill_rows: int = EMBEDDING_CACHE_SPILL_ROWS
+    ):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.spill_rows = spill_rows
+        self._entries: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._spill: Dict[str, _SpillTier] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.spill_hits = 0
+        self.misses = 0
+
+    def _get(self, key: Tuple[str, str]):
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+        spill = self._spill.get(key[0])
+        if spill is not None:
+            vector = spill.get(key[1])
+            if vector is not None:
+                self.spill_hits += 1
+                self._put(key, vector)
+                return vector
+
+        return None
+
+    def _put(self, key: Tuple[str, str], vector) -> None:
+        if key in self._entries:
+            return
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+
+        while self._bytes > self.max_bytes and self._entries:
+            old_key, old_vector = self._entries.popitem(last=False)
+            self._bytes -= old_vector.nbytes
+            if self.spill_dir:
+                self._spill_tier(old_key[0], old_vector.shape[0]).put(old_key[1], old_vector)
+
+    def _spill_tier(self, fingerprint: str, dim: int) -> _SpillTier:
+        spill = self._spill.get(fingerprint)
+        if spill is None:
+            spill = _SpillTier(self.spill_dir, fingerprint, dim, self.spill_rows)
+            self._spill[fingerprint] = spill
+        return spill
+
+    def encode(self, model, texts: List[str], **encode_kwargs):
+        """
+        Encode texts, reusing cached embeddings
+
+        Args:
+            model: Encoder with a SentenceTransformer-compatible encode()
+            texts: Texts to embed
+            encode_kwargs: Extra arguments passed to model.encode for the misses
+
+        Returns:
+            float32 array of shape (len(texts), dim), in input order
+        """
+        fingerprint = get_model_fingerprint(model)
+        keys = [(fingerprint, text_key(text)) for text in texts]
+
+        vectors: List[Any] = [None] * len(texts)
+        missing: Dict[Tuple[str, str], List[int]] = OrderedDict()
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._get(key)
+                if vector is not None:
+                    vectors[i] = vector
+                else:
+                    missing.setdefault(key, []).append(i)
+            self.misses += len(missing)
+
+        if missing:
+            # Identical texts within one call are encoded once
+            miss_texts = [texts[positions[0]] for positions in missing.values()]
+            with span("encode"):
+                encoded = model.encode(miss_texts, convert_to_numpy=True, **encode_kwargs)
+            encoded = np.asarray(encoded, dtype=np.float32)
+
+            with self._lock:
+                for (key, positions), vector in zip(missing.items(), encoded):
+                    self._put(key, vector)
+                    for i in positions:
+                        vectors[i] = vector
+
+        return np.stack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    def lookup(self, namespace: str, text: str):
+        """
+        A vector saved with store() for a text, or None (namespace: e.g. fingerprint + variant)
+        A miss is not counted here: the caller falls back to encode(), which counts it
+        """
+        with self._lock:
+            return self._get((namespace, text_key(text)))
+
+    def store(self, namespace: str, text: str, vector) -> None:
+        """Cache a vector derived from a text other than by one encode (e.g. pooled chunks)"""
+        with self._lock:
+            self._put((namespace, text_key(text)), np.asarray(vector, dtype=np.float32))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory use, for /health"""
+        with self._lock:
+            lookups = self.hits + self.spill_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'memoryBytes': self._bytes,
+                'maxBytes': self.max_bytes,
+                'hits': self.hits,
+                'spillHits': self.spill_hits,
+                'misses': self.misses,
+                'hitRate': round((self.hits + self.spill_hits) / lookups, 3) if lookups else 0.0,
+                'spillEntries': sum(len(spill.index) for spill in self._spill.values()),
+                'spillEnabled': bool(self.spill_dir)
+            }
+
+
+# Singleton instance
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the process-wide embedding cache (singleton pattern)"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = EmbeddingCache(
+                    max_bytes=int(EMBEDDING_CACHE_MB * 1024 * 1024),
+                    spill_dir=EMBEDDING_CACHE_SPILL_DIR or None
+                )
+    return _cache_instance
@@ -0,0 +1,304 @@
+"""
+Memory-Mapped Embedding Store
+Append-only float16 embedding matrix on disk with an id -> row side index.
+Every worker maps the same file read-only, so all processes share one copy of the
+vectors through the page cache, and scoring runs directly on the mapping.
+- vectors-<generation>.f16: row-aligned float16 rows, only ever appended to
+- index.json: generation, dimensions and the id of every row (null = tombstone)
+Updating or deleting an id tombstones its row; compaction rewrites the live rows into
+the next generation once tombstones exceed EMBEDDING_STORE_COMPACT_RATIO of the rows.
+Readers score against a snapshot(): writes replace ids, rows, alive and vectors with new
+objects instead of changing them in place, so a snapshot stays consistent while a
+concurrent write appends or compacts.
+"""
+
+import os
+import json
+import warnings
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+
+from lazy_imports import lazy_module, is_available
+
+try:
+    import numpy as np
+    ML_AVAILABLE = is_available('torch')
+except ImportError:
+    ML_AVAILABLE = False
+
+# Imported on first use, not with the module
+torch = lazy_module('torch')
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer deployments only
+    fcntl = None
+
+# Configuration
+EMBEDDING_STORE_COMPACT_RATIO = float(os.environ.get('EMBEDDING_STORE_COMPACT_RATIO', '0.25'))
+
+STORE_DTYPE = 'float16'
+# Attempts to map the generation named in index.json, which a compaction may just have replaced
+REFRESH_ATTEMPTS = 3
+
+
+class StoreSnapshot(NamedTuple):
+    """Row ids, id -> row, alive mask and vectors of one consistent store state"""
+    ids: List[Optional[str]]
+    rows: Dict[str, int]
+    alive: "np.ndarray"
+    vectors: "np.ndarray"
+    generation: int
+
+
+class EmbeddingStore:
+    """
+    float16 vectors keyed by string ids, shared between processes through np.memmap
+
+    Writers (append/delete/compact) hold an exclusive file lock and rewrite index.json
+    atomically after the rows are on disk; readers call refresh() to pick up changes.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.generation = 0
+        self.dimensions = 0
+        self.ids: List[Optional[str]] = []
+        self.rows: Dict[str, int] = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self.vectors = np.zeros((0, 0), dtype=STORE_DTYPE)
+        self._index_mtime = None
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self.refresh()
+
+    # ----- files -----
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, 'index.json')
+
+    def _vectors_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f'vectors-{generation}.f16')
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dimensions * np.dtype(STORE_DTYPE).itemsize
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Thread lock plus an flock on the store directory, so workers take turns writing
+        Reentrant, so callers can group several writes (and their own files) under one lock
+        """
+        with self._lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, '.lock'), 'w') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._lock_depth = 1
+                try:
+                    self.refresh()
+                    yield
+                finally:
+                    self._lock_depth = 0
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh(self) -> bool:
+        """Re-read the side index and remap the vectors if another process changed them"""
+        with self._lock:
+            for attempt in range(REFRESH_ATTEMPTS):
+                try:
+                    mtime = os.path.getmtime(self._index_path)
+                except OSError:
+                    return False
+                if mtime == self._index_mtime:
+                    return False
+                with open(self._index_path, encoding='utf-8') as f:
+                    index = json.load(f)
+                try:
+                    vectors = self._map(len(index['ids']), index['generation'], index['dimensions'])
+                except FileNotFoundError:
+                    # Another worker compacted between our read of index.json and the mapping
+                    # and removed that generation; its new index.json names the next one
+                    if attempt == REFRESH_ATTEMPTS - 1:
+                        raise
+                    continue
+                self.generation = index['generation']
+                self.dimensions = index['dimensions']
+                self.ids = index['ids']
+                self.rows = {row_id: row for row, row_id in enumerate(self.ids) if row_id is not None}
+                self.alive = np.array([row_id is not None for row_id in self.ids], dtype=bool)
+                self.vectors = vectors
+                self._index_mtime = mtime
+                return True
+            return False
+
+    def _map(self, count: int, generation: Optional[int] = None, dimensions: Optional[int] = None) -> "np.ndarray":
+        generation = self.generation if generation is None else generation
+        dimensions = self.dimensions if dimensions is None else dimensions
+        if count == 0 or not dimensions:
+            return np.zeros((0, dimensions), dtype=STORE_DTYPE)
+        return np.memmap(self._vectors_path(generation), dtype=STORE_DTYPE, mode='r',
+                         shape=(count, dimensions))
+
+    def snapshot(self) -> StoreSnapshot:
+        """The current state, safe to score against while other threads write"""
+        with self._lock:
+            return StoreSnapshot(self.ids, self.rows, self.alive, self.vectors, self.generation)
+
+    def _write_index(self) -> None:
+        tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'generation': self.generation, 'dimensions': self.dimensions, 'ids': self.ids}, f)
+        os.replace(tmp_path, self._index_path)
+        self._index_mtime = os.path.getmtime(self._index_path)
+
+    # ----- writes -----
+
+    def append(self, ids: List[str], vectors) -> None:
+        """Store vectors for ids; earlier rows of the same ids become tombstones"""
+        vectors = np.ascontiguousarray(vectors, dtype=STORE_DTYPE)
+        if not ids:
+            return
+        with self.exclusive():
+            if not self.dimensions:
+                self.dimensions = vectors.shape[1]
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(f"Expected {self.dimensions}-dimensional vectors, got {vectors.shape[1]}")
+
+            # Copies, so snapshots taken before this write keep their ids and rows
+            self.ids, self.rows = list(self.ids), dict(self.rows)
+            count = len(self.ids)
+            with open(self._vectors_path(self.generation), 'ab') as f:
+                # Drop rows a crashed writer appended without recording them in the index
+                f.truncate(count * self._row_bytes)
+                f.write(vectors.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            for row_id in ids:
+                old_row = self.rows.get(row_id)
+                if old_row is not None:
+                    self.ids[old_row] = None
+            for offset, row_id in enumerate(ids):
+                self.rows[row_id] = count + offset
+            self.ids.extend(ids)
+            # Ids repeated within this call keep only their last row
+            self.ids[count:] = [row_id if self.rows[row_id] == count + offset else None
+                                for offset, row_id in enumerate(ids)]
+            self._commit()
+
+    def delete(self, ids: List[str]) -> int:
+        """Tombstone the rows of ids (e.g. deactivated jobs); returns how many existed"""
+        with self.exclusive():
+            # Copies, so snapshots taken before this write keep their ids and rows
+            self.ids, self.rows = list(self.ids), dict(self.rows)
+            deleted = 0
+            for row_id in ids:
+                row = self.rows.pop(row_id, None)
+                if row is not None:
+                    self.ids[row] = None
+                    deleted += 1
+            if deleted:
+                self._commit()
+            return deleted
+
+    def _commit(self) -> None:
+        """Write the side index (compacting first if there are too many tombstones) and remap"""
+        tombstones = len(self.ids) - len(self.rows)
+        if tombstones and tombstones > EMBEDDING_STORE_COMPACT_RATIO * len(self.ids):
+            self._compact()
+        else:
+            self._write_index()
+        self.alive = np.array([row_id is not None for row_id in self.ids], dtype=bool)
+        self.vectors = self._map(len(self.ids))
+
+    def compact(self) -> None:
+        """Rewrite the live rows into a new generation without tombstones"""
+        with self.exclusive():
+            if len(self.rows) < len(self.ids):
+                self._compact()
+                self.alive = np.ones(len(self.ids), dtype=bool)
+                self.vectors = self._map(len(self.ids))
+
+    def _compact(self) -> None:
+        old_generation = self.generation
+        live_rows = [row for row, row_id in enumerate(self.ids) if row_id is not None]
+        source = self._map(len(self.ids))
+        new_path = self._vectors_path(old_generation + 1)
+        with open(new_path, 'wb') as f:
+            for start in range(0, len(live_rows), 8192):
+                f.write(np.ascontiguousarray(source[live_rows[start:start + 8192]]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.generation = old_generation + 1
+        self.ids = [self.ids[row] for row in live_rows]
+        self.rows = {row_id: row for row, row_id in enumerate(self.ids)}
+        self._write_index()
+        try:
+            # Processes still mapping the old file keep their view until they refresh
+            os.remove(self._vectors_path(old_generation))
+        except OSError:
+            pass
+
+    # ----- reads -----
+
+    def _matrix(self, snapshot: Optional[StoreSnapshot] = None) -> Tuple["torch.Tensor", "np.ndarray"]:
+        """The mapped vectors as a torch tensor sharing their memory, and the alive mask"""
+        snapshot = snapshot or self.snapshot()
+        with warnings.catch_warnings():
+            # The mapping is read-only and torch only reads it
+            warnings.simplefilter('ignore', UserWarning)
+            return torch.from_numpy(snapshot.vectors), snapshot.alive
+
+    def scores(self, query, snapshot: Optional[StoreSnapshot] = None) -> "np.ndarray":
+        """
+        Dot product of every row with a query, computed on the mapping without copying it
+        (float16 matmul in torch); tombstoned rows score -inf
+        Rows are those of `snapshot` (default: the current state).
+        """
+        matrix, alive = self._matrix(snapshot)
+        if len(alive) == 0:
+            return np.zeros(0, dtype=np.float32)
+        query = torch.from_numpy(np.asarray(query, dtype=np.float32).reshape(-1))
+        scores = torch.mv(matrix, query.to(torch.float16)).float().numpy()
+        scores[~alive] = -np.inf
+        return scores
+
+    def exact_scores(self, rows: "np.ndarray", query, snapshot: Optional[StoreSnapshot] = None) -> "np.ndarray":
+        """float32 dot products for selected rows of `snapshot` (tombstones score -inf)"""
+        matrix, alive = self._matrix(snapshot)
+        rows = np.asarray(rows, dtype=np.int64)
+        query = torch.from_numpy(np.asarray(query, dtype=np.float32).reshape(-1))
+        # Only the selected rows are gathered and widened to float32
+        scores = torch.mv(matrix.index_select(0, torch.from_numpy(rows)).float(), query).numpy()
+        scores[~alive[rows]] = -np.inf
+        return scores
+
+    def get(self, row_id: str) -> Optional["np.ndarray"]:
+        snapshot = self.snapshot()
+        row = snapshot.rows.get(row_id)
+        return None if row is None else np.asarray(snapshot.vectors[row], dtype=np.float32)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rows': len(self.ids),
+                'live': len(self.rows),
+                'tombstones': len(self.ids) - len(self.rows),
+                'dimensions': self.dimensions,
+                'generation': self.generation,
+                'fileBytes': len(self.ids) * self._row_bytes
+            }
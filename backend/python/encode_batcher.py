@@ -0,0 +1,231 @@
+"""
+Micro-Batching Encode Scheduler
+Collects small encode() calls from concurrent request threads into one padded batch,
+so N concurrent requests cost one forward pass instead of N batch-of-one passes
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, List, Any, Optional
+
+from lazy_imports import lazy_module, is_available
+
+try:
+    import numpy as np
+    ML_AVAILABLE = is_available('torch')
+except ImportError:
+    ML_AVAILABLE = False
+
+# Imported on first use, not with the module
+torch = lazy_module('torch')
+
+from model_registry import get_model, get_model_fingerprint, DEFAULT_MODEL_NAME, FALLBACK_MODEL_NAME
+from onnx_encoder import get_backend_encoder
+from metrics import record, ENCODE_BATCH_TEXTS
+
+# Configuration
+ENCODE_BATCHING = os.environ.get('ENCODE_BATCHING', '1') == '1'
+# Longest time the first text of a batch waits for others to join it
+ENCODE_MAX_LATENCY_MS = float(os.environ.get('ENCODE_MAX_LATENCY_MS', '5'))
+# Most texts in one forward pass; calls with at least this many texts skip the queue and
+# are encoded this many at a time (tuned per host by autotune.py)
+ENCODE_MAX_BATCH = int(os.environ.get('ENCODE_MAX_BATCH', '32'))
+
+# encode() options that only change the output format, not the embedding itself
+_FORMAT_OPTIONS = ('convert_to_numpy', 'convert_to_tensor', 'batch_size', 'show_progress_bar')
+
+
+class _Request:
+    """Texts from one encode() call waiting for a batch"""
+    __slots__ = ('texts', 'options', 'future', 'enqueued_at')
+
+    def __init__(self, texts: List[str], options: Dict[str, Any]):
+        self.texts = texts
+        self.options = options
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchingEncoder:
+    """
+    Drop-in replacement for a SentenceTransformer's encode() that batches concurrent calls
+
+    A single scheduler thread takes the oldest queued request, gathers more requests
+    with the same encode options until ENCODE_MAX_BATCH texts are collected or the
+    oldest one has waited ENCODE_MAX_LATENCY_MS, runs one encode for all of them and
+    resolves each caller's future with its own rows. Every other attribute is the
+    wrapped model's.
+    """
+
+    def __init__(self, model, max_batch: int = ENCODE_MAX_BATCH, max_latency_ms: float = ENCODE_MAX_LATENCY_MS):
+        self.model = model
+        self.max_batch = max(1, max_batch)
+        self.max_latency = max(0.0, max_latency_ms) / 1000
+        # Cached embeddings stay valid: batching does not change the weights
+        self.fingerprint = get_model_fingerprint(model)
+        self._reset()
+        # The scheduler thread does not survive fork (serve.py preloads models in the master)
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._queue: "deque[_Request]" = deque()
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.batched_texts = 0
+        self.direct_calls = 0
+        self.total_wait = 0.0
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper (device, tokenizer, ...)
+        return getattr(self.model, name)
+
+    def encode(self, sentences, convert_to_numpy: bool = True, convert_to_tensor: bool = False, **encode_kwargs):
+        """SentenceTransformer-compatible encode(); blocks until this call's batch has run"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        options = {key: value for key, value in encode_kwargs.items() if key not in _FORMAT_OPTIONS}
+
+        if not texts:
+            # Nothing to run (e.g. an empty job list); the model cannot shape an empty batch
+            embeddings = np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        elif len(texts) >= self.max_batch:
+            # Already a full batch - queueing would only add latency
+            with self._condition:
+                self.direct_calls += 1
+            embeddings = np.asarray(
+                self.model.encode(texts, convert_to_numpy=True, batch_size=self.max_batch, **options),
+                dtype=np.float32
+            ).reshape(len(texts), -1)
+        else:
+            embeddings = self._submit(texts, options).result()
+
+        if single:
+            embeddings = embeddings[0]
+        if convert_to_tensor:
+            return torch.from_numpy(embeddings).to(self.model.device)
+        return embeddings
+
+    def _submit(self, texts: List[str], options: Dict[str, Any]) -> Future:
+        request = _Request(texts, options)
+        with self._condition:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='encode-batcher', daemon=True)
+                self._worker.start()
+            self._queue.append(request)
+            self.queue_depth += len(texts)
+            self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+            self._condition.notify()
+        return request.future
+
+    def _take_batch(self) -> List[_Request]:
+        """Wait for requests and pop the next batch (same options, oldest first)"""
+        with self._condition:
+            while not self._queue:
+                self._condition.wait()
+
+            head = self._queue[0]
+            deadline = head.enqueued_at + self.max_latency
+            while True:
+                batch, size = [], 0
+                for request in self._queue:
+                    if request.options == head.options and size + len(request.texts) <= self.max_batch:
+                        batch.append(request)
+                        size += len(request.texts)
+                remaining = deadline - time.perf_counter()
+                if size >= self.max_batch or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            for request in batch:
+                self._queue.remove(request)
+            self.queue_depth -= size
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            texts = [text for request in batch for text in request.texts]
+            started = time.perf_counter()
+            try:
+                embeddings = np.asarray(
+                    self.model.encode(texts, convert_to_numpy=True, batch_size=len(texts), **batch[0].options),
+                    dtype=np.float32
+                ).reshape(len(texts), -1)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            # On this thread, so the forward pass is not attributed to any one request
+            record("encode_forward", time.perf_counter() - started)
+            ENCODE_BATCH_TEXTS.observe(len(texts))
+
+            with self._condition:
+                self.batches += 1
+                self.batched_requests += len(batch)
+                self.batched_texts += len(texts)
+                self.total_wait += sum(started - request.enqueued_at for request in batch)
+
+            offset = 0
+            for request in batch:
+                # Copied so a cached row does not keep the whole batch array alive
+                request.future.set_result(embeddings[offset:offset + len(request.texts)].copy())
+                offset += len(request.texts)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and batching counters, for /health"""
+        with self._condition:
+            return {
+                'backend': getattr(self.model, 'backend', 'torch'),
+                'maxBatch': self.max_batch,
+                'maxLatencyMs': self.max_latency * 1000,
+                'queueDepth': self.queue_depth,
+                'peakQueueDepth': self.peak_queue_depth,
+                'batches': self.batches,
+                'batchedTexts': self.batched_texts,
+                'avgBatchSize': round(self.batched_texts / self.batches, 2) if self.batches else 0.0,
+                'avgWaitMs': round(self.total_wait / self.batched_requests * 1000, 2) if self.batched_requests else 0.0,
+                'directCalls': self.direct_calls
+            }
+
+
+# One batcher per model instance, so the analyzer and matcher share its queue
+_encoders: Dict[int, BatchingEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(
+    model_name: str = DEFAULT_MODEL_NAME,
+    fallback_model: Optional[str] = FALLBACK_MODEL_NAME
+):
+    """
+    Get the shared encoder for a model: the registry model on the configured
+    backend (ENCODER_BACKEND, see onnx_encoder.py) wrapped in a BatchingEncoder,
+    or unwrapped when ENCODE_BATCHING=0
+
+    Returns:
+        Encoder with a SentenceTransformer-compatible encode(), or None if no model could be loaded
+    """
+    model = get_backend_encoder(get_model(model_name, fallback_model=fallback_model))
+    if model is None or not ENCODE_BATCHING:
+        return model
+
+    with _encoders_lock:
+        encoder = _encoders.get(id(model))
+        if encoder is None:
+            encoder = BatchingEncoder(model)
+            _encoders[id(model)] = encoder
+        return encoder
+
+
+def encoder_stats() -> List[Dict[str, Any]]:
+    """Stats of every batching encoder in this process"""
+    with _encoders_lock:
+        return [dict(encoder.stats(), fingerprint=encoder.fingerprint) for encoder in _encoders.values()]
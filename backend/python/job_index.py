@@ -0,0 +1,432 @@
+"""
+Job Vector Index
+Persistent store of job embeddings (upserted once by job id, kept in a memory-mapped
+float16 EmbeddingStore shared by all workers) with top-K cosine search,
+so a recommendation costs one resume encode and one matrix product instead of
+re-encoding every candidate job. Everything else matching derives from a job alone
+(snippet flag, seniority, tech terms - see job_features) is computed once at ingestion.
+- exact search: one matmul against all job vectors (default below JOB_INDEX_IVF_MIN_JOBS)
+- IVF search: spherical k-means clusters, only the JOB_INDEX_IVF_PROBES closest clusters are scanned
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import numpy as np
+    ML_AVAILABLE = True
+except ImportError:
+    ML_AVAILABLE = False
+
+from model_registry import get_model_fingerprint
+from embedding_cache import get_embedding_cache
+from embedding_store import EmbeddingStore, StoreSnapshot
+from metrics import span
+from seniority_classifier import classify_job_seniority
+from match_scoring import tech_terms_in, SNIPPET_WORD_LIMIT
+
+# Configuration
+JOB_INDEX_DIR = os.environ.get('JOB_INDEX_DIR', os.path.expanduser('~/.cache/huggingface/jobhunter/job_index'))
+# 'auto' uses IVF from JOB_INDEX_IVF_MIN_JOBS jobs on, 'exact' or 'ivf' force one mode
+JOB_INDEX_MODE = os.environ.get('JOB_INDEX_MODE', 'auto')
+JOB_INDEX_IVF_MIN_JOBS = int(os.environ.get('JOB_INDEX_IVF_MIN_JOBS', '20000'))
+# Clusters scanned per query - more probes, better recall, slower search
+JOB_INDEX_IVF_PROBES = int(os.environ.get('JOB_INDEX_IVF_PROBES', '16'))
+
+SEARCH_MODES = ('auto', 'exact', 'ivf')
+_KMEANS_ITERATIONS = 10
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    """Text a job is embedded from - the same as in batch matching"""
+    return f"{job.get('title', '')} {job.get('description', '')}"
+
+
+def job_features(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-job inputs of match scoring that do not depend on the resume"""
+    text = job_text(job)
+    word_count = len(text.split())
+    return {
+        'wordCount': word_count,
+        'isSnippet': word_count < SNIPPET_WORD_LIMIT,
+        'seniority': classify_job_seniority(job.get('title', ''), job.get('description', '')),
+        'techTerms': tech_terms_in(text.lower())
+    }
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a job URL for dedupe: lowercase scheme/host, no fragment or utm_* tracking"""
+    url = (url or '').strip()
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return url
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not key.lower().startswith('utm_')])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), query, ''))
+
+
+def _normalize(matrix: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return (matrix / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def _top_k(scores: "np.ndarray", k: int) -> "np.ndarray":
+    """Positions of the k highest scores, best first"""
+    if k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+class _IvfLists:
+    """Inverted file: k-means centroids over the job vectors and the rows assigned to each"""
+
+    def __init__(self, vectors: "np.ndarray", generation: int):
+        count = len(vectors)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        cluster_count = int(min(4096, max(1, np.sqrt(count))))
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(count, cluster_count, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind='stable')
+            clusters, starts = np.unique(assignment[order], return_index=True)
+            # Spherical k-means: each centroid is the normalized sum of its members
+            centroids[clusters] = _normalize(np.add.reduceat(vectors[order], starts, axis=0))
+        self.centroids = centroids
+        self.generation = generation
+        self.trained_rows = count
+        self.rows = 0
+        self.lists = [[] for _ in range(cluster_count)]
+        self.add(vectors)
+
+    def add(self, vectors: "np.ndarray") -> None:
+        """Assign rows appended since the last call to their closest centroid (without retraining)"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        for offset, cluster in enumerate(np.argmax(vectors @ self.centroids.T, axis=1)):
+            self.lists[cluster].append(self.rows + offset)
+        self.rows += len(vectors)
+
+    def candidates(self, query: "np.ndarray", probes: int, row_limit: int) -> "np.ndarray":
+        """Rows in the `probes` closest lists, below `row_limit` (rows added later are not in the caller's snapshot)"""
+        closest = _top_k(self.centroids @ query, min(probes, len(self.centroids)))
+        rows = np.fromiter((row for cluster in closest for row in list(self.lists[cluster])), dtype=np.int64)
+        return rows[rows < row_limit]
+
+
+class JobIndex:
+    """
+    Job vectors for one model, persisted under JOB_INDEX_DIR/<model fingerprint>/
+
+    Vectors live in a memory-mapped float16 EmbeddingStore shared by all workers;
+    job fields, text hashes and job_features live in jobs.json. Jobs are upserted by id
+    and only re-encoded when their title or description changes. Vectors are stored
+    L2-normalized so cosine similarity is a dot product.
+    """
+
+    def __init__(self, model, directory: Optional[str] = None):
+        self.model = model
+        self.directory = directory or os.path.join(JOB_INDEX_DIR, get_model_fingerprint(model))
+        self.store = EmbeddingStore(self.directory)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._features: Dict[str, Dict[str, Any]] = {}
+        # Dedupe lookups: normalized URL / text hash -> job id
+        self._by_url: Dict[str, str] = {}
+        self._by_hash: Dict[str, str] = {}
+        self._jobs_mtime = None
+        self._ivf: Optional[_IvfLists] = None
+        self._refresh()
+
+    # ----- persistence -----
+
+    @property
+    def _jobs_path(self) -> str:
+        return os.path.join(self.directory, 'jobs.json')
+
+    def _refresh(self) -> None:
+        """Pick up vectors and job fields written by other processes"""
+        self.store.refresh()
+        try:
+            mtime = os.path.getmtime(self._jobs_path)
+        except OSError:
+            return
+        if mtime == self._jobs_mtime:
+            return
+        try:
+            with open(self._jobs_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read job index {self._jobs_path}: {e}")
+            return
+        self._jobs = manifest['jobs']
+        self._hashes = manifest['hashes']
+        # Indexes written before features were stored compute them once here
+        self._features = manifest.get('features') or {}
+        for job_id, job in self._jobs.items():
+            if job_id not in self._features:
+                self._features[job_id] = job_features(job)
+        self._by_url = {normalize_url(job['url']): job_id for job_id, job in self._jobs.items() if job.get('url')}
+        self._by_hash = {text_hash: job_id for job_id, text_hash in self._hashes.items()}
+        self._jobs_mtime = mtime
+
+    def _save_jobs(self) -> None:
+        tmp_path = f"{self._jobs_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'jobs': self._jobs, 'hashes': self._hashes, 'features': self._features}, f)
+        os.replace(tmp_path, self._jobs_path)
+        self._jobs_mtime = os.path.getmtime(self._jobs_path)
+
+    # ----- updates -----
+
+    def upsert(self, jobs: List[Dict[str, Any]], dedupe: bool = False) -> Dict[str, Any]:
+        """
+        Add or update jobs by their 'id' (title, description and any other fields are stored)
+        Jobs with isActive false are removed, like deactivated rows of the jobs table.
+
+        With dedupe, jobs without an id take the id of the indexed job with the same
+        normalized 'url' (or get one derived from their URL or text), and a job whose URL
+        or title+description is already indexed under another id is not stored again.
+
+        Returns:
+            Counts of added, updated, unchanged, removed and duplicate jobs, and 'ids':
+            the indexed id of each input job (the existing one for duplicates)
+        """
+        with self._lock, self.store.exclusive():
+            self._refresh()
+            try:
+                return self._upsert(jobs, dedupe)
+            except Exception:
+                # Re-read jobs.json next time instead of trusting half-applied changes
+                self._jobs_mtime = None
+                raise
+
+    def _upsert(self, jobs: List[Dict[str, Any]], dedupe: bool) -> Dict[str, Any]:
+        ids = []
+        inactive = []
+        to_encode: Dict[str, str] = {}  # job id -> text hash; the last one wins within a request
+        unchanged = duplicates = 0
+        for job in jobs:
+            text_hash = _text_hash(job_text(job))
+            url = normalize_url(job['url']) if job.get('url') else ''
+            job_id = str(job['id']) if job.get('id') not in (None, '') else None
+            if dedupe:
+                # The same URL is the same listing (updated in place); the same text under
+                # another URL or id is a duplicate
+                url_owner = self._by_url.get(url) if url else None
+                job_id = job_id or url_owner
+                existing = url_owner if url_owner not in (None, job_id) else self._by_hash.get(text_hash)
+                if existing is not None and existing != job_id and existing in self._jobs:
+                    ids.append(existing)
+                    if job.get('isActive', True) is False:
+                        inactive.append(existing)
+                    else:
+                        duplicates += 1
+                    continue
+                job_id = job_id or f"job-{_text_hash(url or text_hash)[:16]}"
+            elif job_id is None:
+                raise ValueError("Every job needs an 'id'")
+            ids.append(job_id)
+
+            if job.get('isActive', True) is False:
+                inactive.append(job_id)
+                continue
+            self._forget(job_id)
+            self._jobs[job_id] = dict(job, id=job_id)
+            if self._hashes.get(job_id) == text_hash and job_id in self.store.rows and job_id not in to_encode:
+                unchanged += 1
+            else:
+                to_encode[job_id] = text_hash
+                self._features[job_id] = job_features(job)
+            self._hashes[job_id] = text_hash
+            self._remember(job_id)
+
+        added = sum(1 for job_id in to_encode if job_id not in self.store.rows)
+        if to_encode:
+            embeddings = _normalize(get_embedding_cache().encode(
+                self.model, [job_text(self._jobs[job_id]) for job_id in to_encode]
+            ))
+            # Appended; the rows of updated jobs become tombstones
+            self.store.append(list(to_encode), embeddings)
+
+        removed = self._remove(inactive)
+        self._save_jobs()
+        return {
+            'added': added,
+            'updated': len(to_encode) - added,
+            'unchanged': unchanged,
+            'removed': removed,
+            'duplicates': duplicates,
+            'ids': ids
+        }
+
+    def remove(self, job_ids: List[str]) -> int:
+        """Delete jobs by id; returns how many were found"""
+        with self._lock, self.store.exclusive():
+            self._refresh()
+            removed = self._remove([str(job_id) for job_id in job_ids])
+            if removed:
+                self._save_jobs()
+            return removed
+
+    def _remove(self, job_ids: List[str]) -> int:
+        for job_id in job_ids:
+            self._forget(job_id)
+            self._jobs.pop(job_id, None)
+            self._hashes.pop(job_id, None)
+            self._features.pop(job_id, None)
+        return self.store.delete(job_ids) if job_ids else 0
+
+    def _remember(self, job_id: str) -> None:
+        job = self._jobs[job_id]
+        if job.get('url'):
+            self._by_url[normalize_url(job['url'])] = job_id
+        self._by_hash[self._hashes[job_id]] = job_id
+
+    def _forget(self, job_id: str) -> None:
+        """Drop the dedupe entries pointing at a job (before it changes or is removed)"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        url = normalize_url(job['url']) if job.get('url') else ''
+        if url and self._by_url.get(url) == job_id:
+            del self._by_url[url]
+        if self._by_hash.get(self._hashes.get(job_id)) == job_id:
+            del self._by_hash[self._hashes[job_id]]
+
+    def compact(self) -> None:
+        """Drop tombstoned rows now instead of waiting for EMBEDDING_STORE_COMPACT_RATIO"""
+        with self._lock:
+            self.store.compact()
+
+    # ----- search -----
+
+    def _resolve_mode(self, mode: str) -> str:
+        if mode == 'auto':
+            return 'ivf' if len(self.store.rows) >= JOB_INDEX_IVF_MIN_JOBS else 'exact'
+        return mode
+
+    def _current_ivf(self, snapshot: StoreSnapshot) -> _IvfLists:
+        """The IVF lists for a store snapshot, retrained after compaction or once the store has doubled"""
+        ivf = self._ivf
+        if ivf is None or ivf.generation != snapshot.generation or len(snapshot.ids) >= 2 * ivf.trained_rows:
+            ivf = self._ivf = _IvfLists(snapshot.vectors, snapshot.generation)
+        elif ivf.rows < len(snapshot.ids):
+            ivf.add(snapshot.vectors[ivf.rows:])
+        return ivf
+
+    def search(
+        self,
+        query_embedding,
+        k: int = 20,
+        mode: str = JOB_INDEX_MODE,
+        probes: int = JOB_INDEX_IVF_PROBES
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any], float]]:
+        """
+        Top-k jobs by cosine similarity to a query embedding
+
+        Returns:
+            (stored job, job features, similarity) triples, most similar first
+        """
+        with self._lock:
+            self._refresh()
+            # Scoring runs outside the lock against this snapshot; writes made meanwhile
+            # replace the store's arrays rather than renumbering the snapshot's rows
+            snapshot = self.store.snapshot()
+            if not snapshot.rows or k <= 0:
+                return []
+            mode = self._resolve_mode(mode)
+            ivf = self._current_ivf(snapshot) if mode == 'ivf' else None
+            jobs, features = self._jobs, self._features
+
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32).reshape(-1))
+        with span("index_search"):
+            if ivf is not None:
+                rows = ivf.candidates(query, probes, len(snapshot.ids))
+            else:
+                # Half-precision scores over the whole mapping pick a shortlist...
+                scores = self.store.scores(query, snapshot)
+                rows = _top_k(scores, min(len(scores), 2 * k + 32))
+            # ...that is ranked on float32 scores
+            scores = self.store.exact_scores(rows, query, snapshot)
+            top = _top_k(scores, k)
+        results = []
+        for i in top:
+            job_id = snapshot.ids[rows[i]]
+            # A job removed since the snapshot is skipped
+            job, job_fields = jobs.get(job_id), features.get(job_id)
+            if np.isfinite(scores[i]) and job is not None and job_fields is not None:
+                results.append((job, job_fields, float(scores[i])))
+        return results
+
+    def lookup(self, job_ids: List[str], query_embedding) -> List[Optional[Tuple[Dict[str, Any], Dict[str, Any], float]]]:
+        """
+        Stored jobs by id with their cosine similarity to a query embedding
+
+        Returns:
+            (stored job, job features, similarity) per id, in order; None for unknown ids
+        """
+        with self._lock:
+            self._refresh()
+            snapshot = self.store.snapshot()
+            rows = snapshot.rows
+            found = [job_id for job_id in map(str, job_ids) if job_id in rows and job_id in self._jobs]
+            hits = {job_id: (self._jobs[job_id], self._features[job_id], rows[job_id]) for job_id in found}
+        if not hits:
+            return [None] * len(job_ids)
+
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32).reshape(-1))
+        with span("similarity"):
+            scores = self.store.exact_scores(np.array([row for _, _, row in hits.values()], dtype=np.int64), query, snapshot)
+        similarities = dict(zip(hits, scores))
+        return [
+            (hits[job_id][0], hits[job_id][1], float(similarities[job_id]))
+            if job_id in hits and np.isfinite(similarities[job_id]) else None
+            for job_id in map(str, job_ids)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and search mode, for /health"""
+        with self._lock:
+            return {
+                'jobs': len(self.store.rows),
+                'mode': self._resolve_mode(JOB_INDEX_MODE),
+                'ivfClusters': len(self._ivf.centroids) if self._ivf is not None else 0,
+                'store': self.store.stats(),
+                'directory': self.directory
+            }
+
+
+# One index per model fingerprint
+_indexes: Dict[str, JobIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_job_index(model) -> JobIndex:
+    """Get or open the job index for an encoder (singleton per model fingerprint)"""
+    fingerprint = get_model_fingerprint(model)
+    with _indexes_lock:
+        index = _indexes.get(fingerprint)
+        if index is None:
+            start_time = time.time()
+            index = JobIndex(model)
+            _indexes[fingerprint] = index
+            if index.stats()['jobs']:
+                print(f"✅ Job index loaded: {index.stats()['jobs']} jobs in {time.time() - start_time:.2f}s")
+        return index
+
+
+def job_index_stats() -> List[Dict[str, Any]]:
+    """Stats of every job index opened in this process"""
+    with _indexes_lock:
+        return [index.stats() for index in _indexes.values()]
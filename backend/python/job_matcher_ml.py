@@ -3,89 +3,68 @@ ML-Based Job Matcher using Sentence-BERT
 Calculates semantic similarity between resume and job descriptions
 """
 
+import os
 import json
 import re
+import time
 import logging
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Iterator
+from lazy_imports import lazy_module, is_available
+
 try:
-    from sentence_transformers import SentenceTransformer, util
-    import torch
     import numpy as np
-    ML_AVAILABLE = True
+    from match_scoring import score_matches, tech_terms_in, SNIPPET_BANDS, FULL_BANDS
+    ML_AVAILABLE = is_available('sentence_transformers', 'torch')
 except ImportError:
     ML_AVAILABLE = False
+if not ML_AVAILABLE:
     print("Warning: ML libraries not available. Install with: pip install sentence-transformers torch")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(asctime)s] %(levelname)s - %(message)s',
-    datefmt='%H:%M:%S'
-)
+# Imported on first use (model loading, similarities), not with the module
+util = lazy_module('sentence_transformers.util')
+torch = lazy_module('torch')
+
+from model_registry import DEFAULT_MODEL_NAME, FALLBACK_MODEL_NAME
+from encode_batcher import get_encoder
+from embedding_cache import get_embedding_cache
+from chunked_encoding import encode_texts
+from seniority_classifier import classify_job_seniority
+from job_index import get_job_index, job_text, job_features, JOB_INDEX_MODE
+from tracing import get_logger, current_trace
+from metrics import span, record
+
+# Configuration
+# Jobs encoded and scored per NDJSON chunk when batch matches are streamed
+MATCH_STREAM_CHUNK_SIZE = int(os.environ.get('MATCH_STREAM_CHUNK_SIZE', '32'))
+
+logger = get_logger(__name__)
 
 
 class JobMatcherML:
     """ML-powered job matcher using Sentence-BERT for semantic similarity"""
     
-    def __init__(self):
-        """Initialize the ML model"""
+    def __init__(self, load_model: bool = True):
+        """
+        Initialize the ML model
+        
+        Args:
+            load_model: False for a keyword matcher (the fallback scoring only;
+                        torch is never imported)
+        """
         self.model = None
         # Use resume-specific fine-tuned model (same as ResumeAnalyzerML)
-        self.model_name = 'anass1209/resume-job-matcher-all-MiniLM-L6-v2'
-        self.fallback_model = 'all-mpnet-base-v2'  # Fallback to general model if needed
+        self.model_name = DEFAULT_MODEL_NAME
+        self.fallback_model = FALLBACK_MODEL_NAME  # Fallback to general model if needed
         
+        if not load_model:
+            return
         if ML_AVAILABLE:
-            try:
-                print(f"Loading Resume-Job Matching Model: {self.model_name}...")
-                print("📌 This model is specifically fine-tuned for resume-job matching!")
-                
-                # Try to load resume-specific model
-                import os
-                cache_dir = os.path.expanduser('~/.cache/huggingface/hub')
-                
-                # Check for resume-specific model in cache
-                # Handle both formats: with and without username prefix
-                model_variants = [
-                    f'models--anass1209--{self.model_name.split("/")[-1]}',
-                    f'models--sentence-transformers--{self.model_name.split("/")[-1]}'
-                ]
-                
-                model_loaded = False
-                for variant in model_variants:
-                    model_path = os.path.join(cache_dir, variant)
-                    if os.path.exists(model_path):
-                        snapshots_path = os.path.join(model_path, 'snapshots')
-                        if os.path.exists(snapshots_path):
-                            snapshot_dirs = [d for d in os.listdir(snapshots_path) if os.path.isdir(os.path.join(snapshots_path, d))]
-                            if snapshot_dirs:
-                                snapshot_path = os.path.join(snapshots_path, snapshot_dirs[0])
-                                print(f"📂 Loading resume-specific model from cache...")
-                                self.model = SentenceTransformer(snapshot_path)
-                                model_loaded = True
-                                break
-                
-                if not model_loaded:
-                    # Download the resume-specific model
-                    print("📥 Downloading resume-specific model (first time, ~90MB)...")
-                    self.model = SentenceTransformer(self.model_name)
-                
-                # Set model to evaluation mode
-                if self.model:
-                    self.model.eval()
-                    print("✅ Resume-specific model loaded successfully!")
-                    
-            except Exception as e:
-                print(f"⚠️ Could not load resume-specific model: {e}")
-                print(f"💡 Falling back to general model: {self.fallback_model}")
-                try:
-                    # Fallback to general-purpose model
-                    self.model = SentenceTransformer(self.fallback_model)
-                    if self.model:
-                        self.model.eval()
-                        print("✅ Fallback model loaded successfully!")
-                except Exception as e2:
-                    print(f"❌ Fallback loading also failed: {e2}")
-                    self.model = None
+            print("📌 Using resume-specific model for job matching (shared with resume analyzer)")
+            # Same instance as ResumeAnalyzerML - loaded once per process
+            self.model = get_encoder(self.model_name, fallback_model=self.fallback_model)
+            if self.model is None:
+                print("❌ No model could be loaded. Falling back to keyword matching.")
         else:
             print("❌ ML libraries not available. Falling back to keyword matching.")
     
@@ -175,6 +154,165 @@ class JobMatcherML:
         
         return results
     
+    def iter_batch_matches(
+        self,
+        resume_text: str,
+        jobs: List[Dict[str, str]] = None,
+        ats_score: float = 0,
+        experience_level: str = "entry",
+        years_of_experience: int = 0,
+        job_ids: List[str] = None,
+        chunk_size: int = MATCH_STREAM_CHUNK_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        batch_calculate_matches (or match_indexed_jobs, given job_ids) as a stream
+        
+        Jobs are encoded and scored chunk_size at a time, and each result is yielded
+        with its 'index' as soon as its chunk is done, so the first results do not wait
+        for the whole batch.
+        
+        Yields:
+            One match result per job, in input order, then a final {'summary': True, ...}
+            dict with the batch stats
+        """
+        start_time = time.perf_counter()
+        items = job_ids if job_ids is not None else jobs
+        chunk_size = max(1, chunk_size)
+        results = []
+        first_result_seconds = None
+        
+        if resume_text and items:
+            resume_embedding = None
+            if job_ids is None and self.model is not None and len(jobs) > 1:
+                resume_embedding = encode_texts(self.model, [resume_text])
+            
+            for chunk_start in range(0, len(items), chunk_size):
+                chunk = items[chunk_start:chunk_start + chunk_size]
+                if job_ids is not None:
+                    chunk_results = self.match_indexed_jobs(
+                        resume_text, chunk, ats_score, experience_level, years_of_experience
+                    )
+                elif resume_embedding is not None:
+                    # The same scoring as _batch_ml_match, one chunk of job encodes at a time
+                    job_texts = [job_text(job) for job in chunk]
+                    job_embeddings = get_embedding_cache().encode(self.model, job_texts)
+                    with span("similarity"):
+                        similarities = util.cos_sim(resume_embedding, job_embeddings)[0].cpu().numpy()
+                    chunk_results = self._score_jobs(
+                        resume_text, chunk, job_texts, similarities, ats_score,
+                        experience_level, years_of_experience, "Batch",
+                        first_index=chunk_start, summarize=False
+                    )
+                else:
+                    chunk_results = self.batch_calculate_matches(
+                        resume_text, chunk, ats_score, experience_level, years_of_experience
+                    )
+                
+                for offset, result in enumerate(chunk_results):
+                    result["index"] = chunk_start + offset
+                    results.append(result)
+                    yield result
+                if first_result_seconds is None:
+                    first_result_seconds = time.perf_counter() - start_time
+        
+        seconds = time.perf_counter() - start_time
+        summary = self._summarize_matches([result for result in results if "matchScore" in result])
+        logger.debug("📊 Batch summary: avg score %.1f, good matches %d/%d",
+                     summary['averageScore'], summary['goodMatches'], len(results))
+        yield {
+            "summary": True,
+            "count": len(results),
+            "failed": sum(1 for result in results if "matchScore" not in result),
+            **summary,
+            "chunkSize": chunk_size,
+            "seconds": round(seconds, 3),
+            "firstResultMs": round((first_result_seconds or seconds) * 1000, 1)
+        }
+    
+    def recommend_jobs(
+        self,
+        resume_text: str,
+        k: int = 20,
+        ats_score: float = 0,
+        experience_level: str = "entry",
+        years_of_experience: int = 0,
+        mode: str = JOB_INDEX_MODE
+    ) -> List[Dict[str, Any]]:
+        """
+        Top-k jobs from the job index for a resume, fully scored
+        
+        Only the k most similar indexed jobs go through seniority detection, scoring
+        and reasons - the rest of the index costs one matrix product.
+        
+        Args:
+            resume_text: Full resume text
+            k: Number of jobs to return
+            mode: Index search mode - 'auto', 'exact' or 'ivf'
+            
+        Returns:
+            Match results (with 'jobId' and 'job'), sorted by match score
+        """
+        if not resume_text or self.model is None:
+            return []
+        
+        resume_embedding = encode_texts(self.model, [resume_text])[0]
+        hits = get_job_index(self.model).search(resume_embedding, k, mode)
+        if not hits:
+            return []
+        
+        jobs = [job for job, _, _ in hits]
+        similarities = np.array([similarity for _, _, similarity in hits], dtype=np.float32)
+        results = self._score_jobs(
+            resume_text, jobs, [job_text(job) for job in jobs], similarities, ats_score,
+            experience_level, years_of_experience, "Index", [features for _, features, _ in hits]
+        )
+        for job, result in zip(jobs, results):
+            result["jobId"] = job["id"]
+            result["job"] = job
+        # Seniority penalties can reorder the similarity ranking
+        results.sort(key=lambda result: result["matchScore"], reverse=True)
+        return results
+    
+    def match_indexed_jobs(
+        self,
+        resume_text: str,
+        job_ids: List[str],
+        ats_score: float = 0,
+        experience_level: str = "entry",
+        years_of_experience: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Batch matching against jobs already in the job index (see /api/ml/jobs/ingest)
+        
+        Job embeddings, seniority, snippet flags and tech terms were computed at
+        ingestion, so only the resume is encoded here.
+        
+        Returns:
+            One match result per id, in order (with 'jobId'); unknown ids get
+            {'jobId', 'error'} instead
+        """
+        if not resume_text or not job_ids or self.model is None:
+            return []
+        
+        resume_embedding = encode_texts(self.model, [resume_text])[0]
+        hits = get_job_index(self.model).lookup(job_ids, resume_embedding)
+        found = [hit for hit in hits if hit is not None]
+        scored = iter(self._score_jobs(
+            resume_text, [job for job, _, _ in found], [job_text(job) for job, _, _ in found],
+            np.array([similarity for _, _, similarity in found], dtype=np.float32), ats_score,
+            experience_level, years_of_experience, "Index", [features for _, features, _ in found]
+        ) if found else [])
+        
+        results = []
+        for job_id, hit in zip(job_ids, hits):
+            if hit is None:
+                results.append({"jobId": job_id, "error": "Job not found in index"})
+            else:
+                result = next(scored)
+                result["jobId"] = hit[0]["id"]
+                results.append(result)
+        return results
+    
     def _calculate_ml_match(
         self,
         resume_text: str,
@@ -186,44 +324,29 @@ class JobMatcherML:
     ) -> Dict[str, Any]:
         """Calculate match using Sentence-BERT semantic similarity"""
         
-        logging.info("=" * 80)
-        logging.info("🎯 CALCULATING JOB MATCH")
-        logging.info(f"Job Title: {job_title[:100] if job_title else 'N/A'}")
-        logging.info(f"Resume Length: {len(resume_text)} chars, Job Desc Length: {len(job_description)} chars")
-        logging.info(f"Candidate: {experience_level} level, {years_of_experience} years exp")
-        
         # Combine job title and description for better context
         job_text = f"{job_title} {job_description}" if job_title else job_description
-        job_text_lower = job_text.lower()
         
         # Detect if this is a snippet (short text) vs full job description
         word_count = len(job_text.split())
         is_snippet = word_count < 100  # Less than 100 words = likely a snippet
-        logging.info(f"Job Text: {word_count} words - {'SNIPPET' if is_snippet else 'FULL DESCRIPTION'}")
         
         # CRITICAL: Detect job seniority level
         job_seniority = self._detect_job_seniority(job_title, job_description)
-        logging.info(f"Job Level Detected: {job_seniority.upper()}")
         
         # Calculate seniority mismatch penalty
         seniority_penalty = self._calculate_seniority_penalty(
-            experience_level, years_of_experience, job_seniority, job_text_lower
+            experience_level, years_of_experience, job_seniority
         )
-        if seniority_penalty > 0:
-            logging.warning(f"⚠️ Seniority Mismatch Penalty: -{seniority_penalty:.1f} points ({experience_level} → {job_seniority})")
         
         # Encode texts
-        logging.info("📊 Encoding texts with resume-specific model...")
-        resume_embedding = self.model.encode(resume_text, convert_to_tensor=True)
-        job_embedding = self.model.encode(job_text, convert_to_tensor=True)
+        # (both go through the embedding cache - resumes are re-sent many times a day;
+        # in chunked mode only the resume is split, in the same pass as the job)
+        resume_embedding, job_embedding = encode_texts(self.model, [resume_text, job_text], [True, False])
         
         # Calculate cosine similarity
-        similarity = util.cos_sim(resume_embedding, job_embedding)[0][0].item()
-        logging.info(f"🔍 Raw Semantic Similarity: {similarity:.4f} ({similarity*100:.1f}%)")
-        
-        logging.info("")
-        logging.info("📐 SEMANTIC SCORE CALCULATION:")
-        logging.info(f"   Using {'SNIPPET' if is_snippet else 'FULL DESCRIPTION'} formula")
+        with span("similarity"):
+            similarity = util.cos_sim(resume_embedding, job_embedding)[0][0].item()
         
         # IMPROVED FORMULA WITH SNIPPET BOOST:
         # For snippets (Jooble), apply more generous scoring since they lack full context
@@ -231,107 +354,79 @@ class JobMatcherML:
             # Snippet formula - more generous (shift entire curve up)
             if similarity >= 0.6:
                 semantic_score = 75 + (similarity - 0.6) * 62.5  # 75-100 points
-                logging.info(f"   Range: ≥0.6 → Formula: 75 + ({similarity:.4f} - 0.6) × 62.5")
-                logging.info(f"   Calculation: 75 + {similarity - 0.6:.4f} × 62.5 = {semantic_score:.1f}")
+                formula = "75 + (similarity - 0.6) × 62.5"
             elif similarity >= 0.4:
                 semantic_score = 60 + (similarity - 0.4) * 75  # 60-75 points
-                logging.info(f"   Range: 0.4-0.6 → Formula: 60 + ({similarity:.4f} - 0.4) × 75")
-                logging.info(f"   Calculation: 60 + {similarity - 0.4:.4f} × 75 = {semantic_score:.1f}")
+                formula = "60 + (similarity - 0.4) × 75"
             elif similarity >= 0.25:
                 semantic_score = 45 + (similarity - 0.25) * 100  # 45-60 points
-                logging.info(f"   Range: 0.25-0.4 → Formula: 45 + ({similarity:.4f} - 0.25) × 100")
-                logging.info(f"   Calculation: 45 + {similarity - 0.25:.4f} × 100 = {semantic_score:.1f}")
+                formula = "45 + (similarity - 0.25) × 100"
             else:
                 semantic_score = similarity * 180  # 0-45 points
-                logging.info(f"   Range: <0.25 → Formula: {similarity:.4f} × 180")
-                logging.info(f"   Calculation: {similarity:.4f} × 180 = {semantic_score:.1f}")
+                formula = "similarity × 180"
         else:
             # Full description formula - standard scoring
             if similarity >= 0.7:
                 semantic_score = 70 + (similarity - 0.7) * 50  # 70-85 points
-                logging.info(f"   Range: ≥0.7 → Formula: 70 + ({similarity:.4f} - 0.7) × 50")
-                logging.info(f"   Calculation: 70 + {similarity - 0.7:.4f} × 50 = {semantic_score:.1f}")
+                formula = "70 + (similarity - 0.7) × 50"
             elif similarity >= 0.5:
                 semantic_score = 55 + (similarity - 0.5) * 75  # 55-70 points
-                logging.info(f"   Range: 0.5-0.7 → Formula: 55 + ({similarity:.4f} - 0.5) × 75")
-                logging.info(f"   Calculation: 55 + {similarity - 0.5:.4f} × 75 = {semantic_score:.1f}")
+                formula = "55 + (similarity - 0.5) × 75"
             elif similarity >= 0.3:
                 semantic_score = 35 + (similarity - 0.3) * 100  # 35-55 points
-                logging.info(f"   Range: 0.3-0.5 → Formula: 35 + ({similarity:.4f} - 0.3) × 100")
-                logging.info(f"   Calculation: 35 + {similarity - 0.3:.4f} × 100 = {semantic_score:.1f}")
+                formula = "35 + (similarity - 0.3) × 100"
             else:
                 semantic_score = similarity * 116.7  # 0-35 points
-                logging.info(f"   Range: <0.3 → Formula: {similarity:.4f} × 116.7")
-                logging.info(f"   Calculation: {similarity:.4f} × 116.7 = {semantic_score:.1f}")
-        
-        logging.info(f"   ✅ Semantic Score: {semantic_score:.1f}/100")
-        logging.info("")
+                formula = "similarity × 116.7"
         
         # 2. ATS score provides quality boost (0-15 points for full, 0-10 for snippet)
         # Reduce ATS impact for snippets since matching is harder
         ats_max = 10 if is_snippet else 15
         ats_contribution = (ats_score / 100) * ats_max
         
-        logging.info("� ATS CONTRIBUTION CALCULATION:")
-        logging.info(f"   Resume ATS Score: {ats_score:.1f}/100")
-        logging.info(f"   Max ATS Points: {ats_max} ({'snippet' if is_snippet else 'full desc'})")
-        logging.info(f"   Formula: ({ats_score:.1f} / 100) × {ats_max}")
-        logging.info(f"   Calculation: {ats_score / 100:.3f} × {ats_max} = {ats_contribution:.1f}")
-        logging.info(f"   ✅ ATS Contribution: +{ats_contribution:.1f}/100")
-        logging.info("")
-        
         # Total match score BEFORE seniority penalty
         base_score = semantic_score + ats_contribution
         
-        logging.info("➕ BASE SCORE CALCULATION:")
-        logging.info(f"   Semantic Score: {semantic_score:.1f}")
-        logging.info(f"   ATS Contribution: +{ats_contribution:.1f}")
-        logging.info(f"   Formula: {semantic_score:.1f} + {ats_contribution:.1f}")
-        logging.info(f"   ✅ Base Score: {base_score:.1f}/100")
-        logging.info("")
-        
         # Apply seniority penalty
-        logging.info("⚖️ SENIORITY PENALTY APPLICATION:")
-        logging.info(f"   Candidate Level: {experience_level}")
-        logging.info(f"   Job Level: {job_seniority}")
-        logging.info(f"   Penalty: -{seniority_penalty:.1f} points")
-        logging.info(f"   Formula: max(0, min(100, {base_score:.1f} - {seniority_penalty:.1f}))")
-        
         final_score = max(0, min(100, base_score - seniority_penalty))
-        logging.info(f"   Calculation: max(0, min(100, {base_score - seniority_penalty:.1f}))")
-        logging.info(f"   ✅ Final Score: {final_score:.1f}/100")
-        logging.info("")
         
         # Determine match level
         if final_score >= 80:
             match_level = "excellent"
-            level_range = "80-100"
         elif final_score >= 65:
             match_level = "very-good"
-            level_range = "65-79"
         elif final_score >= 50:
             match_level = "good"
-            level_range = "50-64"
         elif final_score >= 35:
             match_level = "fair"
-            level_range = "35-49"
         else:
             match_level = "poor"
-            level_range = "0-34"
-        
-        logging.info("🎖️ MATCH LEVEL DETERMINATION:")
-        logging.info(f"   Score: {final_score:.1f}/100")
-        logging.info(f"   Range: {level_range}")
-        logging.info(f"   ✅ Match Level: {match_level.upper()}")
         
         # Generate match reasons
-        reasons = self._generate_match_reasons(
-            resume_text, job_text, similarity, ats_score, final_score, 
-            seniority_penalty, experience_level, job_seniority
-        )
+        with span("reasons"):
+            reasons = self._generate_match_reasons(
+                resume_text, job_text, similarity, ats_score, final_score, 
+                seniority_penalty, experience_level, job_seniority
+            )
         
-        logging.info(f"💡 Top Reasons: {reasons[:2]}")
-        logging.info("=" * 80 + "\n")
+        # Score breakdown, recorded only for sampled and debug requests
+        current_trace().add(
+            "match",
+            title=job_title[:100] if job_title else None,
+            wordCount=word_count,
+            snippet=is_snippet,
+            similarity=round(similarity, 4),
+            formula=formula,
+            semantic=round(semantic_score, 2),
+            atsMax=ats_max,
+            atsContribution=round(ats_contribution, 2),
+            base=round(base_score, 2),
+            candidateLevel=experience_level,
+            jobLevel=job_seniority,
+            penalty=seniority_penalty,
+            final=round(final_score, 2),
+            level=match_level
+        )
         
         return {
             "matchScore": round(final_score, 1),
@@ -348,248 +443,17 @@ class JobMatcherML:
     def _detect_job_seniority(self, job_title: str, job_description: str) -> str:
         """
         Detect job seniority level from title and description with comprehensive keyword matching
+        (see seniority_classifier for the keyword tiers and priority rules)
         
         Returns: 'entry', 'mid', 'senior', 'principal', 'intern'
         """
-        title_lower = job_title.lower()
-        desc_lower = job_description.lower()
-        combined = f"{title_lower} {desc_lower}"
-        
-        # Priority 1: Intern/student level (highest priority - most specific)
-        intern_keywords = [
-            'intern', 'internship', 'co-op', 'co op', 'trainee', 'apprentice',
-            'student', 'undergraduate', 'summer intern', 'winter intern', 
-            'part-time intern', 'research intern'
-        ]
-        # Exclude "graduate student" from intern (that's for PhDs)
-        if any(keyword in combined for keyword in intern_keywords):
-            # But not if it says "graduate" without "student" (that's entry level)
-            if 'graduate student' not in combined or 'intern' in combined:
-                return 'intern'
-        
-        # Priority 2: Principal/Staff/Executive level (check before senior to avoid conflicts)
-        # These are VERY specific titles
-        principal_exact_titles = [
-            # C-level and executives (most specific)
-            'chief technology officer', 'chief technical officer', 'cto', 'ceo', 'cfo', 
-            'cio', 'cpo', 'cdo', 'chief', 'vp ', 'vice president', 'v.p.', 'evp', 'svp',
-            
-            # Director level (very specific)
-            'director of', 'engineering director', 'director', 'head of', 'group head',
-            'department head', 'managing director',
-            
-            # Principal/Staff level (specific)
-            'principal engineer', 'principal developer', 'principal software',
-            'staff engineer', 'staff developer', 'staff software', 'staff architect',
-            'distinguished engineer', 'fellow', 'principal architect',
-            
-            # High-level specialized architects
-            'solutions architect', 'enterprise architect', 'chief architect',
-            'principal consultant'
-        ]
-        if any(keyword in title_lower for keyword in principal_exact_titles):
-            return 'principal'
-        
-        # Check for "manager" or "lead" in engineering/technical roles (these are senior/principal)
-        if any(term in title_lower for term in ['engineering manager', 'technical manager', 
-                                                  'eng manager', 'tech manager']):
-            return 'principal'
-        
-        # Priority 3: Entry level (check BEFORE senior to catch "junior" correctly)
-        entry_exact_keywords = [
-            # Direct entry terms (most specific)
-            'entry-level', 'entry level', 'junior ', 'jr. ', 'jr ', 'junior developer',
-            'junior engineer', 'junior software', 'jr developer', 'jr engineer',
-            
-            # Graduate positions (very specific to entry)
-            'graduate developer', 'graduate engineer', 'graduate programmer',
-            'graduate software', 'new grad', 'recent graduate', 'fresh graduate',
-            'recent grad',
-            
-            # Early career (VERY strong indicator)
-            'early career', 'early in your career', 'starting your career',
-            'beginning of your career',
-            
-            # Assistant positions
-            'assistant developer', 'assistant engineer', 'assistant programmer',
-            
-            # Level I positions (using word boundaries to avoid matching "ii", "iii", etc.)
-            'level 1', ' i ', 'l1 ', ' l1', 'software engineer 1', 'swe 1', 
-            'sde 1', 'engineer 1', 'developer 1'
-        ]
-        
-        # Check for entry keywords, but be careful about Roman numerals
-        for keyword in entry_exact_keywords:
-            if keyword in combined:
-                # Special handling for single 'i' - must not be part of 'ii', 'iii', etc.
-                if keyword == ' i ':
-                    # Make sure it's not 'ii', 'iii', 'iv', 'v'
-                    if ' ii' not in combined and 'iii' not in combined and ' iv' not in combined:
-                        return 'entry'
-                else:
-                    return 'entry'
-        
-        # Also check title alone for strong entry indicators
-        if any(keyword in title_lower for keyword in ['junior', 'jr.', 'jr ', 'entry', 
-                                                        'graduate', 'assistant']):
-            # But not if it also has "senior" or "lead" (e.g., "Senior Junior" doesn't make sense)
-            if not any(term in title_lower for term in ['senior', 'sr.', 'sr ', 'lead', 'principal']):
-                return 'entry'
-        
-        # IMPORTANT: Check for strong entry language in description (before checking senior)
-        # These phrases strongly indicate entry-level even if other keywords exist
-        strong_entry_phrases = [
-            'learn on the job', 'willingness to learn', 'eager to learn',
-            'we will teach', "we'll teach", 'training provided',
-            'mentorship provided', 'with mentorship', 'mentored by',
-            'no experience required', 'no prior experience'
-        ]
-        if any(phrase in desc_lower for phrase in strong_entry_phrases):
-            # This is likely entry-level - the job is explicitly offering to teach
-            return 'entry'
-        
-        # Priority 4: Senior level (now safe to check after entry)
-        senior_keywords = [
-            # Direct senior titles (very specific)
-            'senior ', 'sr. ', 'sr ', 'senior developer', 'senior engineer', 
-            'senior software', 'sr developer', 'sr engineer', 'sr software',
-            
-            # Lead positions (specific to title usually)
-            'lead engineer', 'lead developer', 'lead software', 'lead programmer',
-            'tech lead', 'technical lead', 'team lead',
-            
-            # Architect roles (senior level)
-            'architect', 'software architect', 'solution architect', 'system architect',
-            'application architect', 'cloud architect', 'data architect',
-            
-            # Expert/Specialist
-            'expert', 'specialist', 'senior specialist',
-            
-            # Level indicators (specific numbers) - III, IV, V are senior (5-7 years typically)
-            'level 3', 'level 4', 'level 5', 'level iii', 'level iv', 'level v',
-            'l3 ', 'l4 ', 'l5 ', ' l3', ' l4', ' l5',
-            'software engineer 3', 'software engineer 4', 'software engineer 5',
-            'swe 3', 'swe 4', 'swe 5', 'sde 3', 'sde 4', 'sde 5',
-            'engineer 3', 'engineer 4', 'engineer 5',
-            'software engineer iii', 'software engineer iv', 'software engineer v',
-            'sde iii', 'sde iv', 'sde v', 
-            'engineer iii', 'engineer iv', 'engineer v',
-            'developer iii', 'developer iv', 'developer v',
-            
-            # Senior consultant
-            'senior consultant', 'lead consultant'
-        ]
-        if any(keyword in combined for keyword in senior_keywords):
-            # Double-check years - 7+ might push to principal
-            # Try range pattern first, then single number
-            years_range_match = re.search(r'(\d+)\s*(?:to|-)\s*(\d+)\s*years', combined)
-            if years_range_match:
-                min_years = int(years_range_match.group(1))
-                max_years = int(years_range_match.group(2))
-                avg_years = (min_years + max_years) // 2
-                if avg_years >= 7:
-                    return 'principal'
-            else:
-                years_match = re.search(r'(\d+)\+?\s*years', combined)
-                if years_match and int(years_match.group(1)) >= 7:
-                    return 'principal'
-            return 'senior'
-        
-        # Priority 5: Mid level
-        mid_keywords = [
-            # Direct mid-level terms
-            'mid-level', 'mid level', 'intermediate', 'mid-senior',
-            
-            # Associate/Analyst roles (must check title to avoid false positives)
-            'associate ', 'associate engineer', 'associate developer', 'associate software',
-            'analyst', 'software analyst', 'systems analyst',
-            
-            # Level 2 indicators (with better patterns)
-            'level 2', ' ii ', 'level ii', 'l2 ', ' l2', 'software engineer 2', 
-            'swe 2', 'sde 2', 'engineer 2', 'developer 2',
-            'engineer ii', 'developer ii', 'sde ii', 'software engineer ii',
-            
-            # Consultant (standard)
-            'consultant', 'technical consultant', 'software consultant',
-            
-            # Experienced but not senior
-            'experienced developer', 'experienced engineer'
-        ]
-        if any(keyword in combined for keyword in mid_keywords):
-            return 'mid'
-        
-        # Priority 6: Check years of experience requirement (most reliable)
-        # Look for patterns like "5+ years", "3-5 years", "5 to 7 years"
-        years_patterns = [
-            r'(\d+)\s*(?:\+|plus)\s*years',  # "5+ years" or "5 plus years"
-            r'(\d+)\s*(?:to|-)\s*(\d+)\s*years',  # "3-5 years" or "3 to 5 years"
-            r'(\d+)\s*years',  # "5 years"
-        ]
-        
-        for pattern in years_patterns:
-            match = re.search(pattern, combined)
-            if match:
-                if len(match.groups()) == 2 and match.group(2):
-                    # Range like "3-5 years" - take average
-                    min_years = int(match.group(1))
-                    max_years = int(match.group(2))
-                    years = (min_years + max_years) // 2
-                else:
-                    # Single number like "5+ years" or "5 years"
-                    years = int(match.group(1))
-                
-                # Classify based on years
-                if years >= 10:
-                    return 'principal'
-                elif years >= 7:
-                    return 'senior'
-                elif years >= 5:
-                    return 'senior'
-                elif years >= 3:
-                    return 'mid'
-                elif years >= 2:
-                    return 'mid'
-                elif years <= 1:
-                    return 'entry'
-                break
-        
-        # Priority 7: Check for responsibility indicators in job description
-        responsibility_indicators = {
-            'principal': ['define architecture', 'strategic', 'company-wide', 'cross-functional leadership'],
-            'senior': ['mentor', 'mentoring', 'code review', 'lead team', 'technical decisions', 
-                      'design systems', 'architecture decisions'],
-            'mid': ['collaborate', 'work with team', 'contribute to', 'participate in'],
-            'entry': ['learn', 'training provided', 'guidance', 'support from senior', 'shadowing']
-        }
-        
-        for level, indicators in responsibility_indicators.items():
-            if any(indicator in desc_lower for indicator in indicators):
-                return level
-        
-        # Priority 8: Default based on job title structure
-        # If title has no level indicators, look for role type
-        if any(role in title_lower for role in ['engineer', 'developer', 'programmer', 'software']):
-            # Plain "Software Engineer" or "Developer" with no qualifier
-            # Check if description has any hints
-            if any(term in desc_lower for term in ['looking for experienced', '5+ years', 
-                                                     'strong background', 'proven track record']):
-                return 'mid'
-            elif any(term in desc_lower for term in ['recent graduate', 'early career', 
-                                                       'no experience', 'will train']):
-                return 'entry'
-            else:
-                # Default to mid-level for unclear cases (safer assumption)
-                return 'mid'
-        
-        # Final default: mid-level (most common, safer than assuming entry or senior)
-        return 'mid'
+        return classify_job_seniority(job_title, job_description)
     
     def _calculate_seniority_penalty(
         self,
         candidate_level: str,
         candidate_years: int,
-        job_level: str,
-        job_text: str
+        job_level: str
     ) -> float:
         """
         Calculate penalty for seniority mismatch
@@ -670,11 +534,8 @@ class JobMatcherML:
     ) -> List[Dict[str, Any]]:
         """Batch process multiple jobs for efficiency"""
         
-        logging.info("\n" + "=" * 80)
-        logging.info(f"🚀 BATCH JOB MATCHING - Processing {len(jobs)} jobs")
-        logging.info(f"Candidate: {experience_level} level, {years_of_experience} years exp")
-        logging.info(f"Resume ATS Score: {ats_score:.1f}")
-        logging.info("=" * 80)
+        logger.debug("🚀 Batch job matching: %d jobs, candidate %s level with %s years, ATS %.1f",
+                     len(jobs), experience_level, years_of_experience, ats_score)
         
         # Prepare job texts
         job_texts = [
@@ -682,183 +543,128 @@ class JobMatcherML:
             for job in jobs
         ]
         
-        logging.info("📊 Encoding resume once for all jobs...")
-        
-        # Encode resume once
-        resume_embedding = self.model.encode(resume_text, convert_to_tensor=True)
-        logging.info("✅ Resume encoded")
+        # Encode resume once (cached - the same resume is re-sent on every refresh)
+        embedding_cache = get_embedding_cache()
+        resume_embedding = encode_texts(self.model, [resume_text])
         
-        # Batch encode all jobs
-        logging.info(f"📚 Batch encoding {len(job_texts)} job descriptions...")
-        job_embeddings = self.model.encode(job_texts, convert_to_tensor=True)
-        logging.info("✅ All jobs encoded")
+        # Batch encode all jobs - only texts not seen before reach the model
+        job_embeddings = embedding_cache.encode(self.model, job_texts)
         
         # Calculate all similarities at once
-        logging.info("🔍 Calculating semantic similarities...")
-        similarities = util.cos_sim(resume_embedding, job_embeddings)[0]
-        logging.info("✅ Similarities calculated\n")
+        with span("similarity"):
+            similarities = util.cos_sim(resume_embedding, job_embeddings)[0].cpu().numpy()
         
-        # Process results
-        results = []
-        # Show detailed breakdown for first 3 jobs
-        show_detailed = True
-        detailed_count = 0
-        max_detailed = 3
+        return self._score_jobs(
+            resume_text, jobs, job_texts, similarities, ats_score,
+            experience_level, years_of_experience, "Batch"
+        )
+    
+    def _score_jobs(
+        self,
+        resume_text: str,
+        jobs: List[Dict[str, Any]],
+        job_texts: List[str],
+        similarities: "np.ndarray",
+        ats_score: float,
+        experience_level: str,
+        years_of_experience: int,
+        source: str,
+        features: List[Dict[str, Any]] = None,
+        first_index: int = 0,
+        summarize: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Seniority, scores and reasons for jobs whose similarities to the resume are known
+        (features: job_features() per job, precomputed for indexed jobs; first_index: position
+        of jobs[0] in the request, for the trace; summarize: log the batch summary)
+        """
         
-        for i, (job, similarity) in enumerate(zip(jobs, similarities)):
-            job_title = job.get('title', 'N/A')[:60]
-            
-            # Show detailed breakdown for first few jobs
-            if show_detailed and detailed_count < max_detailed:
-                logging.info("\n" + "🔍" * 40)
-                logging.info(f"📋 DETAILED CALCULATION FOR JOB {i+1}/{len(jobs)}")
-                logging.info(f"Job Title: {job_title}")
-                logging.info("🔍" * 40)
-                detailed_count += 1
-            else:
-                logging.info(f"\n--- Job {i+1}/{len(jobs)}: {job_title}")
-            
-            similarity_score = similarity.item()
-            
-            # Detect snippet vs full description
-            word_count = len(job_texts[i].split())
-            is_snippet = word_count < 100
-            
-            if show_detailed and detailed_count <= max_detailed:
-                logging.info(f"\n🔍 Raw Semantic Similarity: {similarity_score:.4f} ({similarity_score*100:.1f}%)")
-                logging.info(f"📄 Job Text: {word_count} words - {'SNIPPET' if is_snippet else 'FULL DESCRIPTION'}")
-            
-            # Detect job seniority and calculate penalty
-            job_seniority = self._detect_job_seniority(job.get('title', ''), job.get('description', ''))
-            seniority_penalty = self._calculate_seniority_penalty(
-                experience_level, years_of_experience, job_seniority, job_texts[i].lower()
-            )
-            
-            if show_detailed and detailed_count <= max_detailed:
-                logging.info(f"👤 Job Level Detected: {job_seniority.upper()}")
-                if seniority_penalty > 0:
-                    logging.info(f"⚠️  Seniority Penalty: -{seniority_penalty:.1f} points ({experience_level} → {job_seniority})")
-                else:
-                    logging.info(f"✅ No Seniority Penalty (same/lower level)")
-                logging.info(f"\n📐 SEMANTIC SCORE CALCULATION:")
-                logging.info(f"   Using {'SNIPPET' if is_snippet else 'FULL DESCRIPTION'} formula")
-            
-            # Calculate scores using improved formula with snippet detection
-            if is_snippet:
-                # Snippet formula - more generous
-                if similarity_score >= 0.6:
-                    semantic_score = 75 + (similarity_score - 0.6) * 62.5
-                    if show_detailed and detailed_count <= max_detailed:
-                        logging.info(f"   Range: ≥0.6 → Formula: 75 + ({similarity_score:.4f} - 0.6) × 62.5 = {semantic_score:.1f}")
-                elif similarity_score >= 0.4:
-                    semantic_score = 60 + (similarity_score - 0.4) * 75
-                    if show_detailed and detailed_count <= max_detailed:
-                        logging.info(f"   Range: 0.4-0.6 → Formula: 60 + ({similarity_score:.4f} - 0.4) × 75 = {semantic_score:.1f}")
-                elif similarity_score >= 0.25:
-                    semantic_score = 45 + (similarity_score - 0.25) * 100
-                    if show_detailed and detailed_count <= max_detailed:
-                        logging.info(f"   Range: 0.25-0.4 → Formula: 45 + ({similarity_score:.4f} - 0.25) × 100 = {semantic_score:.1f}")
-                else:
-                    semantic_score = similarity_score * 180
-                    if show_detailed and detailed_count <= max_detailed:
-                        logging.info(f"   Range: <0.25 → Formula: {similarity_score:.4f} × 180 = {semantic_score:.1f}")
-                ats_max = 10
-            else:
-                # Full description formula
-                if similarity_score >= 0.7:
-                    semantic_score = 70 + (similarity_score - 0.7) * 50
-                    if show_detailed and detailed_count <= max_detailed:
-                        logging.info(f"   Range: ≥0.7 → Formula: 70 + ({similarity_score:.4f} - 0.7) × 50 = {semantic_score:.1f}")
-                elif similarity_score >= 0.5:
-                    semantic_score = 55 + (similarity_score - 0.5) * 75
-                    if show_detailed and detailed_count <= max_detailed:
-                        logging.info(f"   Range: 0.5-0.7 → Formula: 55 + ({similarity_score:.4f} - 0.5) × 75 = {semantic_score:.1f}")
-                elif similarity_score >= 0.3:
-                    semantic_score = 35 + (similarity_score - 0.3) * 100
-                    if show_detailed and detailed_count <= max_detailed:
-                        logging.info(f"   Range: 0.3-0.5 → Formula: 35 + ({similarity_score:.4f} - 0.3) × 100 = {semantic_score:.1f}")
-                else:
-                    semantic_score = similarity_score * 116.7
-                    if show_detailed and detailed_count <= max_detailed:
-                        logging.info(f"   Range: <0.3 → Formula: {similarity_score:.4f} × 116.7 = {semantic_score:.1f}")
-                ats_max = 15
-            
-            if show_detailed and detailed_count <= max_detailed:
-                logging.info(f"   ✅ Semantic Score: {semantic_score:.1f}/100")
-            
-            ats_contribution = (ats_score / 100) * ats_max
-            
-            if show_detailed and detailed_count <= max_detailed:
-                logging.info(f"\n📋 ATS CONTRIBUTION:")
-                logging.info(f"   Resume ATS: {ats_score:.1f}/100")
-                logging.info(f"   Max Points: {ats_max} ({'snippet' if is_snippet else 'full'})")
-                logging.info(f"   Formula: ({ats_score:.1f} / 100) × {ats_max} = {ats_contribution:.1f}")
-                logging.info(f"   ✅ ATS Contribution: +{ats_contribution:.1f}/100")
-            
-            base_score = semantic_score + ats_contribution
-            
-            if show_detailed and detailed_count <= max_detailed:
-                logging.info(f"\n➕ BASE SCORE:")
-                logging.info(f"   {semantic_score:.1f} (semantic) + {ats_contribution:.1f} (ATS) = {base_score:.1f}")
-                logging.info(f"   ✅ Base Score: {base_score:.1f}/100")
-            
-            # Apply seniority penalty
-            if show_detailed and detailed_count <= max_detailed:
-                logging.info(f"\n⚖️  SENIORITY PENALTY:")
-                logging.info(f"   Candidate: {experience_level} | Job: {job_seniority}")
-                logging.info(f"   Penalty: -{seniority_penalty:.1f}")
-                logging.info(f"   Formula: max(0, min(100, {base_score:.1f} - {seniority_penalty:.1f}))")
-            
-            final_score = max(0, min(100, base_score - seniority_penalty))
-            
-            # Generate details
-            match_level = self._get_match_level(final_score)
+        # Per-job work that depends only on the job text: snippet detection, seniority, tech terms
+        if features is None:
+            with span("job_features"):
+                features = [job_features(job) for job in jobs]
+        with span("score"):
+            is_snippet = np.array([job['isSnippet'] for job in features], dtype=bool)
+            job_levels = [job['seniority'] for job in features]
+            # The penalty depends only on the job level, so compute it once per level
+            level_penalties = {
+                level: self._calculate_seniority_penalty(experience_level, years_of_experience, level)
+                for level in set(job_levels)
+            }
+            penalties = np.array([level_penalties[level] for level in job_levels], dtype=np.float64)
+            
+            # Semantic curve, ATS contribution, penalty, clamp and match level for all jobs at once
+            scores = score_matches(similarities, is_snippet, ats_score, penalties)
+        
+        # Per-job score breakdown, built only for sampled and debug requests
+        trace = current_trace()
+        if trace.enabled:
+            for i, job in enumerate(jobs):
+                bands = SNIPPET_BANDS if is_snippet[i] else FULL_BANDS
+                threshold, base, offset, slope = bands[scores['band'][i]]
+                trace.add(
+                    "job",
+                    index=first_index + i,
+                    id=job.get('id'),
+                    title=job.get('title', '')[:100],
+                    snippet=bool(is_snippet[i]),
+                    similarity=round(float(scores['similarity'][i]), 4),
+                    formula=f"{base} + (similarity - {offset}) × {slope}",
+                    semantic=round(float(scores['semantic'][i]), 2),
+                    atsMax=float(scores['ats_max'][i]),
+                    atsContribution=round(float(scores['ats_contribution'][i]), 2),
+                    base=round(float(scores['base'][i]), 2),
+                    jobLevel=job_levels[i],
+                    penalty=float(scores['penalty'][i]),
+                    final=round(float(scores['final'][i]), 2),
+                    level=str(scores['level'][i])
+                )
+        
+        # Process results - only the string reasons are built per job
+        reasons_start = time.perf_counter()
+        results = []
+        for i, job in enumerate(jobs):
+            similarity_score = float(scores['similarity'][i])
+            final_score = float(scores['final'][i])
+            seniority_penalty = float(scores['penalty'][i])
+            match_level = str(scores['level'][i])
+            job_seniority = job_levels[i]
             
-            if show_detailed and detailed_count <= max_detailed:
-                level_ranges = {
-                    "excellent": "80-100", "very-good": "65-79", "good": "50-64",
-                    "fair": "35-49", "poor": "0-34"
-                }
-                logging.info(f"   ✅ Final Score: {final_score:.1f}/100")
-                logging.info(f"\n🎖️  MATCH LEVEL:")
-                logging.info(f"   Score: {final_score:.1f}")
-                logging.info(f"   Range: {level_ranges.get(match_level, 'unknown')}")
-                logging.info(f"   ✅ Level: {match_level.upper()}")
-                logging.info("🔍" * 40 + "\n")
             reasons = self._generate_match_reasons(
                 resume_text, job_texts[i], similarity_score, ats_score, final_score,
-                seniority_penalty, experience_level, job_seniority
+                seniority_penalty, experience_level, job_seniority, features[i]['techTerms']
             )
             
-            # Log results for this job with detailed breakdown
-            logging.info(f"    Similarity: {similarity_score*100:.1f}% | "
-                        f"Semantic: {semantic_score:.1f} | "
-                        f"ATS: +{ats_contribution:.1f} | "
-                        f"Base: {base_score:.1f} | "
-                        f"Level: {job_seniority} | "
-                        f"Penalty: -{seniority_penalty:.1f} | "
-                        f"Score: {final_score:.1f} ({match_level})")
-            
             results.append({
                 "matchScore": round(final_score, 1),
                 "semanticSimilarity": round(similarity_score * 100, 1),
-                "atsContribution": round(ats_contribution, 1),
+                "atsContribution": round(float(scores['ats_contribution'][i]), 1),
                 "seniorityPenalty": round(seniority_penalty, 1),
                 "candidateLevel": experience_level,
                 "jobLevel": job_seniority,
                 "matchLevel": match_level,
                 "reasons": reasons,
-                "methodology": f"ML-based ({'snippet' if is_snippet else 'full'} - Batch)"
+                "methodology": f"ML-based ({'snippet' if is_snippet[i] else 'full'} - {source})"
             })
+        record("reasons", time.perf_counter() - reasons_start)
         
         # Summary
-        avg_score = sum(r['matchScore'] for r in results) / len(results) if results else 0
-        good_matches = len([r for r in results if r['matchScore'] >= 50])
-        logging.info(f"\n📊 BATCH SUMMARY: Avg Score: {avg_score:.1f}, Good Matches: {good_matches}/{len(results)}")
-        logging.info("=" * 80 + "\n")
+        if summarize and logger.isEnabledFor(logging.DEBUG):
+            summary = self._summarize_matches(results)
+            logger.debug("📊 Batch summary: avg score %.1f, good matches %d/%d",
+                         summary['averageScore'], summary['goodMatches'], len(results))
         
         return results
     
+    @staticmethod
+    def _summarize_matches(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Average score and number of good (>= 50) matches of a batch"""
+        avg_score = sum(r['matchScore'] for r in results) / len(results) if results else 0
+        return {
+            "averageScore": round(avg_score, 1),
+            "goodMatches": len([r for r in results if r['matchScore'] >= 50])
+        }
+    
     def _calculate_keyword_match(
         self,
         resume_text: str,
@@ -920,9 +726,13 @@ class JobMatcherML:
         match_score: float,
         seniority_penalty: float = 0,
         candidate_level: str = "entry",
-        job_level: str = "mid"
+        job_level: str = "mid",
+        job_terms: List[str] = None
     ) -> List[str]:
-        """Generate human-readable reasons for the match score"""
+        """
+        Generate human-readable reasons for the match score
+        (job_terms: the job's TECH_TERMS, if already known - see tech_terms_in)
+        """
         reasons = []
         
         # Seniority mismatch warning (MOST IMPORTANT - show first)
@@ -972,41 +782,13 @@ class JobMatcherML:
         
         # Extract actual matching skills dynamically
         resume_lower = resume_text.lower()
-        job_lower = job_text.lower()
-        
-        # Comprehensive tech terms list (sorted by specificity)
-        tech_terms = [
-            # Frameworks & Libraries (check these first - more specific)
-            "react native", "spring boot", "next.js", "vue.js", "angular", "react", "node.js", "express.js",
-            "django", "flask", "fastapi", "tensorflow", "pytorch", "scikit-learn", "pandas", "numpy",
-            ".net core", "asp.net", "entity framework", "laravel", "symfony", "ruby on rails",
-            
-            # Languages
-            "typescript", "javascript", "python", "java", "c#", "c++", "golang", "rust", "kotlin", 
-            "swift", "php", "ruby", "scala", "r", "matlab", "perl",
-            
-            # Cloud & DevOps
-            "kubernetes", "docker", "jenkins", "terraform", "ansible", "aws", "azure", "gcp", 
-            "google cloud", "ci/cd", "gitlab", "github actions", "circleci",
-            
-            # Databases
-            "postgresql", "mongodb", "mysql", "redis", "elasticsearch", "cassandra", "dynamodb",
-            "sql server", "oracle", "sqlite", "mariadb",
-            
-            # AI/ML
-            "machine learning", "deep learning", "natural language processing", "nlp", "computer vision",
-            "neural networks", "transformers", "llm", "generative ai", "rag",
-            
-            # Other Tech
-            "graphql", "rest api", "api", "microservices", "websockets", "grpc",
-            "git", "linux", "unix", "bash", "powershell", "sql", "nosql",
-            "agile", "scrum", "jira", "confluence"
-        ]
         
         # Find matching terms (check longer phrases first to avoid partial matches)
+        if job_terms is None:
+            job_terms = tech_terms_in(job_text.lower())
         matched_terms = []
-        for term in tech_terms:
-            if term in resume_lower and term in job_lower:
+        for term in job_terms:
+            if term in resume_lower:
                 # Avoid substrings (e.g., don't count "java" if "javascript" already matched)
                 if not any(term in matched for matched in matched_terms):
                     matched_terms.append(term)
@@ -1023,15 +805,28 @@ class JobMatcherML:
 
 # Singleton instance
 _matcher_instance = None
+_matcher_lock = threading.Lock()
 
 def get_matcher() -> JobMatcherML:
-    """Get or create matcher instance (singleton pattern)"""
+    """Get or create matcher instance (singleton pattern, safe to call from several threads)"""
     global _matcher_instance
     if _matcher_instance is None:
-        _matcher_instance = JobMatcherML()
+        with _matcher_lock:
+            if _matcher_instance is None:
+                _matcher_instance = JobMatcherML()
     return _matcher_instance
 
 
+_keyword_matcher_instance = None
+
+def get_keyword_matcher() -> JobMatcherML:
+    """Get or create the matcher without a model (keyword matching, singleton pattern)"""
+    global _keyword_matcher_instance
+    if _keyword_matcher_instance is None:
+        _keyword_matcher_instance = JobMatcherML(load_model=False)
+    return _keyword_matcher_instance
+
+
 # CLI usage
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,64 @@
+"""
+Lazy Heavy Imports
+torch, sentence_transformers, onnxruntime and PyMuPDF take seconds to import between
+them, and most imports of this service never use them (rule-only workers, CLI tools,
+/health, test runs). Modules bind them with lazy_module() instead of importing them:
+the real import happens on first attribute access, and is_available() checks that a
+package is installed through importlib's finders, which import nothing.
+See benchmarks/import_time_benchmark.py for the per-module import cost.
+"""
+
+import sys
+import importlib
+import importlib.util
+import threading
+from typing import Optional
+
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access"""
+
+    def __init__(self, *names: str):
+        # Alternatives are tried in order (e.g. PyMuPDF as 'fitz' or 'pymupdf')
+        self._names = names
+        self._module = None
+
+    def _load(self):
+        with _lock:
+            if self._module is None:
+                error: Optional[ImportError] = None
+                for name in self._names:
+                    try:
+                        self._module = importlib.import_module(name)
+                        break
+                    except ImportError as e:
+                        error = error or e
+                else:
+                    raise error
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._module or self._load(), attr)
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None or any(name in sys.modules for name in self._names)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {'|'.join(self._names)} ({state})>"
+
+
+def lazy_module(*names: str) -> LazyModule:
+    """A module that is imported when first used: torch = lazy_module('torch')"""
+    return LazyModule(*names)
+
+
+def is_available(*packages: str) -> bool:
+    """True if every top-level package is installed (nothing is imported)"""
+    return all(
+        package in sys.modules or importlib.util.find_spec(package) is not None
+        for package in packages
+    )
@@ -0,0 +1,133 @@
+"""
+Vectorized Match Scoring Kernel
+Turns a vector of resume-job cosine similarities into semantic scores,
+ATS contributions, final scores and match levels with NumPy array ops
+"""
+
+from typing import Dict, List, Any
+
+import numpy as np
+
+# Less than 100 words = likely a snippet (e.g. Jooble) rather than a full description
+SNIPPET_WORD_LIMIT = 100
+
+# Semantic score curves: (threshold, base, offset, slope) bands, highest first.
+# Score = base + (similarity - offset) * slope for the first band whose threshold is met;
+# the last band (threshold 0) is the linear tail below the lowest threshold.
+SNIPPET_BANDS = [
+    (0.6, 75, 0.6, 62.5),   # 75-100 points
+    (0.4, 60, 0.4, 75),     # 60-75 points
+    (0.25, 45, 0.25, 100),  # 45-60 points
+    (None, 0, 0.0, 180),    # 0-45 points
+]
+FULL_BANDS = [
+    (0.7, 70, 0.7, 50),     # 70-85 points
+    (0.5, 55, 0.5, 75),     # 55-70 points
+    (0.3, 35, 0.3, 100),    # 35-55 points
+    (None, 0, 0.0, 116.7),  # 0-35 points
+]
+
+# Max ATS points: reduced for snippets since matching is harder
+SNIPPET_ATS_MAX = 10
+FULL_ATS_MAX = 15
+
+MATCH_LEVELS = np.array(["excellent", "very-good", "good", "fair", "poor"])
+MATCH_LEVEL_THRESHOLDS = [80, 65, 50, 35]
+
+# Technologies named in match reasons when both the resume and the job mention them
+# (more specific terms first - a term inside an already matched one is not counted)
+TECH_TERMS = [
+    # Frameworks & Libraries (check these first - more specific)
+    "react native", "spring boot", "next.js", "vue.js", "angular", "react", "node.js", "express.js",
+    "django", "flask", "fastapi", "tensorflow", "pytorch", "scikit-learn", "pandas", "numpy",
+    ".net core", "asp.net", "entity framework", "laravel", "symfony", "ruby on rails",
+
+    # Languages
+    "typescript", "javascript", "python", "java", "c#", "c++", "golang", "rust", "kotlin", 
+    "swift", "php", "ruby", "scala", "r", "matlab", "perl",
+
+    # Cloud & DevOps
+    "kubernetes", "docker", "jenkins", "terraform", "ansible", "aws", "azure", "gcp", 
+    "google cloud", "ci/cd", "gitlab", "github actions", "circleci",
+
+    # Databases
+    "postgresql", "mongodb", "mysql", "redis", "elasticsearch", "cassandra", "dynamodb",
+    "sql server", "oracle", "sqlite", "mariadb",
+
+    # AI/ML
+    "machine learning", "deep learning", "natural language processing", "nlp", "computer vision",
+    "neural networks", "transformers", "llm", "generative ai", "rag",
+
+    # Other Tech
+    "graphql", "rest api", "api", "microservices", "websockets", "grpc",
+    "git", "linux", "unix", "bash", "powershell", "sql", "nosql",
+    "agile", "scrum", "jira", "confluence"
+]
+
+
+def tech_terms_in(text_lower: str) -> List[str]:
+    """TECH_TERMS that occur in a lowercased text, in TECH_TERMS order"""
+    return [term for term in TECH_TERMS if term in text_lower]
+
+
+def _band_scores(similarities: np.ndarray, bands) -> tuple:
+    """Apply one piecewise-linear curve; returns (scores, band index per row)"""
+    conditions = [similarities >= threshold for threshold, _, _, _ in bands[:-1]]
+    conditions.append(np.ones_like(similarities, dtype=bool))
+    choices = [base + (similarities - offset) * slope for _, base, offset, slope in bands]
+    scores = np.select(conditions, choices)
+    band_index = np.select(conditions, np.arange(len(bands)))
+    return scores, band_index
+
+
+def match_levels(final_scores: np.ndarray) -> np.ndarray:
+    """Vectorized equivalent of JobMatcherML._get_match_level"""
+    conditions = [final_scores >= threshold for threshold in MATCH_LEVEL_THRESHOLDS]
+    index = np.select(conditions, np.arange(len(MATCH_LEVEL_THRESHOLDS)), default=len(MATCH_LEVEL_THRESHOLDS))
+    return MATCH_LEVELS[index]
+
+
+def score_matches(
+    similarities,
+    is_snippet,
+    ats_score: float,
+    seniority_penalties
+) -> Dict[str, Any]:
+    """
+    Score a batch of jobs against one resume
+
+    Args:
+        similarities: Cosine similarity per job (any array-like, shape (n,))
+        is_snippet: Boolean mask, True where the job text is a snippet
+        ats_score: Resume ATS score (0-100), shared by all jobs
+        seniority_penalties: Seniority penalty points per job
+
+    Returns:
+        Dict of arrays: semantic, ats_contribution, base, penalty, final, level, band
+    """
+    similarities = np.asarray(similarities, dtype=np.float64).reshape(-1)
+    is_snippet = np.asarray(is_snippet, dtype=bool).reshape(-1)
+    penalties = np.asarray(seniority_penalties, dtype=np.float64).reshape(-1)
+
+    snippet_scores, snippet_band = _band_scores(similarities, SNIPPET_BANDS)
+    full_scores, full_band = _band_scores(similarities, FULL_BANDS)
+    semantic = np.where(is_snippet, snippet_scores, full_scores)
+    band = np.where(is_snippet, snippet_band, full_band)
+
+    ats_max = np.where(is_snippet, SNIPPET_ATS_MAX, FULL_ATS_MAX)
+    ats_contribution = (ats_score / 100) * ats_max
+
+    base = semantic + ats_contribution
+    final = np.clip(base - penalties, 0, 100)
+
+    return {
+        "similarity": similarities,
+        "semantic": semantic,
+        "ats_contribution": ats_contribution,
+        "ats_max": ats_max,
+        "base": base,
+        "penalty": penalties,
+        "final": final,
+        "level": match_levels(final),
+        "band": band
+    }
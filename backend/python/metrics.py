@@ -0,0 +1,167 @@
+"""
+Service Metrics
+Per-stage latency histograms exposed in Prometheus text format on GET /metrics:
+- span('stage') times a block of the pipeline (PDF open, page text, info extraction,
+  encode, similarity, scoring, reasons, JSON serialization) into
+  jobhunter_stage_seconds{stage=...} and into the current request's Server-Timing
+- Histogram for other measurements (request latency, encode batch sizes)
+- collectors registered by the app report gauges (model load time, cache hit rates)
+  from the existing stats() at scrape time
+Metrics are kept per process; under Gunicorn each scrape is answered by one worker.
+"""
+
+import os
+import time
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterator, Optional, Sequence, Tuple
+
+# Configuration
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+# Add a Server-Timing header with the stage timings to every response
+SERVER_TIMING = os.environ.get('SERVER_TIMING', '0') == '1'
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+def _labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+        _register(self)
+
+    def observe(self, value: float, *label_values) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), then sum and count
+                series = self._series[label_values] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), values):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _number(bound)
+                lines.append(f'{self.name}_bucket{_labels(self.label_names + ("le",), label_values + (le,))} '
+                             f'{int(cumulative)}')
+            lines.append(f'{self.name}_sum{_labels(self.label_names, label_values)} {values[-2]:.6f}')
+            lines.append(f'{self.name}_count{_labels(self.label_names, label_values)} {int(values[-1])}')
+        return lines
+
+
+def sample_lines(name: str, help_text: str, samples: List[Tuple[Dict[str, Any], float]],
+                 kind: str = 'gauge') -> List[str]:
+    """Prometheus lines for values read at scrape time: samples are (labels, value) pairs"""
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    for labels, value in samples:
+        lines.append(f'{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}')
+    return lines
+
+
+_metrics: List[Any] = []
+_collectors: List[Callable[[], List[str]]] = []
+_registry_lock = threading.Lock()
+
+
+def _register(metric) -> None:
+    with _registry_lock:
+        _metrics.append(metric)
+
+
+def register_collector(collector: Callable[[], List[str]]) -> None:
+    """Add a function returning exposition lines (e.g. sample_lines) to every scrape"""
+    with _registry_lock:
+        _collectors.append(collector)
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format"""
+    with _registry_lock:
+        metrics, collectors = list(_metrics), list(_collectors)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    for collector in collectors:
+        try:
+            lines.extend(collector())
+        except Exception as e:
+            lines.append(f'# collector {getattr(collector, "__name__", "?")} failed: {e}')
+    return '\n'.join(lines) + '\n'
+
+
+STAGE_SECONDS = Histogram('jobhunter_stage_seconds', 'Time spent in each pipeline stage', ('stage',))
+REQUEST_SECONDS = Histogram('jobhunter_request_seconds', 'Request latency by endpoint',
+                            ('endpoint', 'method', 'status'))
+ENCODE_BATCH_TEXTS = Histogram('jobhunter_encode_batch_texts', 'Texts per model forward pass', (), SIZE_BUCKETS)
+
+# Stage seconds of the running request, for Server-Timing (None outside a request)
+_request_timings: contextvars.ContextVar = contextvars.ContextVar('request_timings', default=None)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a pipeline stage; spans may nest (e.g. similarity inside score)"""
+    if not METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def record(stage: str, seconds: float) -> None:
+    """Add a stage duration measured elsewhere"""
+    if not METRICS_ENABLED:
+        return
+    STAGE_SECONDS.observe(seconds, stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def start_request() -> None:
+    """Collect the stage timings of the request handled by this thread"""
+    _request_timings.set({})
+
+
+def request_timings() -> Optional[Dict[str, float]]:
+    return _request_timings.get()
+
+
+def server_timing(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    """Server-Timing header value: stage;dur=<ms>, ..."""
+    entries = [f'{stage};dur={seconds * 1000:.2f}' for stage, seconds in timings.items()]
+    if total is not None:
+        entries.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(entries)
@@ -0,0 +1,201 @@
+"""
+Process-wide Model Registry
+Loads each SentenceTransformer once per (model name, device) so that
+ResumeAnalyzerML and JobMatcherML share the same weights in a worker
+"""
+
+import os
+import time
+import hashlib
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+from lazy_imports import lazy_module, is_available
+
+# Imported on first use (model loading), not when the registry is imported
+sentence_transformers = lazy_module('sentence_transformers')
+torch = lazy_module('torch')
+ML_AVAILABLE = is_available('sentence_transformers', 'torch')
+
+# Resume-specific fine-tuned model shared by the analyzer and the matcher
+DEFAULT_MODEL_NAME = 'anass1209/resume-job-matcher-all-MiniLM-L6-v2'
+# General-purpose model used when the resume-specific one cannot be loaded
+FALLBACK_MODEL_NAME = 'all-mpnet-base-v2'
+
+HF_CACHE_DIR = os.path.expanduser('~/.cache/huggingface/hub')
+
+_lock = threading.RLock()
+_models: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+
+def resolve_device(device: Optional[str] = None) -> str:
+    """Return the device a model should live on ('cuda' when available, else 'cpu')"""
+    if device:
+        return device
+    if ML_AVAILABLE and torch.cuda.is_available():
+        return 'cuda'
+    return 'cpu'
+
+
+def _find_cached_snapshot(model_name: str) -> Optional[str]:
+    """
+    Look for a downloaded snapshot of the model in the local HF cache
+    Handles both formats: with and without username prefix
+    """
+    short_name = model_name.split('/')[-1]
+    model_variants = [
+        f'models--{model_name.replace("/", "--")}',
+        f'models--sentence-transformers--{short_name}'
+    ]
+
+    for variant in model_variants:
+        snapshots_path = os.path.join(HF_CACHE_DIR, variant, 'snapshots')
+        if not os.path.exists(snapshots_path):
+            continue
+        snapshot_dirs = sorted(
+            d for d in os.listdir(snapshots_path)
+            if os.path.isdir(os.path.join(snapshots_path, d))
+        )
+        if snapshot_dirs:
+            return os.path.join(snapshots_path, snapshot_dirs[0])
+
+    return None
+
+
+def _model_bytes(model) -> int:
+    """Bytes held by a model's parameters and buffers"""
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def _fingerprint(model_name: str, source: Optional[str], model) -> str:
+    """
+    Short stable id for a set of model weights
+
+    Built from the model name, the snapshot it was loaded from and the embedding
+    size, so anything derived from the model (cached embeddings) can be tied to it.
+    """
+    dimension = model.get_sentence_embedding_dimension()
+    key = f"{model_name}|{source or ''}|{dimension}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def _load(model_name: str, device: str):
+    """Load a model from the local cache if present, otherwise from HuggingFace"""
+    snapshot_path = _find_cached_snapshot(model_name)
+    if snapshot_path:
+        print(f"📂 Loading model from local cache: {snapshot_path}")
+        model = sentence_transformers.SentenceTransformer(snapshot_path, device=device)
+    else:
+        print(f"📥 Downloading model {model_name} (first time)...")
+        model = sentence_transformers.SentenceTransformer(model_name, device=device)
+    model.eval()
+    return model, snapshot_path
+
+
+def get_model(
+    model_name: str = DEFAULT_MODEL_NAME,
+    device: Optional[str] = None,
+    fallback_model: Optional[str] = FALLBACK_MODEL_NAME
+):
+    """
+    Get the shared model instance for (model_name, device), loading it on first use
+
+    If the requested model cannot be loaded, the fallback model is loaded instead and
+    registered under the requested key too, so later callers get the same instance.
+
+    Returns:
+        SentenceTransformer instance, or None if ML is unavailable or loading failed
+    """
+    if not ML_AVAILABLE:
+        return None
+
+    device = resolve_device(device)
+    key = (model_name, device)
+
+    entry = _models.get(key)
+    if entry is not None:
+        return entry['model']
+
+    with _lock:
+        # Another thread may have finished loading while we waited
+        entry = _models.get(key)
+        if entry is not None:
+            return entry['model']
+
+        print(f"Loading Resume-Job Matching Model: {model_name} ({device})...")
+        start = time.perf_counter()
+        try:
+            model, source = _load(model_name, device)
+            entry = {
+                'model': model,
+                'name': model_name,
+                'device': device,
+                'source': source or model_name,
+                'loadSeconds': time.perf_counter() - start,
+                'bytes': _model_bytes(model),
+                'fingerprint': _fingerprint(model_name, source, model)
+            }
+            print("✅ Model loaded successfully!")
+        except Exception as e:
+            print(f"⚠️ Could not load model {model_name}: {e}")
+            if not fallback_model or fallback_model == model_name:
+                return None
+            print(f"💡 Falling back to general model: {fallback_model}")
+            model = get_model(fallback_model, device, fallback_model=None)
+            if model is None:
+                return None
+            entry = _models[(fallback_model, device)]
+
+        _models[key] = entry
+        return entry['model']
+
+
+def get_model_fingerprint(model) -> str:
+    """
+    Fingerprint of a model returned by get_model()
+
+    Wrappers around a registry model (e.g. the batching encoder) carry their own
+    `fingerprint` attribute. Other models that did not come from the registry are
+    fingerprinted by class name only.
+    """
+    fingerprint = getattr(model, 'fingerprint', None)
+    if isinstance(fingerprint, str):
+        return fingerprint
+    with _lock:
+        for entry in _models.values():
+            if entry['model'] is model:
+                return entry['fingerprint']
+    return hashlib.sha256(type(model).__name__.encode('utf-8')).hexdigest()[:16]
+
+
+def model_memory_report() -> List[Dict[str, Any]]:
+    """
+    Describe every resident model and how much memory it uses
+
+    Fallback aliases point at the same instance, so each model is reported once.
+    """
+    with _lock:
+        seen = set()
+        report = []
+        for (_, device), entry in _models.items():
+            if id(entry['model']) in seen:
+                continue
+            seen.add(id(entry['model']))
+            aliases = [
+                name for (name, dev), other in _models.items()
+                if other is entry and name != entry['name']
+            ]
+            report.append({
+                'model': entry['name'],
+                'device': device,
+                'source': entry['source'],
+                'fingerprint': entry['fingerprint'],
+                'aliases': aliases,
+                'memoryBytes': entry['bytes'],
+                'memoryMB': round(entry['bytes'] / (1024 * 1024), 1),
+                'loadSeconds': round(entry['loadSeconds'], 2)
+            })
+        return report
@@ -0,0 +1,261 @@
+"""
+ONNX Runtime Encoder Backend
+Exports a registry SentenceTransformer to ONNX once (optionally int8-quantized) and
+serves encode() through onnxruntime, with a cosine-drift parity check against torch
+"""
+
+import os
+import time
+import hashlib
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+from lazy_imports import lazy_module, is_available
+
+try:
+    import numpy as np
+    ML_AVAILABLE = is_available('torch')
+except ImportError:
+    ML_AVAILABLE = False
+
+# Imported on first use, not with the module
+torch = lazy_module('torch')
+ort = lazy_module('onnxruntime')
+ort_quantization = lazy_module('onnxruntime.quantization')
+ONNX_AVAILABLE = is_available('onnxruntime')
+
+from model_registry import get_model_fingerprint
+
+# Configuration
+# 'torch' (default), 'onnx' (fp32) or 'onnx-int8' (dynamic int8 quantization)
+ENCODER_BACKEND = os.environ.get('ENCODER_BACKEND', 'torch')
+ONNX_CACHE_DIR = os.environ.get('ONNX_CACHE_DIR', os.path.expanduser('~/.cache/huggingface/jobhunter/onnx'))
+# Largest allowed 1 - cosine(onnx, torch) for any parity text; above it the torch model is kept
+ONNX_MAX_COSINE_DRIFT = float(os.environ.get('ONNX_MAX_COSINE_DRIFT', '0.02'))
+
+ONNX_BACKENDS = ('onnx', 'onnx-int8')
+
+# Texts the exported model is checked on: short phrases and a resume-sized text
+PARITY_TEXTS = [
+    "Python developer",
+    "Senior Backend Engineer - Django, PostgreSQL, AWS",
+    "Developed a REST API serving 5000+ users, reducing latency by 40%",
+    "Graduate student looking for a machine learning internship",
+    "quantifiable achievements with metrics percentages and numbers showing impact",
+    " ".join([
+        "Software engineer with 5 years of experience building distributed systems.",
+        "Led the migration of the payments platform to Kubernetes across 4 teams.",
+        "Skills: Python, Go, Kafka, Terraform, React, TypeScript, CI/CD, Docker."
+    ] * 8),
+]
+
+
+def _atomic_path(path: str) -> str:
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def export_onnx(model, path: str) -> None:
+    """Export the model to ONNX with dynamic batch and sequence axes"""
+    sample = model.tokenize(["export sample text", "a second, longer export sample text"])
+    input_names = list(sample.keys())
+
+    class SentenceEmbedding(torch.nn.Module):
+        """Full SentenceTransformer forward (transformer, pooling, ...) as tensors in, tensor out"""
+
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(dict(zip(input_names, inputs)))['sentence_embedding']
+
+    module = SentenceEmbedding().eval()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = _atomic_path(path)
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            tuple(sample[name].to(model.device) for name in input_names),
+            tmp_path,
+            input_names=input_names,
+            output_names=['sentence_embedding'],
+            dynamic_axes={
+                **{name: {0: 'batch', 1: 'sequence'} for name in input_names},
+                'sentence_embedding': {0: 'batch'}
+            },
+            opset_version=17,
+            dynamo=False
+        )
+    os.replace(tmp_path, path)
+
+
+def quantize_onnx(source_path: str, path: str) -> None:
+    """Dynamic int8 quantization of the exported weights (activations stay fp32)"""
+    tmp_path = _atomic_path(path)
+    ort_quantization.quantize_dynamic(source_path, tmp_path, weight_type=ort_quantization.QuantType.QInt8)
+    os.replace(tmp_path, path)
+
+
+class OnnxEncoder:
+    """
+    SentenceTransformer-compatible encoder running an exported model on onnxruntime
+
+    Tokenization still uses the SentenceTransformer's tokenizer; every other
+    attribute is the torch model's. Outputs are float32 on the CPU.
+    """
+
+    def __init__(self, model, onnx_path: str, backend: str):
+        self.model = model
+        self.onnx_path = onnx_path
+        self.backend = backend
+        self.device = torch.device('cpu')
+        # Different outputs than torch, so cached embeddings must not be shared with it
+        base_fingerprint = get_model_fingerprint(model)
+        self.fingerprint = hashlib.sha256(f"{base_fingerprint}|{backend}".encode('utf-8')).hexdigest()[:16]
+        self._session = None
+        self._session_lock = threading.Lock()
+        # onnxruntime thread pools do not survive fork: each worker opens its own session
+        os.register_at_fork(after_in_child=self._drop_session)
+
+    def _drop_session(self) -> None:
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper (tokenizer, max_seq_length, ...)
+        return getattr(self.model, name)
+
+    def _get_session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    options = ort.SessionOptions()
+                    options.intra_op_num_threads = torch.get_num_threads()
+                    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                    self._session = ort.InferenceSession(
+                        self.onnx_path, options, providers=['CPUExecutionProvider']
+                    )
+        return self._session
+
+    def encode(
+        self,
+        sentences,
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        convert_to_tensor: bool = False,
+        normalize_embeddings: bool = False,
+        **_
+    ):
+        """SentenceTransformer-compatible encode() (progress bars and devices are ignored)"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        session = self._get_session()
+        input_names = [graph_input.name for graph_input in session.get_inputs()]
+
+        # Like SentenceTransformer: batch texts of similar length to minimise padding
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        embeddings = np.zeros((len(texts), self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            indices = order[start:start + batch_size]
+            features = self.model.tokenize([texts[i] for i in indices])
+            feeds = {name: features[name].numpy().astype(np.int64) for name in input_names}
+            embeddings[indices] = session.run(None, feeds)[0]
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+        if single:
+            embeddings = embeddings[0]
+        if convert_to_tensor:
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+
+def cosine_drift(reference, candidate) -> "np.ndarray":
+    """Per-row 1 - cosine similarity between two embedding matrices"""
+    reference = np.asarray(reference, dtype=np.float64)
+    candidate = np.asarray(candidate, dtype=np.float64)
+    cosine = (reference * candidate).sum(axis=1) / np.maximum(
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1), 1e-12
+    )
+    return 1 - cosine
+
+
+def check_parity(model, encoder, texts: List[str] = PARITY_TEXTS) -> Dict[str, Any]:
+    """Compare the encoder against the torch model text by text"""
+    drift = cosine_drift(
+        model.encode(texts, convert_to_numpy=True),
+        encoder.encode(texts, convert_to_numpy=True)
+    )
+    return {
+        'texts': len(texts),
+        'maxDrift': float(drift.max()),
+        'meanDrift': float(drift.mean()),
+        'threshold': ONNX_MAX_COSINE_DRIFT,
+        'passed': bool(drift.max() <= ONNX_MAX_COSINE_DRIFT)
+    }
+
+
+def _onnx_paths(model, backend: str) -> Tuple[str, Optional[str]]:
+    """(fp32 export path, int8 path or None) under the model's fingerprint"""
+    directory = os.path.join(ONNX_CACHE_DIR, get_model_fingerprint(model))
+    fp32_path = os.path.join(directory, 'model.onnx')
+    int8_path = os.path.join(directory, 'model-int8.onnx') if backend == 'onnx-int8' else None
+    return fp32_path, int8_path
+
+
+# One ONNX encoder (or the torch model, if the export failed parity) per (model instance, backend)
+_encoders: Dict[Tuple[int, str], Any] = {}
+_lock = threading.Lock()
+
+
+def get_backend_encoder(model, backend: str = ENCODER_BACKEND):
+    """
+    Get the encoder for a registry model under the configured backend
+
+    For the ONNX backends the model is exported (and quantized) on first use and the
+    files are reused by later processes. The torch model is returned when the backend
+    is 'torch', onnxruntime is missing, the export fails or the parity check fails.
+    """
+    if backend not in ONNX_BACKENDS or model is None:
+        return model
+    if not ONNX_AVAILABLE:
+        print(f"⚠️ ENCODER_BACKEND={backend} but onnxruntime is not installed - using torch")
+        return model
+
+    key = (id(model), backend)
+    encoder = _encoders.get(key)
+    if encoder is not None:
+        return encoder
+
+    with _lock:
+        encoder = _encoders.get(key)
+        if encoder is not None:
+            return encoder
+
+        fp32_path, int8_path = _onnx_paths(model, backend)
+        try:
+            start = time.perf_counter()
+            if not os.path.exists(fp32_path):
+                print(f"📦 Exporting model to ONNX: {fp32_path}")
+                export_onnx(model, fp32_path)
+            if int8_path and not os.path.exists(int8_path):
+                print(f"📦 Quantizing ONNX model to int8: {int8_path}")
+                quantize_onnx(fp32_path, int8_path)
+            encoder = OnnxEncoder(model, int8_path or fp32_path, backend)
+            parity = check_parity(model, encoder)
+        except Exception as e:
+            print(f"⚠️ ONNX backend unavailable ({e}) - using torch")
+            _encoders[key] = model
+            return model
+
+        if not parity['passed']:
+            print(f"⚠️ ONNX parity check failed (max cosine drift {parity['maxDrift']:.4f} > "
+                  f"{ONNX_MAX_COSINE_DRIFT}) - using torch")
+            encoder = model
+        else:
+            print(f"✅ ONNX backend '{backend}' ready in {time.perf_counter() - start:.1f}s "
+                  f"(max cosine drift {parity['maxDrift']:.2e})")
+        _encoders[key] = encoder
+        return encoder
@@ -2,67 +2,213 @@
 # Extracts text from PDF files
 
 import sys
+import os  # For file path validation
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from metrics import span
+from lazy_imports import lazy_module, is_available
+
+# PyMuPDF (module name: fitz, or pymupdf) is imported when the first PDF is opened, so
+# importing this module is cheap and a missing install fails that PDF, not the process
+fitz = lazy_module("fitz", "pymupdf")
+PDF_AVAILABLE = is_available("fitz") or is_available("pymupdf")
+PDF_INSTALL_HINT = "PyMuPDF (fitz) is not installed or could not be imported. Install with: pip install pymupdf"
+
+# Budget: bigger files are rejected, pages past the limit are skipped, so a
+# pathological PDF cannot pin a worker
+PDF_MAX_BYTES = int(os.environ.get("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", "50"))
+# Page-range worker pool for long documents (0 or 1 disables it)
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", "0"))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "16"))
+
+_pool = None
+
+def read_pdf_stream(stream, max_bytes=PDF_MAX_BYTES):
+    """Read a PDF from a binary stream, stopping one byte past max_bytes (0 = no limit)
+    
+    An oversized upload is never read in full: the max_bytes + 1 bytes returned are
+    rejected by the size check when the PDF is extracted.
+    """
+    return stream.read(max_bytes + 1 if max_bytes else -1)
+
+def _read_source(source, max_bytes=PDF_MAX_BYTES):
+    """Path (str) or PDF bytes for a source; streams are read once here, up to the budget"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        return read_pdf_stream(source, max_bytes)
+    return os.fspath(source)
 
-import importlib
+def _source_size(source):
+    return os.path.getsize(source) if isinstance(source, str) else len(source)
 
-# Attempt to import PyMuPDF (module name: fitz). If not installed, instruct how to install.
-last_exc = None
-fitz = None
-for _mod in ("fitz", "pymupdf"):
+def _open_document(source):
+    """Open a PDF from a path or from bytes (never written to disk)"""
+    if not PDF_AVAILABLE:
+        raise ImportError(PDF_INSTALL_HINT)
+    with span("pdf_open"):
+        if isinstance(source, bytes):
+            return fitz.open(stream=source, filetype="pdf")
+        return fitz.open(source)
+
+def _page_text(doc, page_index):
+    with span("pdf_page"):
+        return doc[page_index].get_text()
+
+def _check_size(source, max_bytes):
+    if max_bytes and _source_size(source) > max_bytes:
+        raise ValueError(f"PDF is over the size limit of {max_bytes} bytes")
+
+def _page_limit(doc, max_pages):
+    """Number of pages to extract, warning when the budget truncates the document"""
+    if max_pages and doc.page_count > max_pages:
+        print(f"WARNING: PDF has {doc.page_count} pages, extracting the first {max_pages}", file=sys.stderr)
+        return max_pages
+    return doc.page_count
+
+def iter_pdf_pages(source, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    """Yield (page_number, text) for each page, starting at 1.
+    
+    Args:
+        source: Path to the PDF file, the PDF bytes, or a binary stream to read them from
+        max_pages: Stop after this many pages (0 = no limit)
+        max_bytes: Refuse PDFs larger than this (0 = no limit)
+        
+    Raises:
+        ValueError: the PDF is over max_bytes; fitz errors if it cannot be opened
+    """
+    source = _read_source(source, max_bytes)
+    _check_size(source, max_bytes)
+    doc = _open_document(source)
     try:
-        fitz = importlib.import_module(_mod)
-        break
-    except Exception as e:
-        last_exc = e
+        for page_index in range(_page_limit(doc, max_pages)):
+            yield page_index + 1, _page_text(doc, page_index)
+    finally:
+        doc.close()
 
-if fitz is None:
-    print("ERROR: PyMuPDF (fitz) is not installed or could not be imported. Install with: pip install pymupdf", file=sys.stderr)
-    if last_exc:
-        print(f"Import error: {last_exc}", file=sys.stderr)
-    sys.exit(1)
+def _extract_page_range(source, start, stop):
+    """Worker: text of pages [start, stop) - each worker opens its own copy of the document"""
+    doc = _open_document(source)
+    try:
+        return [doc[page_index].get_text() for page_index in range(start, stop)]
+    finally:
+        doc.close()
 
-import os  # For file path validation
-import json
+def _get_pool(workers):
+    """Shared worker pool (spawned, so it is safe from threaded servers)"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def _extract_pages_parallel(source, page_count, workers):
+    """Split the pages into one contiguous range per worker and extract them concurrently"""
+    chunk = -(-page_count // workers)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    pool = _get_pool(workers)
+    futures = [pool.submit(_extract_page_range, source, start, stop) for start, stop in ranges]
+    return [text for future in futures for text in future.result()]
 
-def extract_pdf_text(pdf_path):
-    """Extract all text from the PDF at the given path.
+def extract_pdf_pages(source, workers=PDF_WORKERS, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    """Text of each page, in order; uses the page-range worker pool for long documents"""
+    source = _read_source(source, max_bytes)
+    if not workers or workers < 2:
+        return [text for _, text in iter_pdf_pages(source, max_pages, max_bytes)]
+
+    _check_size(source, max_bytes)
+    doc = _open_document(source)
+    try:
+        page_count = _page_limit(doc, max_pages)
+        if page_count < PDF_PARALLEL_MIN_PAGES:
+            return [_page_text(doc, page_index) for page_index in range(page_count)]
+    finally:
+        doc.close()
+    return _extract_pages_parallel(source, page_count, workers)
+
+def extract_pdf_document(source, workers=PDF_WORKERS, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    """Extract all text from a PDF, with the number of pages it came from.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        source: Path to the PDF file, the PDF bytes, or a binary stream
+            (e.g. an uploaded file) to read them from
+        workers: Page-range worker processes for long documents (0 = extract in-process)
+        max_pages: Extract at most this many pages (0 = no limit)
+        max_bytes: Refuse PDFs larger than this (0 = no limit)
         
     Returns:
-        str: Extracted text from the PDF, or None if error
+        dict: {'text': extracted text, 'pages': pages extracted}, or None if error
     """
     try:
-        if not os.path.exists(pdf_path):
-            error_msg = f"PDF not found at: {pdf_path}"
+        if isinstance(source, (str, os.PathLike)) and not os.path.exists(source):
+            error_msg = f"PDF not found at: {source}"
             print(f"ERROR: {error_msg}", file=sys.stderr)
             return None
             
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
+        pages = extract_pdf_pages(source, workers, max_pages, max_bytes)
+        text = "".join(pages)
         
         if not text.strip():
             print("WARNING: No text extracted from PDF", file=sys.stderr)
             return None
             
-        return text
+        return {"text": text, "pages": len(pages)}
     except Exception as e:
         error_msg = f"PDF extraction error: {str(e)}"
         print(f"ERROR: {error_msg}", file=sys.stderr)
         return None
 
+def extract_pdf_text(source, workers=PDF_WORKERS, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    """Extract all text from a PDF (the text of extract_pdf_document()).
+    
+    Returns:
+        str: Extracted text from the PDF, or None if error
+    """
+    document = extract_pdf_document(source, workers, max_pages, max_bytes)
+    return document["text"] if document else None
+
+def extract_pdf_text_timed(source, max_pages=PDF_MAX_PAGES, max_bytes=PDF_MAX_BYTES):
+    """Worker for batch jobs: (extract_pdf_text(source) without the page pool, seconds taken)"""
+    start = time.perf_counter()
+    text = extract_pdf_text(source, 0, max_pages, max_bytes)
+    return text, time.perf_counter() - start
+
 if __name__ == "__main__":
-    # CLI usage: python pdf_text_extract.py <pdf_path>
-    if len(sys.argv) < 2:
-        print("Usage: python pdf_text_extract.py <pdf_path>")
+    # CLI usage: python pdf_text_extract.py <pdf_path> [--ndjson] [--workers N]
+    parser = argparse.ArgumentParser(description="Extract text from a PDF")
+    parser.add_argument("pdf_path")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Stream one JSON line per page, then a summary line")
+    parser.add_argument("--workers", type=int, default=PDF_WORKERS,
+                        help="Page-range worker processes for long documents")
+    parser.add_argument("--max-pages", type=int, default=PDF_MAX_PAGES)
+    parser.add_argument("--max-bytes", type=int, default=PDF_MAX_BYTES)
+    args = parser.parse_args()
+    
+    if not PDF_AVAILABLE:
+        print(f"ERROR: {PDF_INSTALL_HINT}", file=sys.stderr)
         sys.exit(1)
     
-    pdf_path = sys.argv[1]
-    text = extract_pdf_text(pdf_path)
+    if args.ndjson:
+        # Pages are written as soon as they are extracted
+        total_length = 0
+        page_count = 0
+        try:
+            for page_number, page_text in iter_pdf_pages(args.pdf_path, args.max_pages, args.max_bytes):
+                page_count = page_number
+                total_length += len(page_text)
+                print(json.dumps({"page": page_number, "text": page_text, "length": len(page_text)}), flush=True)
+        except Exception as e:
+            print(json.dumps({"success": False, "error": f"PDF extraction error: {e}", "pages": page_count}))
+            sys.exit(1)
+        print(json.dumps({"success": total_length > 0, "pages": page_count, "length": total_length}))
+        sys.exit(0 if total_length else 1)
+    
+    text = extract_pdf_text(args.pdf_path, args.workers, args.max_pages, args.max_bytes)
     
     if text:
         # Output as JSON for easier parsing
@@ -0,0 +1,113 @@
+"""
+Reference Embeddings Store
+Fixed phrase lists (e.g. the ideal resume characteristics used in ATS scoring)
+are encoded once per model and persisted as .npy files next to the HF cache
+"""
+
+import os
+import hashlib
+import threading
+from typing import Dict, List, Tuple
+
+from lazy_imports import lazy_module, is_available
+
+try:
+    import numpy as np
+    ML_AVAILABLE = is_available('torch')
+except ImportError:
+    ML_AVAILABLE = False
+
+# Imported on first use, not with the module
+torch = lazy_module('torch')
+
+from model_registry import get_model_fingerprint
+
+REFERENCE_EMBEDDINGS_DIR = os.path.expanduser('~/.cache/huggingface/jobhunter/reference_embeddings')
+
+_lock = threading.Lock()
+_embeddings: Dict[Tuple[str, str], "torch.Tensor"] = {}
+
+
+def _phrases_hash(phrases: List[str]) -> str:
+    """Hash of the phrase list, so editing it invalidates the stored vectors"""
+    digest = hashlib.sha256()
+    for phrase in phrases:
+        digest.update(phrase.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()[:16]
+
+
+def _file_path(name: str, fingerprint: str, phrases_hash: str) -> str:
+    return os.path.join(REFERENCE_EMBEDDINGS_DIR, f"{name}-{fingerprint}-{phrases_hash}.npy")
+
+
+def _load_from_disk(path: str, expected_rows: int):
+    """Load a stored matrix, or None if it is missing or does not match the phrase list"""
+    if not os.path.exists(path):
+        return None
+    try:
+        matrix = np.load(path)
+    except Exception as e:
+        print(f"⚠️ Could not read reference embeddings {path}: {e}")
+        return None
+    if matrix.ndim != 2 or matrix.shape[0] != expected_rows:
+        return None
+    return matrix
+
+
+def _save_to_disk(path: str, name: str, matrix) -> None:
+    """Atomically write the matrix and drop files left over from older models/phrase lists"""
+    try:
+        os.makedirs(REFERENCE_EMBEDDINGS_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, path)
+
+        for filename in os.listdir(REFERENCE_EMBEDDINGS_DIR):
+            stale = os.path.join(REFERENCE_EMBEDDINGS_DIR, filename)
+            if filename.startswith(f"{name}-") and filename.endswith('.npy') and stale != path:
+                os.remove(stale)
+    except OSError as e:
+        # Persisting is an optimisation only - the in-memory copy is still used
+        print(f"⚠️ Could not persist reference embeddings {path}: {e}")
+
+
+def get_reference_embeddings(model, name: str, phrases: List[str]):
+    """
+    Get the embeddings of a fixed phrase list for the given model
+
+    Looked up in memory first, then on disk; encoded (and persisted) only when
+    the model fingerprint or the phrase list changed.
+
+    Args:
+        model: Encoder with a SentenceTransformer-compatible encode()
+        name: Short identifier of the phrase list (used in the file name)
+        phrases: The phrases to encode
+
+    Returns:
+        Tensor of shape (len(phrases), dim) on the model's device
+    """
+    fingerprint = get_model_fingerprint(model)
+    phrases_hash = _phrases_hash(phrases)
+    key = (fingerprint, phrases_hash)
+
+    embeddings = _embeddings.get(key)
+    if embeddings is not None:
+        return embeddings
+
+    with _lock:
+        embeddings = _embeddings.get(key)
+        if embeddings is not None:
+            return embeddings
+
+        path = _file_path(name, fingerprint, phrases_hash)
+        matrix = _load_from_disk(path, len(phrases))
+        if matrix is None:
+            print(f"🧮 Encoding reference embeddings '{name}' ({len(phrases)} phrases)...")
+            matrix = model.encode(phrases, convert_to_numpy=True).astype(np.float32)
+            _save_to_disk(path, name, matrix)
+
+        embeddings = torch.from_numpy(matrix).to(model.device)
+        _embeddings[key] = embeddings
+        return embeddings
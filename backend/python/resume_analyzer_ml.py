@@ -3,80 +3,156 @@ ML-Based Resume Analyzer using Sentence-BERT
 Provides semantic analysis and ATS scoring using pre-trained transformers
 """
 
-import re
 import json
+import threading
 from typing import Dict, List, Any
 
-try:
-    from sentence_transformers import SentenceTransformer, util
-    import torch
-    import numpy as np
-    ML_AVAILABLE = True
-except ImportError:
-    ML_AVAILABLE = False
+from lazy_imports import lazy_module, is_available
+
+# Imported on first ML use, so rule-based analysis never loads torch
+util = lazy_module('sentence_transformers.util')
+torch = lazy_module('torch')
+ML_AVAILABLE = is_available('sentence_transformers', 'torch', 'numpy')
+if not ML_AVAILABLE:
     print("Warning: ML libraries not available. Install with: pip install sentence-transformers torch")
 
+from model_registry import DEFAULT_MODEL_NAME, FALLBACK_MODEL_NAME
+from encode_batcher import get_encoder
+from reference_embeddings import get_reference_embeddings
+from skill_lexicon import Lexicon
+from metrics import span
+from chunked_encoding import CHUNKED_ENCODING, encode_documents
+import resume_patterns as patterns
+from resume_segmenter import Segments, segment
+
+# Bump whenever a change to scoring or extraction changes analyze_resume() output:
+# cached results (analysis_cache.py) are keyed on it
+SCORER_VERSION = "hybrid-3.0"
+
+# Ideal resume characteristics (what ATS systems look for), used by _calculate_ml_ats_score
+ML_IDEAL_CHARACTERISTICS = [
+    "professional summary with clear career objectives and key achievements",
+    "detailed work experience with quantifiable accomplishments and impact metrics",
+    "comprehensive technical skills and competencies relevant to the role",
+    "educational background with degrees certifications and relevant coursework",
+    "strong action verbs describing responsibilities and achievements",
+    "contact information including email phone and location",
+    "clean formatting with clear section headers and bullet points"
+]
+
+# More comprehensive ideal characteristics for better semantic matching,
+# used by _calculate_hybrid_ats_score
+HYBRID_IDEAL_CHARACTERISTICS = [
+    "professional summary showcasing expertise and career goals with measurable achievements",
+    "work experience with quantified results showing impact percentages revenue growth and performance metrics",
+    "technical skills including programming languages frameworks cloud platforms and development tools",
+    "projects demonstrating hands-on experience with real-world applications and technologies",
+    "education credentials with degree specialization institution and graduation details",
+    "strong action verbs like developed implemented architected optimized managed and led",
+    "contact information with email phone LinkedIn GitHub and professional profiles",
+    "clear section organization with experience education skills projects and achievements",
+    "bullet points highlighting specific accomplishments with numbers percentages and outcomes",
+    "leadership collaboration and team management experience with measurable results"
+]
+
+
+# Enhanced skills extraction with comprehensive list
+COMMON_SKILLS = [
+    # Programming Languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "c", "ruby", "php", 
+    "swift", "kotlin", "go", "rust", "scala", "r", "matlab", "perl", "haskell",
+    # Web Technologies & Frameworks
+    "react", "angular", "vue", "vue.js", "node.js", "node", "express", "express.js",
+    "django", "flask", "spring", "spring boot", "asp.net", "html", "html5", "css", 
+    "css3", "sass", "less", "bootstrap", "tailwind", "tailwindcss", "material-ui",
+    "next.js", "next", "nuxt", "gatsby", "svelte", "backbone", "ember",
+    # Backend & APIs
+    "fastapi", "graphql", "rest", "restful", "soap", "grpc", "microservices",
+    "serverless", "lambda", "api", "websocket",
+    # Databases
+    "sql", "mysql", "postgresql", "postgres", "mongodb", "redis", "sqlite",
+    "oracle", "dynamodb", "cassandra", "elasticsearch", "mariadb", "neo4j",
+    "firestore", "supabase", "firebase",
+    # Cloud & DevOps
+    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "k8s",
+    "jenkins", "ci/cd", "terraform", "ansible", "vagrant", "git", "github", 
+    "gitlab", "bitbucket", "linux", "unix", "bash", "shell", "nginx", "apache",
+    # Data & AI/ML
+    "machine learning", "deep learning", "data analysis", "data science",
+    "artificial intelligence", "ai", "ml", "tensorflow", "pytorch", "keras",
+    "scikit-learn", "sklearn", "pandas", "numpy", "jupyter", "matplotlib",
+    "seaborn", "plotly", "tableau", "power bi", "spark", "hadoop", "airflow",
+    "etl", "data mining", "nlp", "computer vision", "opencv",
+    # Mobile Development
+    "android", "ios", "react native", "flutter", "xamarin", "ionic", "cordova",
+    "swift", "objective-c", "kotlin", "java android",
+    # Testing & Quality
+    "testing", "unit testing", "selenium", "jest", "mocha", "chai", "pytest",
+    "junit", "testng", "cypress", "puppeteer", "test automation", "tdd", "bdd",
+    # Tools & Others
+    "agile", "scrum", "jira", "confluence", "trello", "slack", "figma", "sketch",
+    "photoshop", "illustrator", "postman", "swagger", "webpack", "vite", "babel",
+    "eslint", "prettier", "vim", "vscode", "intellij", "eclipse", "xcode",
+    # Version Control & Collaboration
+    "version control", "source control", "git flow", "github actions", "travis ci",
+    "circle ci", "gitlab ci",
+    # Blockchain & Web3
+    "blockchain", "ethereum", "solidity", "web3", "smart contracts", "cryptocurrency",
+    # System Design & Architecture
+    "system design", "architecture", "design patterns", "oop", "functional programming",
+    "event-driven", "message queue", "kafka", "rabbitmq", "redis pub/sub",
+    # Soft skills
+    "leadership", "communication", "teamwork", "problem solving", "analytical",
+    "collaboration", "project management", "critical thinking", "mentoring",
+    "presentation", "negotiation", "time management", "event management",
+    "team management", "versatile", "trust building"
+]
+
+# Action verbs counted by _extract_resume_info
+ACTION_VERBS = [
+    "achieved", "improved", "developed", "implemented", "managed", "created",
+    "increased", "reduced", "led", "designed", "built", "optimized", "launched",
+    "delivered", "executed", "established", "streamlined", "spearheaded",
+    "automated", "collaborated", "coordinated", "directed", "engineered",
+    "enhanced", "founded", "generated", "initiated", "integrated", "maintained",
+    "operated", "planned", "programmed", "resolved", "supervised", "trained",
+    "upgraded", "validated", "architected", "deployed", "facilitated",
+    "migrated", "modernized", "orchestrated", "pioneered", "scaled",
+    "accelerated", "drove", "transformed", "revamped", "overhauled"
+]
+
+# Built once at import - scans a resume for every skill and verb in one pass
+RESUME_LEXICON = Lexicon({"skills": COMMON_SKILLS, "action_verbs": ACTION_VERBS})
+
 
 class ResumeAnalyzerML:
     """ML-powered resume analyzer using Sentence-BERT"""
     
-    def __init__(self):
-        """Initialize the ML model"""
+    def __init__(self, load_model: bool = True):
+        """
+        Initialize the ML model
+        
+        Args:
+            load_model: False for a rule-based analyzer (extraction and rule-based
+                        scoring only; torch is never imported)
+        """
         self.model = None
         # Use resume-specific fine-tuned model for better accuracy
-        self.model_name = 'anass1209/resume-job-matcher-all-MiniLM-L6-v2'
-        self.fallback_model = 'all-mpnet-base-v2'
+        self.model_name = DEFAULT_MODEL_NAME
+        self.fallback_model = FALLBACK_MODEL_NAME
         
+        if not load_model:
+            return
         if ML_AVAILABLE:
-            try:
-                print(f"Loading Resume-Job Matching Model: {self.model_name}...")
-                print("📌 This model is specifically fine-tuned for resume analysis!")
-                
-                # Try to load from local cache first
-                import os
-                cache_dir = os.path.expanduser('~/.cache/huggingface/hub')
-                model_path = os.path.join(cache_dir, f'models--{self.model_name.replace("/", "--")}')
-                
-                try:
-                    # Try to load resume-specific model
-                    if os.path.exists(model_path):
-                        snapshot_dirs = []
-                        snapshots_path = os.path.join(model_path, 'snapshots')
-                        if os.path.exists(snapshots_path):
-                            snapshot_dirs = [d for d in os.listdir(snapshots_path) if os.path.isdir(os.path.join(snapshots_path, d))]
-                        
-                        if snapshot_dirs:
-                            snapshot_path = os.path.join(snapshots_path, snapshot_dirs[0])
-                            print(f"📂 Loading model from local cache: {snapshot_path}")
-                            self.model = SentenceTransformer(snapshot_path)
-                        else:
-                            print("🌐 Loading model from HuggingFace...")
-                            self.model = SentenceTransformer(self.model_name)
-                    else:
-                        print("📥 Downloading resume-specific model (first time, ~90MB)...")
-                        self.model = SentenceTransformer(self.model_name)
-                    
-                    if self.model:
-                        self.model.eval()
-                        print("✅ Resume-specific model loaded successfully!")
-                        
-                except Exception as resume_model_error:
-                    # Fallback to general model
-                    print(f"⚠️  Resume model failed: {resume_model_error}")
-                    print(f"💡 Falling back to general model: {self.fallback_model}...")
-                    
-                    try:
-                        self.model = SentenceTransformer(self.fallback_model)
-                        if self.model:
-                            self.model.eval()
-                            print("✅ Fallback model loaded successfully!")
-                    except Exception as fallback_error:
-                        print(f"❌ Fallback model also failed: {fallback_error}")
-                        self.model = None
-                    
-            except Exception as e:
-                print(f"❌ Critical error loading models: {e}")
-                self.model = None
+            print("📌 Using resume-specific model for resume analysis (shared with job matcher)")
+            # Shared with JobMatcherML through the process-wide registry
+            self.model = get_encoder(self.model_name, fallback_model=self.fallback_model)
+            if self.model is None:
+                print("❌ No model could be loaded. Falling back to rule-based analysis.")
+            else:
+                # Load (or compute once) the reference embeddings used by the ATS scorers
+                get_reference_embeddings(self.model, 'hybrid_ats', HYBRID_IDEAL_CHARACTERISTICS)
+                get_reference_embeddings(self.model, 'ml_ats', ML_IDEAL_CHARACTERISTICS)
         else:
             print("❌ ML libraries not available. Falling back to rule-based analysis.")
     
@@ -131,13 +207,13 @@ class ResumeAnalyzerML:
                 missing_dates += 1
             else:
                 # Detect format patterns - be more flexible
-                if re.search(r'[A-Z][a-z]{2,8},?\s+\d{4}', duration):
+                if patterns.MONTH_YEAR_RE.search(duration):
                     date_formats.add('month_year')
-                elif re.search(r'\d{1,2}/\d{4}', duration):
+                elif patterns.MM_YYYY_RE.search(duration):
                     date_formats.add('mm_yyyy')
-                elif re.search(r'\d{4}-\d{2}', duration):
+                elif patterns.YYYY_MM_RE.search(duration):
                     date_formats.add('yyyy_mm')
-                elif re.search(r'\d{4}', duration):
+                elif patterns.YEAR_RE.search(duration):
                     date_formats.add('year_only')
         
         # Check education
@@ -146,7 +222,7 @@ class ResumeAnalyzerML:
             if not date:
                 missing_dates += 1
             else:
-                if re.search(r'\d{4}', str(date)):
+                if patterns.YEAR_RE.search(str(date)):
                     date_formats.add('year_only')
         
         # Calculate score and penalty - be more lenient
@@ -275,7 +351,7 @@ class ResumeAnalyzerML:
         score = 3.0  # Start with full points
         
         # Count average sentence length (approximation)
-        sentences = re.split(r'[.!?]+', text)
+        sentences = patterns.SENTENCE_SPLIT_RE.split(text)
         valid_sentences = [s for s in sentences if len(s.strip().split()) > 3]
         
         if len(valid_sentences) == 0:
@@ -307,7 +383,7 @@ class ResumeAnalyzerML:
     
     # ========== END NEW ATS FUNCTIONS ==========
     
-    def analyze_resume(self, text: str, target_level: str = None) -> Dict[str, Any]:
+    def analyze_resume(self, text: str, target_level: str = None, resume_embedding=None) -> Dict[str, Any]:
         """
         Analyze resume text using ML and rule-based approaches
         
@@ -315,6 +391,7 @@ class ResumeAnalyzerML:
             text: Resume text content
             target_level: Target experience level - 'entry', 'mid', 'senior' (optional)
                          If not provided, auto-detected from resume
+            resume_embedding: Embedding of text, if already encoded in a batch (optional)
             
         Returns:
             Dictionary with ATS score, insights, and recommendations
@@ -326,7 +403,8 @@ class ResumeAnalyzerML:
             }
         
         # Extract structured information
-        extracted_info = self._extract_resume_info(text)
+        with span("extract_info"):
+            extracted_info = self._extract_resume_info(text)
         
         # Use target level if provided, otherwise use auto-detected level
         experience_level = target_level if target_level else extracted_info.get("experience_level", "entry")
@@ -340,18 +418,20 @@ class ResumeAnalyzerML:
         extracted_info["target_level"] = experience_level
         
         # Calculate ATS score using HYBRID scoring system
-        if self.model is not None:
-            score_result = self._calculate_hybrid_ats_score(text, extracted_info, experience_level)
-            ats_score = score_result['total_score']
-            score_breakdown = score_result
-        else:
-            # Fallback to old ML scoring if model unavailable
-            ats_score = self._calculate_rule_based_score(text, extracted_info, experience_level)
-            score_breakdown = {'total_score': ats_score}
+        with span("score"):
+            if self.model is not None:
+                score_result = self._calculate_hybrid_ats_score(text, extracted_info, experience_level, resume_embedding)
+                ats_score = score_result['total_score']
+                score_breakdown = score_result
+            else:
+                # Fallback to old ML scoring if model unavailable
+                ats_score = self._calculate_rule_based_score(text, extracted_info, experience_level)
+                score_breakdown = {'total_score': ats_score}
         
         # Generate insights and recommendations based on target level
-        insights = self._generate_insights(extracted_info, ats_score, experience_level)
-        recommendations = self._generate_recommendations(extracted_info, ats_score, experience_level)
+        with span("insights"):
+            insights = self._generate_insights(extracted_info, ats_score, experience_level)
+            recommendations = self._generate_recommendations(extracted_info, ats_score, experience_level)
         
         # Determine status
         status, status_message = self._get_status(ats_score)
@@ -410,108 +490,63 @@ class ResumeAnalyzerML:
                     break
         
         # Contact information
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        
-        email = re.search(email_pattern, text)
-        phone = re.search(phone_pattern, text)
+        email = patterns.EMAIL_RE.search(text)
+        phone = patterns.PHONE_RE.search(text)
         
         # Extract location (city, state, country)
         location = None
-        location_patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),\s*([A-Z][a-z]+)',  # City, State
-            r'([A-Z][a-z]+),\s*([A-Z]{2})',  # City, ST
-        ]
-        for pattern in location_patterns:
-            match = re.search(pattern, text)
+        for pattern in patterns.LOCATION_PATTERNS:
+            match = pattern.search(text)
             if match:
                 location = match.group()
                 break
         
         # Extract LinkedIn URL
         linkedin = None
-        linkedin_patterns = [
-            r'linkedin\.com/in/([a-zA-Z0-9-]+)',
-            r'LinkedIn:\s*@?([a-zA-Z0-9-]+)',  # Support @username format
-            r'linkedin:\s*@?([a-zA-Z0-9-]+)'
-        ]
-        for pattern in linkedin_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in patterns.LINKEDIN_PATTERNS:
+            match = pattern.search(text)
             if match:
                 linkedin = match.group(1)
                 break
         
         # Extract GitHub URL
         github = None
-        github_patterns = [
-            r'github\.com/([a-zA-Z0-9-]+)',
-            r'Github:\s*@?([a-zA-Z0-9-]+)',  # Support @username format
-            r'github:\s*@?([a-zA-Z0-9-]+)'
-        ]
-        for pattern in github_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in patterns.GITHUB_PATTERNS:
+            match = pattern.search(text)
             if match:
                 github = match.group(1)
                 break
         
-        # Sections
-        section_keywords = {
-            "experience": ["experience", "work history", "employment", "professional experience", "workexperience"],
-            "education": ["education", "academic", "qualifications", "degree"],
-            "skills": ["skills", "technical skills", "competencies", "abilities", "expertise"],
-            "summary": ["summary", "objective", "profile", "about"],
-            "projects": ["projects", "portfolio", "work samples"],
-            "certifications": ["certifications", "certificates", "licenses"]
-        }
-        
-        found_sections = []
-        for section, keywords in section_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                found_sections.append(section)
+        # Sections: one pass classifies every line and indexes the section keywords,
+        # and the parsers below read their spans from it
+        segments = segment(text, text_lower)
+        found_sections = segments.found_sections()
         
         # Extract education details
-        education_info = self._extract_education(text, text_lower)
+        education_info = self._extract_education(segments)
         
         # Extract work experience
-        work_experience = self._extract_work_experience(text, text_lower)
+        work_experience = self._extract_work_experience(segments)
         
         # Extract projects
-        projects = self._extract_projects(text, text_lower)
-        
-        # Action verbs with frequency tracking
-        action_verbs = [
-            "achieved", "improved", "developed", "implemented", "managed", "created",
-            "increased", "reduced", "led", "designed", "built", "optimized", "launched",
-            "delivered", "executed", "established", "streamlined", "spearheaded",
-            "automated", "collaborated", "coordinated", "directed", "engineered",
-            "enhanced", "founded", "generated", "initiated", "integrated", "maintained",
-            "operated", "planned", "programmed", "resolved", "supervised", "trained",
-            "upgraded", "validated", "architected", "deployed", "facilitated",
-            "migrated", "modernized", "orchestrated", "pioneered", "scaled",
-            "accelerated", "drove", "transformed", "revamped", "overhauled"
-        ]
-        found_action_verbs = []
-        action_verb_frequency = {}
-        
-        for verb in action_verbs:
-            # Count occurrences
-            pattern = r'\b' + verb + r'\b'
-            matches = re.findall(pattern, text_lower)
-            count = len(matches)
-            if count > 0:
-                found_action_verbs.append(verb)
-                action_verb_frequency[verb] = count
+        projects = self._extract_projects(segments)
+        
+        # Skills and action verbs (with frequency tracking) in one pass over the text
+        lexicon_matches = RESUME_LEXICON.scan(text_lower)
+        found_action_verbs = RESUME_LEXICON.terms_found("action_verbs", lexicon_matches)
+        action_verb_frequency = {
+            verb: len(lexicon_matches["action_verbs"][verb]) for verb in found_action_verbs
+        }
         
         # Detect repetitive verbs (used more than 2 times) - ResumeWorded penalty
         repetitive_verbs = {verb: count for verb, count in action_verb_frequency.items() if count > 2}
         
         # Count bullet points and collect full bullet text (handling multi-line bullets)
-        bullet_pattern = r'^\s*[•\-\*◦▪]\s+'
         bullets_full_text = []
         current_bullet = None
         
         for line in lines:
-            if re.match(bullet_pattern, line):
+            if patterns.BULLET_RE.match(line):
                 # Save previous bullet
                 if current_bullet:
                     bullets_full_text.append(current_bullet)
@@ -528,92 +563,16 @@ class ResumeAnalyzerML:
         total_bullets = len(bullets_full_text)
         
         # Numbers and metrics - count overall and per bullet
-        numbers = re.findall(r'\b\d+[%$,kmKMbB]?\b', text)
+        numbers = patterns.NUMBER_RE.findall(text)
         
         # Count quantified bullets (bullets with numbers/metrics)
-        # Much more comprehensive patterns for quantification
-        quantified_bullets = 0
-        quantification_patterns = [
-            r'\d+\s*%',  # 30%, 30 %
-            r'\d+\s*(percent|percentage)',  # 30 percent
-            r'\$\s*\d+',  # $1000
-            r'\d+[\d,]*\s*(million|thousand|billion|k|m|b)\b',  # 1 million, 500k
-            r'\d+[\d,]*\+?\s*(users|customers|clients|people|participants|members|students|engineers)',  # 500+ users
-            r'\d+[\d,]*\s*(hours|days|weeks|months|years)',  # 3 months
-            r'\d+[\d,]*\s*(projects|features|components|modules|systems|applications|apps)',  # 5 projects
-            r'\d+[\d,]*\s*(x|times)',  # 2x, 3 times
-            r'(increased|decreased|reduced|improved|boosted|grew|raised|cut|saved|enhanced)\s+\w*\s*by\s*\d+',  # increased by 30
-            r'(over|more than|under|less than|up to)\s+\d+',  # over 100
-            r'\d+[\d,]*\s*(metrics|kpis|tickets|issues|bugs|tests)',  # 50 tickets
-            r'\d+[\d,]*\s*(revenue|sales|profit|cost|budget)',  # $50k revenue
-            r'from\s+\d+.*to\s+\d+',  # from 10 to 50
-        ]
-        
-        for bullet_text in bullets_full_text:
-            # Check if any quantification pattern matches in the full bullet text
-            if any(re.search(pattern, bullet_text.lower()) for pattern in quantification_patterns):
-                quantified_bullets += 1
-        
-        # Enhanced skills extraction with comprehensive list
-        common_skills = [
-            # Programming Languages
-            "python", "java", "javascript", "typescript", "c++", "c#", "c", "ruby", "php", 
-            "swift", "kotlin", "go", "rust", "scala", "r", "matlab", "perl", "haskell",
-            # Web Technologies & Frameworks
-            "react", "angular", "vue", "vue.js", "node.js", "node", "express", "express.js",
-            "django", "flask", "spring", "spring boot", "asp.net", "html", "html5", "css", 
-            "css3", "sass", "less", "bootstrap", "tailwind", "tailwindcss", "material-ui",
-            "next.js", "next", "nuxt", "gatsby", "svelte", "backbone", "ember",
-            # Backend & APIs
-            "fastapi", "graphql", "rest", "restful", "soap", "grpc", "microservices",
-            "serverless", "lambda", "api", "websocket",
-            # Databases
-            "sql", "mysql", "postgresql", "postgres", "mongodb", "redis", "sqlite",
-            "oracle", "dynamodb", "cassandra", "elasticsearch", "mariadb", "neo4j",
-            "firestore", "supabase", "firebase",
-            # Cloud & DevOps
-            "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "k8s",
-            "jenkins", "ci/cd", "terraform", "ansible", "vagrant", "git", "github", 
-            "gitlab", "bitbucket", "linux", "unix", "bash", "shell", "nginx", "apache",
-            # Data & AI/ML
-            "machine learning", "deep learning", "data analysis", "data science",
-            "artificial intelligence", "ai", "ml", "tensorflow", "pytorch", "keras",
-            "scikit-learn", "sklearn", "pandas", "numpy", "jupyter", "matplotlib",
-            "seaborn", "plotly", "tableau", "power bi", "spark", "hadoop", "airflow",
-            "etl", "data mining", "nlp", "computer vision", "opencv",
-            # Mobile Development
-            "android", "ios", "react native", "flutter", "xamarin", "ionic", "cordova",
-            "swift", "objective-c", "kotlin", "java android",
-            # Testing & Quality
-            "testing", "unit testing", "selenium", "jest", "mocha", "chai", "pytest",
-            "junit", "testng", "cypress", "puppeteer", "test automation", "tdd", "bdd",
-            # Tools & Others
-            "agile", "scrum", "jira", "confluence", "trello", "slack", "figma", "sketch",
-            "photoshop", "illustrator", "postman", "swagger", "webpack", "vite", "babel",
-            "eslint", "prettier", "vim", "vscode", "intellij", "eclipse", "xcode",
-            # Version Control & Collaboration
-            "version control", "source control", "git flow", "github actions", "travis ci",
-            "circle ci", "gitlab ci",
-            # Blockchain & Web3
-            "blockchain", "ethereum", "solidity", "web3", "smart contracts", "cryptocurrency",
-            # System Design & Architecture
-            "system design", "architecture", "design patterns", "oop", "functional programming",
-            "event-driven", "message queue", "kafka", "rabbitmq", "redis pub/sub",
-            # Soft skills
-            "leadership", "communication", "teamwork", "problem solving", "analytical",
-            "collaboration", "project management", "critical thinking", "mentoring",
-            "presentation", "negotiation", "time management", "event management",
-            "team management", "versatile", "trust building"
-        ]
-        found_skills = []
-        for skill in common_skills:
-            # Use word boundaries for exact matching
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
+        quantified_bullets = sum(
+            1 for bullet_text in bullets_full_text
+            if patterns.QUANTIFICATION_RE.search(bullet_text.lower())
+        )
         
-        # Remove duplicates and maintain order
-        found_skills = list(dict.fromkeys(found_skills))
+        # Skills found by the lexicon scan above (word-boundary matches, list order)
+        found_skills = RESUME_LEXICON.terms_found("skills", lexicon_matches)
         
         # Detect experience level (student, entry, mid, senior, principal)
         experience_level, years_of_experience = self._detect_experience_level(text, text_lower, total_bullets)
@@ -642,58 +601,28 @@ class ResumeAnalyzerML:
             "years_of_experience": years_of_experience
         }
     
-    def _extract_education(self, text: str, text_lower: str) -> List[Dict[str, Any]]:
+    def _extract_education(self, segments: Segments) -> List[Dict[str, Any]]:
         """Extract education information from resume"""
         education_list = []
         
-        # Find EDUCATION section
-        education_section_start = -1
-        education_keywords = ['education', 'academic background', 'qualifications']
-        
-        for keyword in education_keywords:
-            pos = text_lower.find(keyword)
-            if pos != -1:
-                education_section_start = pos
-                break
-        
-        if education_section_start == -1:
+        # EDUCATION section (until next major section)
+        section = segments.section('education')
+        if section is None:
             return education_list
         
-        # Extract text from education section (until next major section)
-        next_section_keywords = ['work experience', 'workexperience', 'experience', 'projects', 'skills', 'certifications']
-        education_section_end = len(text)
-        
-        for keyword in next_section_keywords:
-            pos = text_lower.find(keyword, education_section_start + 50)
-            if pos != -1 and pos < education_section_end:
-                education_section_end = pos
-        
-        education_text = text[education_section_start:education_section_end]
+        education_text = section.text
         
         # Look for university/institution names
-        institution_patterns = [
-            r'(IIIT\s+[A-Z][a-z]+(?:,\s*[A-Z]{2,3})?)',
-            r'(IIT\s+[A-Z][a-z]+)',
-            r'(NIT\s+[A-Z][a-z]+)',
-            r'([A-Z][A-Za-z\s]+(?:University|College|Institute|School)[^.\n]*)'
-        ]
-        
         institutions_found = []
-        for pattern in institution_patterns:
-            matches = re.finditer(pattern, education_text, re.IGNORECASE)
+        for pattern in patterns.INSTITUTION_PATTERNS:
+            matches = pattern.finditer(education_text)
             for match in matches:
                 institutions_found.append(match.group(1))
         
         # Look for degree patterns
-        degree_patterns = [
-            r'\b(B\.?Tech|Bachelor|B\.?E\.?|B\.?S\.?)\b',
-            r'\b(M\.?Tech|Master|M\.?E\.?|M\.?S\.?)\b',
-            r'\b(Ph\.?D\.?|Doctorate)\b'
-        ]
-        
         degrees_found = []
-        for pattern in degree_patterns:
-            matches = re.finditer(pattern, education_text, re.IGNORECASE)
+        for pattern in patterns.DEGREE_PATTERNS:
+            matches = pattern.finditer(education_text)
             for match in matches:
                 degrees_found.append(match.group(1))
         
@@ -706,8 +635,7 @@ class ResumeAnalyzerML:
                 fields_found.append(keyword.upper() if keyword == 'cse' else keyword.title())
         
         # Look for years
-        year_pattern = r'20\d{2}|202[0-9]'
-        years = re.findall(year_pattern, education_text)
+        years = patterns.EDUCATION_YEAR_RE.findall(education_text)
         
         # Combine findings into structured data
         if institutions_found or degrees_found:
@@ -721,46 +649,28 @@ class ResumeAnalyzerML:
         
         return education_list
     
-    def _extract_work_experience(self, text: str, text_lower: str) -> List[Dict[str, Any]]:
+    def _extract_work_experience(self, segments: Segments) -> List[Dict[str, Any]]:
         """Extract work experience from resume"""
         experience_list = []
         
-        # Find EXPERIENCE or WORK EXPERIENCE section
-        experience_section_start = -1
-        experience_keywords = ['workexperience', 'work experience', 'experience', 'employment history', 'professional experience']
-        
-        for keyword in experience_keywords:
-            pos = text_lower.find(keyword)
-            if pos != -1:
-                experience_section_start = pos
-                break
-        
-        if experience_section_start == -1:
+        # EXPERIENCE or WORK EXPERIENCE section (until next major section), already
+        # split into classified lines
+        section = segments.section('experience')
+        if section is None:
             return experience_list
         
-        # Extract text from experience section (until next major section)
-        next_section_keywords = ['summary', 'projects', 'skills', 'certifications', 'education']
-        experience_section_end = len(text)
-        
-        for keyword in next_section_keywords:
-            pos = text_lower.find(keyword, experience_section_start + 50)
-            if pos != -1 and pos < experience_section_end:
-                experience_section_end = pos
-        
-        experience_text = text[experience_section_start:experience_section_end]
-        lines = experience_text.split('\n')
+        experience_keywords = patterns.EXPERIENCE_KEYWORDS
+        lines = section.lines
         
         current_org = None
         current_role = None
         current_duration = None
         current_description = []
         
-        # Enhanced date pattern to match various formats including all abbreviations
-        date_pattern = r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\.?,?\s*\d{4}\s*[-–—]\s*(?:(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\.?,?\s*\d{4}|Present|Current|present|current)'
-        
         i = 0
         while i < len(lines):
-            line = lines[i].strip()
+            line = lines[i].text
+            is_bullet = lines[i].kind == 'bullet'
             
             # Skip empty lines and section headers
             if not line or line.lower() in experience_keywords:
@@ -768,7 +678,7 @@ class ResumeAnalyzerML:
                 continue
             
             # Check if this line has a date (inline format)
-            date_match = re.search(date_pattern, line, re.IGNORECASE)
+            date_match = lines[i].date
             
             if date_match:
                 # Save previous experience if exists
@@ -800,13 +710,12 @@ class ResumeAnalyzerML:
                 
             # Check if next 2 lines form a 3-line format: Role, Organization, Date
             elif i + 2 < len(lines):
-                next_line = lines[i + 1].strip()
-                next_next_line = lines[i + 2].strip()
+                next_line = lines[i + 1].text
                 
                 # Check if line after next has a date pattern
-                date_match_ahead = re.search(date_pattern, next_next_line, re.IGNORECASE)
+                date_match_ahead = lines[i + 2].date
                 
-                if date_match_ahead and not line.startswith(('-', '•', '*', '◦', '▪')):
+                if date_match_ahead and not is_bullet:
                     # Save previous experience if exists
                     if current_org or current_role:
                         experience_list.append({
@@ -826,15 +735,15 @@ class ResumeAnalyzerML:
                     continue
             
             # Handle bullet points (description lines)
-            if (current_org or current_role) and (line.startswith(('-', '•', '*', '◦', '▪')) or (current_description and len(line) > 10)):
+            if (current_org or current_role) and (is_bullet or (current_description and len(line) > 10)):
                 # Add to current description
-                if line.startswith(('-', '•', '*', '◦', '▪')):
+                if is_bullet:
                     line = line[1:].strip()
                 current_description.append(line)
                 i += 1
                 
             # Might be organization name without date format (fallback)
-            elif not current_org and not line.startswith(('-', '•', '*', '◦', '▪')):
+            elif not current_org and not is_bullet:
                 if len(line.split()) <= 6 and not any(char.isdigit() for char in line):
                     current_org = line
                     current_role = None
@@ -855,40 +764,18 @@ class ResumeAnalyzerML:
         
         return experience_list
     
-    def _extract_projects(self, text: str, text_lower: str) -> List[Dict[str, Any]]:
+    def _extract_projects(self, segments: Segments) -> List[Dict[str, Any]]:
         """Extract project information from resume"""
         projects_list = []
         
-        # Find PROJECTS section - look for it as a section header (at start of line or with minimal prefix)
-        projects_section_start = -1
-        project_keywords = ['projects', 'portfolio', 'work samples', 'key projects', 'personal projects']
-        
-        for keyword in project_keywords:
-            # Use pattern that matches the keyword at the start of a line (possibly with leading whitespace)
-            # or with only a few characters before it (section marker like numbers/bullets)
-            pattern = r'(?:^|\n)\s{0,5}' + keyword + r'\b'
-            match = re.search(pattern, text_lower, re.MULTILINE)
-            if match:
-                projects_section_start = match.end() - len(keyword)
-                break
-        
-        if projects_section_start == -1:
+        # PROJECTS section - starts at a section header (keyword at the start of a line,
+        # possibly with leading whitespace) and runs until the next major section header
+        section = segments.section('projects')
+        if section is None:
             return projects_list
         
-        # Extract text from projects section (until next major section)
-        next_section_keywords = ['education', 'experience', 'skills', 'certifications', 'languages', 'links', 'achievements', 'summary']
-        projects_section_end = len(text)
-        
-        for keyword in next_section_keywords:
-            pattern = r'(?:^|\n)\s{0,5}' + keyword + r'\b'
-            match = re.search(pattern, text_lower[projects_section_start + 50:], re.MULTILINE)
-            if match:
-                candidate_end = projects_section_start + 50 + match.start()
-                if candidate_end < projects_section_end:
-                    projects_section_end = candidate_end
-        
-        projects_text = text[projects_section_start:projects_section_end]
-        lines = [l.strip() for l in projects_text.split('\n') if l.strip()]
+        project_keywords = patterns.PROJECT_KEYWORDS
+        lines = [line.strip() for line in section.raw_lines if line.strip()]
         
         i = 0
         while i < len(lines):
@@ -1006,11 +893,11 @@ class ResumeAnalyzerML:
         
         # Extract years of experience from text
         # Pattern 1: "X years of experience"
-        years_pattern1 = re.findall(r'(\d+)\+?\s*years?\s+(?:of\s+)?experience', text_lower)
+        years_pattern1 = patterns.YEARS_OF_EXPERIENCE_RE.findall(text_lower)
         # Pattern 2: "X+ years experience"
-        years_pattern2 = re.findall(r'(\d+)\+?\s*years?\s+experience', text_lower)
+        years_pattern2 = patterns.YEARS_EXPERIENCE_RE.findall(text_lower)
         # Pattern 3: Count work history date ranges
-        date_ranges = re.findall(r'(20\d{2})\s*[-–—]\s*(20\d{2}|present|current)', text_lower)
+        date_ranges = patterns.YEAR_RANGE_RE.findall(text_lower)
         
         # Get explicit years mentioned
         if years_pattern1 or years_pattern2:
@@ -1074,20 +961,10 @@ class ResumeAnalyzerML:
         # Initialize score breakdown dictionary
         score_breakdown = {}
         
-        # Ideal resume characteristics (what ATS systems look for)
-        ideal_characteristics = [
-            "professional summary with clear career objectives and key achievements",
-            "detailed work experience with quantifiable accomplishments and impact metrics",
-            "comprehensive technical skills and competencies relevant to the role",
-            "educational background with degrees certifications and relevant coursework",
-            "strong action verbs describing responsibilities and achievements",
-            "contact information including email phone and location",
-            "clean formatting with clear section headers and bullet points"
-        ]
-        
         # Calculate semantic similarity between resume and ideal characteristics
+        # (reference embeddings are precomputed once per model)
         resume_embedding = self.model.encode(text, convert_to_tensor=True)
-        ideal_embeddings = self.model.encode(ideal_characteristics, convert_to_tensor=True)
+        ideal_embeddings = get_reference_embeddings(self.model, 'ml_ats', ML_IDEAL_CHARACTERISTICS)
         
         # Compute cosine similarity
         similarities = util.cos_sim(resume_embedding, ideal_embeddings)[0]
@@ -1419,7 +1296,7 @@ class ResumeAnalyzerML:
         
         return score_breakdown
     
-    def _calculate_hybrid_ats_score(self, text: str, info: Dict, experience_level: str = "entry") -> Dict:
+    def _calculate_hybrid_ats_score(self, text: str, info: Dict, experience_level: str = "entry", resume_embedding=None) -> Dict:
         """
         HYBRID ATS SCORING SYSTEM v3.0
         Combines ML Semantic (20%) + ATS Formatting (28%) + Content (24%) + Skills (18%) + Education (10%) + Language (8%) + Length (2%)
@@ -1431,26 +1308,20 @@ class ResumeAnalyzerML:
         
         ml_score = 0.0
         if self.model is not None:
-            # More comprehensive ideal characteristics for better semantic matching
-            ideal_characteristics = [
-                "professional summary showcasing expertise and career goals with measurable achievements",
-                "work experience with quantified results showing impact percentages revenue growth and performance metrics",
-                "technical skills including programming languages frameworks cloud platforms and development tools",
-                "projects demonstrating hands-on experience with real-world applications and technologies",
-                "education credentials with degree specialization institution and graduation details",
-                "strong action verbs like developed implemented architected optimized managed and led",
-                "contact information with email phone LinkedIn GitHub and professional profiles",
-                "clear section organization with experience education skills projects and achievements",
-                "bullet points highlighting specific accomplishments with numbers percentages and outcomes",
-                "leadership collaboration and team management experience with measurable results"
-            ]
-            
-            resume_embedding = self.model.encode(text, convert_to_tensor=True)
-            ideal_embeddings = self.model.encode(ideal_characteristics, convert_to_tensor=True)
-            similarities = util.cos_sim(resume_embedding, ideal_embeddings)[0]
-            # Use top 5 similarities for better coverage
-            top_similarities = torch.topk(similarities, k=min(5, len(similarities))).values
-            avg_top_similarity = torch.mean(top_similarities).item()
+            ideal_embeddings = get_reference_embeddings(self.model, 'hybrid_ats', HYBRID_IDEAL_CHARACTERISTICS)
+            if resume_embedding is None and CHUNKED_ENCODING:
+                # Long resumes are encoded section by section instead of truncated
+                resume_embedding = encode_documents(self.model, [text])[0]
+            if resume_embedding is None:
+                with span("encode"):
+                    resume_embedding = self.model.encode(text, convert_to_tensor=True)
+            else:
+                resume_embedding = torch.as_tensor(resume_embedding, device=ideal_embeddings.device)
+            with span("similarity"):
+                similarities = util.cos_sim(resume_embedding, ideal_embeddings)[0]
+                # Use top 5 similarities for better coverage
+                top_similarities = torch.topk(similarities, k=min(5, len(similarities))).values
+                avg_top_similarity = torch.mean(top_similarities).item()
             # More strict: multiply by 22 instead of 25
             ml_score = min(20.0, avg_top_similarity * 22)
         
@@ -2175,7 +2046,9 @@ class ResumeAnalyzerML:
                 recommendations.append(f"📝 Expand on your leadership impact (currently {total_bullets}, aim for 35+)")
         
         # Sections
-        missing_sections = set(["experience", "education", "skills", "summary"]) - set(info["sections"])
+        # A list, not a set difference: the recommendation order must not depend on hash seeds
+        missing_sections = [section for section in ["experience", "education", "skills", "summary"]
+                            if section not in info["sections"]]
         if missing_sections:
             for section in missing_sections:
                 recommendations.append(f"📝 Add a '{section.title()}' section to improve structure")
@@ -2259,15 +2132,28 @@ class ResumeAnalyzerML:
 
 # Singleton instance
 _analyzer_instance = None
+_analyzer_lock = threading.Lock()
 
 def get_analyzer() -> ResumeAnalyzerML:
-    """Get or create analyzer instance (singleton pattern)"""
+    """Get or create analyzer instance (singleton pattern, safe to call from several threads)"""
     global _analyzer_instance
     if _analyzer_instance is None:
-        _analyzer_instance = ResumeAnalyzerML()
+        with _analyzer_lock:
+            if _analyzer_instance is None:
+                _analyzer_instance = ResumeAnalyzerML()
     return _analyzer_instance
 
 
+_rule_analyzer_instance = None
+
+def get_rule_analyzer() -> ResumeAnalyzerML:
+    """Get or create the analyzer without a model (rule-based scoring, singleton pattern)"""
+    global _rule_analyzer_instance
+    if _rule_analyzer_instance is None:
+        _rule_analyzer_instance = ResumeAnalyzerML(load_model=False)
+    return _rule_analyzer_instance
+
+
 # CLI usage
 if __name__ == "__main__":
     import sys
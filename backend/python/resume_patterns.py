@@ -0,0 +1,127 @@
+"""
+Resume Extraction Patterns
+Every regular expression used by the resume extraction pipeline, compiled once at import.
+Patterns that are tried in order ("first one that matches wins") stay as ordered tuples;
+patterns that are only tested for "does any of them match" are merged into one alternation.
+"""
+
+import re
+
+# Contact information
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+LOCATION_PATTERNS = (
+    re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),\s*([A-Z][a-z]+)'),  # City, State
+    re.compile(r'([A-Z][a-z]+),\s*([A-Z]{2})'),  # City, ST
+)
+
+# "LinkedIn:" and "linkedin:" are the same pattern once case is ignored
+LINKEDIN_PATTERNS = (
+    re.compile(r'linkedin\.com/in/([a-zA-Z0-9-]+)', re.IGNORECASE),
+    re.compile(r'linkedin:\s*@?([a-zA-Z0-9-]+)', re.IGNORECASE),  # Support @username format
+)
+GITHUB_PATTERNS = (
+    re.compile(r'github\.com/([a-zA-Z0-9-]+)', re.IGNORECASE),
+    re.compile(r'github:\s*@?([a-zA-Z0-9-]+)', re.IGNORECASE),  # Support @username format
+)
+
+# Bullets and metrics
+BULLET_RE = re.compile(r'^\s*[•\-\*◦▪]\s+')
+NUMBER_RE = re.compile(r'\b\d+[%$,kmKMbB]?\b')
+
+# Bullet quantification: a bullet counts as quantified if any of these matches.
+# Merged into one alternation and factored around the shared number prefix, so each
+# position of a bullet is tried once instead of once per pattern.
+_AUDIENCE_UNITS = r'users|customers|clients|people|participants|members|students|engineers'
+_QUANTITY_UNITS = (
+    r'(?:million|thousand|billion|k|m|b)\b'                          # 1 million, 500k
+    r'|hours|days|weeks|months|years'                                 # 3 months
+    r'|projects|features|components|modules|systems|applications|apps'  # 5 projects
+    r'|x|times'                                                       # 2x, 3 times
+    r'|metrics|kpis|tickets|issues|bugs|tests'                        # 50 tickets
+    r'|revenue|sales|profit|cost|budget'                              # $50k revenue
+)
+QUANTIFICATION_RE = re.compile('|'.join([
+    r'\d\s*(?:%|percent)',  # 30%, 30 %, 30 percent(age)
+    r'\$\s*\d',  # $1000
+    rf'\d[\d,]*(?:\+\s*(?:{_AUDIENCE_UNITS})|\s*(?:{_AUDIENCE_UNITS}|{_QUANTITY_UNITS}))',  # 500+ users
+    r'(?:increased|decreased|reduced|improved|boosted|grew|raised|cut|saved|enhanced)\s+\w*\s*by\s*\d',  # increased by 30
+    r'(?:over|more than|under|less than|up to)\s+\d',  # over 100
+    r'from\s+\d.*to\s+\d',  # from 10 to 50
+]))
+
+# Date formats (date consistency check)
+MONTH_YEAR_RE = re.compile(r'[A-Z][a-z]{2,8},?\s+\d{4}')
+MM_YYYY_RE = re.compile(r'\d{1,2}/\d{4}')
+YYYY_MM_RE = re.compile(r'\d{4}-\d{2}')
+YEAR_RE = re.compile(r'\d{4}')
+
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+# Education
+INSTITUTION_PATTERNS = (
+    re.compile(r'(IIIT\s+[A-Z][a-z]+(?:,\s*[A-Z]{2,3})?)', re.IGNORECASE),
+    re.compile(r'(IIT\s+[A-Z][a-z]+)', re.IGNORECASE),
+    re.compile(r'(NIT\s+[A-Z][a-z]+)', re.IGNORECASE),
+    re.compile(r'([A-Z][A-Za-z\s]+(?:University|College|Institute|School)[^.\n]*)', re.IGNORECASE),
+)
+DEGREE_PATTERNS = (
+    re.compile(r'\b(B\.?Tech|Bachelor|B\.?E\.?|B\.?S\.?)\b', re.IGNORECASE),
+    re.compile(r'\b(M\.?Tech|Master|M\.?E\.?|M\.?S\.?)\b', re.IGNORECASE),
+    re.compile(r'\b(Ph\.?D\.?|Doctorate)\b', re.IGNORECASE),
+)
+EDUCATION_YEAR_RE = re.compile(r'20\d{2}|202[0-9]')
+
+# Work experience: "Jan 2020 - Present", "March, 2019 – Sept 2021", ...
+# Month names as a prefix trie (Jan/January, Sep/Sept/September, ...) - match spans are
+# the same as listing every spelling, with far less backtracking
+_MONTHS = (
+    r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+    r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?'
+)
+DATE_RANGE_RE = re.compile(
+    rf'({_MONTHS})\.?,?\s*\d{{4}}\s*[-–—]\s*'
+    rf'(?:({_MONTHS})\.?,?\s*\d{{4}}|present|current)',
+    re.IGNORECASE
+)
+
+# Experience level
+YEARS_OF_EXPERIENCE_RE = re.compile(r'(\d+)\+?\s*years?\s+(?:of\s+)?experience')
+YEARS_EXPERIENCE_RE = re.compile(r'(\d+)\+?\s*years?\s+experience')
+YEAR_RANGE_RE = re.compile(r'(20\d{2})\s*[-–—]\s*(20\d{2}|present|current)')
+
+
+def section_header_re(keyword: str) -> re.Pattern:
+    """Keyword at the start of a line (up to 5 leading spaces), as a whole word"""
+    return re.compile(r'(?:^|\n)\s{0,5}' + keyword + r'\b', re.MULTILINE)
+
+
+# Sections: name -> keywords that indicate it (anywhere in the text for "sections found";
+# on a short line of their own they are treated as a heading)
+SECTION_KEYWORDS = {
+    "experience": ["experience", "work history", "employment", "professional experience", "workexperience"],
+    "education": ["education", "academic", "qualifications", "degree"],
+    "skills": ["skills", "technical skills", "competencies", "abilities", "expertise"],
+    "summary": ["summary", "objective", "profile", "about"],
+    "projects": ["projects", "portfolio", "work samples"],
+    "certifications": ["certifications", "certificates", "licenses"]
+}
+SECTION_HEADING_MAX_WORDS = 4
+
+# Education / work experience section boundaries: the section starts at the first of
+# its keywords found anywhere in the text and ends at the nearest end keyword at least
+# SECTION_MIN_LENGTH characters later
+EDUCATION_KEYWORDS = ['education', 'academic background', 'qualifications']
+EDUCATION_END_KEYWORDS = ['work experience', 'workexperience', 'experience', 'projects', 'skills', 'certifications']
+EXPERIENCE_KEYWORDS = ['workexperience', 'work experience', 'experience', 'employment history', 'professional experience']
+EXPERIENCE_END_KEYWORDS = ['summary', 'projects', 'skills', 'certifications', 'education']
+SECTION_MIN_LENGTH = 50
+
+BULLET_CHARS = ('-', '•', '*', '◦', '▪')
+
+# Projects section boundaries
+PROJECT_KEYWORDS = ['projects', 'portfolio', 'work samples', 'key projects', 'personal projects']
+PROJECT_END_KEYWORDS = ['education', 'experience', 'skills', 'certifications', 'languages', 'links', 'achievements', 'summary']
+PROJECT_HEADER_PATTERNS = [(keyword, section_header_re(keyword)) for keyword in PROJECT_KEYWORDS]
+PROJECT_END_PATTERNS = [section_header_re(keyword) for keyword in PROJECT_END_KEYWORDS]
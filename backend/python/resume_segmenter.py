@@ -0,0 +1,237 @@
+"""
+Resume Section Segmenter
+One pass over a resume, shared by the section parsers instead of each re-scanning
+the text for its own start and end keywords:
+- every section keyword occurrence is indexed by position (and by whether it starts
+  a line) once, so "which sections exist" and section boundaries become lookups
+- the text is split into lines once; each line is classified at most once, when a
+  parser first reads it: blank, bullet, header (a short line naming a section),
+  date (contains a date range, the match is kept) or text
+- section() returns a span with its text and its lines, already split and (when
+  read) classified
+Boundaries follow the rules the extractors have always used (see resume_patterns),
+so the extracted information is unchanged.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, List, NamedTuple, Optional
+
+import resume_patterns as patterns
+
+# Every keyword a boundary rule or the section list looks for
+_ALL_KEYWORDS = list(dict.fromkeys(
+    [keyword for keywords in patterns.SECTION_KEYWORDS.values() for keyword in keywords]
+    + patterns.EDUCATION_KEYWORDS + patterns.EDUCATION_END_KEYWORDS
+    + patterns.EXPERIENCE_KEYWORDS + patterns.EXPERIENCE_END_KEYWORDS
+    + patterns.PROJECT_KEYWORDS + patterns.PROJECT_END_KEYWORDS
+))
+# Keywords whose line-start occurrences (section headers) are tracked
+_HEADER_KEYWORDS = frozenset(patterns.PROJECT_KEYWORDS + patterns.PROJECT_END_KEYWORDS)
+
+HEADER_MAX_INDENT = 5
+
+
+class Line(NamedTuple):
+    raw: str
+    text: str  # stripped
+    start: int  # offset of the raw line in the text
+    kind: str  # 'blank' | 'bullet' | 'header' | 'date' | 'text'
+    date: Optional[re.Match]  # DATE_RANGE_RE match (on any non-blank line)
+
+
+def is_section_heading(line: str) -> bool:
+    """A short line naming a resume section ("Work Experience", "SKILLS:", ...)"""
+    words = line.split()
+    if not words or len(words) > patterns.SECTION_HEADING_MAX_WORDS:
+        return False
+    line_lower = line.lower()
+    return any(keyword in line_lower
+               for keywords in patterns.SECTION_KEYWORDS.values() for keyword in keywords)
+
+
+def classify(raw: str, start: int = 0) -> Line:
+    """Classify one line"""
+    text = raw.strip()
+    if not text:
+        return Line(raw, text, start, 'blank', None)
+    date = patterns.DATE_RANGE_RE.search(text)
+    if text.startswith(patterns.BULLET_CHARS):
+        kind = 'bullet'
+    elif is_section_heading(text):
+        kind = 'header'
+    else:
+        kind = 'date' if date else 'text'
+    return Line(raw, text, start, kind, date)
+
+
+def _ends_word(text: str, end: int) -> bool:
+    """re's \\b after a keyword ending at `end`"""
+    return end >= len(text) or not (text[end].isalnum() or text[end] == '_')
+
+
+class Segments:
+    """Keyword positions and (lazily classified) lines of one resume"""
+
+    def __init__(self, text: str, text_lower: Optional[str] = None):
+        self.text = text
+        self.lower = text_lower if text_lower is not None else text.lower()
+        self._raw_lines = text.split('\n')
+        self._starts = list(accumulate((len(line) + 1 for line in self.lower.split('\n')[:-1]), initial=0))
+        self._lines: List[Optional[Line]] = [None] * len(self._raw_lines)
+
+        # Keyword -> offsets of every occurrence / of occurrences starting a line
+        # (after at most HEADER_MAX_INDENT whitespace characters). Keywords never contain
+        # a newline, so this finds the same occurrences as scanning line by line; str.find
+        # per keyword beats one regex alternation tried at every position.
+        self.positions: Dict[str, List[int]] = {}
+        self.headers: Dict[str, List[int]] = {}
+        lower = self.lower
+        for keyword in _ALL_KEYWORDS:
+            position = lower.find(keyword)
+            if position == -1:
+                continue
+            positions = self.positions[keyword] = []
+            while position != -1:
+                positions.append(position)
+                if keyword in _HEADER_KEYWORDS and self._starts_line(position, len(keyword)):
+                    self.headers.setdefault(keyword, []).append(position)
+                position = lower.find(keyword, position + 1)
+
+    def _starts_line(self, position: int, length: int) -> bool:
+        """Keyword at `position` is a whole word after at most HEADER_MAX_INDENT whitespace characters"""
+        line_start = self._starts[bisect_right(self._starts, position) - 1]
+        return (position - line_start <= HEADER_MAX_INDENT
+                and not self.lower[line_start:position].strip()
+                and _ends_word(self.lower, position + length))
+
+    def line(self, index: int) -> Line:
+        """Line `index`, classified on first use"""
+        line = self._lines[index]
+        if line is None:
+            line = self._lines[index] = classify(self._raw_lines[index], self._starts[index])
+        return line
+
+    @property
+    def lines(self) -> List[Line]:
+        return [self.line(index) for index in range(len(self._raw_lines))]
+
+    def found_sections(self) -> List[str]:
+        """SECTION_KEYWORDS sections with any of their keywords in the text"""
+        return [section for section, keywords in patterns.SECTION_KEYWORDS.items()
+                if any(keyword in self.positions for keyword in keywords)]
+
+    def section(self, name: str) -> Optional["Section"]:
+        """The 'education', 'experience' or 'projects' span, or None if it has no start"""
+        if name == 'projects':
+            start = self._first(self.headers, patterns.PROJECT_KEYWORDS)
+            if start == -1:
+                return None
+            end = self._projects_end(start)
+        else:
+            keywords, end_keywords = {
+                'education': (patterns.EDUCATION_KEYWORDS, patterns.EDUCATION_END_KEYWORDS),
+                'experience': (patterns.EXPERIENCE_KEYWORDS, patterns.EXPERIENCE_END_KEYWORDS),
+            }[name]
+            start = self._first(self.positions, keywords)
+            if start == -1:
+                return None
+            end = len(self.text)
+            for keyword in end_keywords:
+                position = self._next(self.positions, keyword, start + patterns.SECTION_MIN_LENGTH)
+                if position != -1 and position < end:
+                    end = position
+        return Section(self, name, start, end)
+
+    @staticmethod
+    def _first(index: Dict[str, List[int]], keywords: List[str]) -> int:
+        """Position of the first keyword (in priority order) that occurs at all"""
+        for keyword in keywords:
+            positions = index.get(keyword)
+            if positions:
+                return positions[0]
+        return -1
+
+    @staticmethod
+    def _next(index: Dict[str, List[int]], keyword: str, offset: int) -> int:
+        positions = index.get(keyword, ())
+        i = bisect_left(positions, offset)
+        return positions[i] if i < len(positions) else -1
+
+    def _projects_end(self, start: int) -> int:
+        """Nearest end-keyword header at least SECTION_MIN_LENGTH characters after start"""
+        offset = start + patterns.SECTION_MIN_LENGTH
+        end = len(self.text)
+        if len(self.text) != len(self.lower):
+            # Whitespace before a header only stays whitespace when both texts line up
+            # (see Section), so search the header patterns exactly as written
+            remaining = self.lower[offset:]
+            for pattern in patterns.PROJECT_END_PATTERNS:
+                match = pattern.search(remaining)
+                if match:
+                    end = min(end, offset + match.start())
+            return end
+        for keyword in patterns.PROJECT_END_KEYWORDS:
+            position = self._next(self.headers, keyword, offset)
+            # The header pattern was searched from `offset`, so a keyword right there (after at
+            # most HEADER_MAX_INDENT whitespace characters) counts even in mid-line
+            candidate = self._next(self.positions, keyword, offset)
+            if (candidate != -1 and candidate - offset <= HEADER_MAX_INDENT
+                    and not self.lower[offset:candidate].strip()
+                    and _ends_word(self.lower, candidate + len(keyword))):
+                position = candidate if position == -1 else min(position, candidate)
+            if position != -1 and position < end:
+                end = position
+        return end
+
+
+
+class Section:
+    """
+    A section span: its text, its lines (text.split('\n'), taken from the segmenter's
+    split) and, on first access, their classification
+    """
+
+    def __init__(self, segments: Segments, name: str, start: int, end: int):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.text = segments.text[start:end]
+        self._segments = segments
+        self._first = max(bisect_right(segments._starts, start) - 1, 0)
+        last = bisect_right(segments._starts, end) - 1
+        self.raw_lines = segments._raw_lines[self._first:last + 1]
+        if len(segments.text) != len(segments.lower):
+            # Lowercasing changed the length (e.g. 'İ'), so offsets are only meaningful in
+            # the lowercase text and the lines are taken from the slice as they always were
+            self.raw_lines = self.text.split('\n')
+            self._cut = set(range(len(self.raw_lines)))
+            self._lines = None
+            return
+        # The span can cut its first and last line
+        self._cut = set()
+        for offset in {0, len(self.raw_lines) - 1}:
+            line_start = segments._starts[self._first + offset]
+            line_end = line_start + len(self.raw_lines[offset])
+            if line_start < start or line_end > end:
+                self.raw_lines[offset] = segments.text[max(start, line_start):min(end, line_end)]
+                self._cut.add(offset)
+        self._lines: Optional[List[Line]] = None
+
+    @property
+    def lines(self) -> List[Line]:
+        """Classified lines - whole lines are shared with the segmenter, cut ones re-classified"""
+        if self._lines is None:
+            segments = self._segments
+            self._lines = [
+                classify(raw, max(self.start, segments._starts[self._first + offset]))
+                if offset in self._cut else segments.line(self._first + offset)
+                for offset, raw in enumerate(self.raw_lines)
+            ]
+        return self._lines
+
+
+def segment(text: str, text_lower: Optional[str] = None) -> Segments:
+    """Index the section keywords and split the lines of a resume"""
+    return Segments(text, text_lower)
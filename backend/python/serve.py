@@ -0,0 +1,129 @@
+"""
+Production Server Launcher
+Runs the Flask app under Gunicorn with a configurable number of worker processes
+and threads per worker. On CPU the models are loaded and warmed in the master
+before forking, so every worker shares the same weights copy-on-write. Otherwise
+(CUDA) each worker loads them on a background thread and serves the rule-based
+fallbacks, flagged degraded, until they are warm.
+
+With --rules-only (RULES_ONLY=1) the workers serve extraction and rule-based
+scoring only: no model is loaded and torch is never imported, so they boot in well
+under a second.
+
+Usage: python serve.py [--bind HOST:PORT] [--workers N] [--threads N] [--rules-only]
+"""
+
+import os
+import sys
+import argparse
+
+from autotune import apply_tuning, set_torch_threads, torch_threads_per_worker
+
+# Defaults from autotune.json (python autotune.py), below explicit environment variables
+apply_tuning()
+
+# Configuration (command-line flags override these)
+WEB_BIND = os.environ.get('WEB_BIND', '0.0.0.0:5000')
+WEB_WORKERS = int(os.environ.get('WEB_WORKERS', '2'))
+WEB_THREADS = int(os.environ.get('WEB_THREADS', '4'))
+# Seconds a request may run before its worker is restarted
+WEB_TIMEOUT = int(os.environ.get('WEB_TIMEOUT', '120'))
+# Seconds in-flight requests get to finish after SIGTERM
+WEB_GRACEFUL_TIMEOUT = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', '30'))
+# Rule-only fast boot (read by app.py as well)
+RULES_ONLY = os.environ.get('RULES_ONLY', '0') == '1'
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    GUNICORN_AVAILABLE = False
+
+
+def preload_models() -> bool:
+    """Models can be loaded before fork only on CPU - CUDA cannot be used across fork"""
+    if os.environ.get('RULES_ONLY') == '1':
+        return True  # Nothing to load; preloading just imports the app once
+    from model_registry import resolve_device
+    return resolve_device() == 'cpu'
+
+
+if GUNICORN_AVAILABLE:
+    class ServingApplication(BaseApplication):
+        """Gunicorn application configured in code, so it runs without a config file"""
+
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app import app, warm_up
+            if self.cfg.preload_app:
+                warm_up()
+            return app
+
+
+def post_fork(server, worker):
+    """Runs in each worker right after fork: size its torch thread pool"""
+    set_torch_threads(torch_threads_per_worker(server.cfg.workers))
+
+
+def post_worker_init(worker):
+    """Start warming the models in the worker when they were not preloaded (no-op otherwise)"""
+    from app import start_warm_up
+    start_warm_up()
+
+
+def when_ready(server):
+    server.log.info(
+        f"🚀 Serving on {', '.join(server.cfg.bind)} with {server.cfg.workers} workers x "
+        f"{server.cfg.threads} threads (models {'preloaded' if server.cfg.preload_app else 'loaded per worker'})"
+    )
+
+
+def run_development_server(host: str, port: int, threads: int) -> None:
+    """Single-process threaded fallback for platforms without Gunicorn (e.g. Windows)"""
+    print("⚠️  Gunicorn not installed (pip install gunicorn) - using the single-process threaded server")
+    from app import app, start_warm_up
+    set_torch_threads(torch_threads_per_worker(1))
+    start_warm_up()
+    app.run(host=host, port=port, debug=False, use_reloader=False, threaded=threads > 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the resume analysis service')
+    parser.add_argument('--bind', default=WEB_BIND, help='HOST:PORT to listen on')
+    parser.add_argument('--workers', type=int, default=WEB_WORKERS, help='Worker processes')
+    parser.add_argument('--threads', type=int, default=WEB_THREADS, help='Request threads per worker')
+    parser.add_argument('--rules-only', action='store_true', default=RULES_ONLY,
+                        help='Serve extraction and rule-based scoring only, without loading models')
+    args = parser.parse_args(argv)
+    if args.rules_only:
+        # app.py is imported after this (in the master or the workers) and reads it
+        os.environ['RULES_ONLY'] = '1'
+
+    if not GUNICORN_AVAILABLE:
+        host, _, port = args.bind.rpartition(':')
+        run_development_server(host or '0.0.0.0', int(port), args.threads)
+        return
+
+    ServingApplication({
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'preload_app': preload_models(),
+        'timeout': WEB_TIMEOUT,
+        'graceful_timeout': WEB_GRACEFUL_TIMEOUT,
+        'post_fork': post_fork,
+        'post_worker_init': post_worker_init,
+        'when_ready': when_ready,
+    }).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Single-Pass Lexicon Matcher
+Finds every term of a fixed vocabulary (skills, action verbs, ...) in one pass
+over the text, with the same semantics as re.search(r'\b' + re.escape(term) + r'\b')
+"""
+
+import re
+from typing import Dict, List
+
+# A maximal run of word characters - both its ends are word boundaries
+_WORD_RUN_RE = re.compile(r'\w+')
+_LEADING_WORD_RE = re.compile(r'^\w+')
+
+
+def _is_word_char(char: str) -> bool:
+    """Same definition of a word character as the re module uses for str patterns"""
+    return char.isalnum() or char == '_'
+
+
+class Lexicon:
+    """
+    Vocabulary compiled once, grouped by category
+
+    Terms are indexed by their leading run of word characters ("node" for "node.js",
+    "spring" for "spring boot"), so scanning the text is one pass over its words
+    with a dict lookup per word; only the few terms sharing that first word are
+    compared character by character.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]]):
+        # category -> terms in their original order, without duplicates
+        self.categories = {
+            category: list(dict.fromkeys(terms)) for category, terms in categories.items()
+        }
+        # leading word -> [(term, categories)]
+        self._index: Dict[str, List[tuple]] = {}
+        term_categories: Dict[str, List[str]] = {}
+        for category, terms in self.categories.items():
+            for term in terms:
+                term_categories.setdefault(term, []).append(category)
+
+        for term, term_cats in term_categories.items():
+            leading = _LEADING_WORD_RE.match(term)
+            if not leading:
+                raise ValueError(f"Lexicon terms must start with a word character: {term!r}")
+            self._index.setdefault(leading.group(), []).append((term, term_cats))
+
+        # Terms ending in a non-word character (e.g. "c++") need a word character
+        # right after them to satisfy the trailing \b
+        self._ends_with_word_char = {term: _is_word_char(term[-1]) for term in term_categories}
+
+    def scan(self, text: str) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Find all term occurrences
+
+        Args:
+            text: Text to scan (callers lowercase it, terms are lowercase)
+
+        Returns:
+            category -> {term: [start offsets]} for every term found at least once
+        """
+        found: Dict[str, Dict[str, List[int]]] = {category: {} for category in self.categories}
+        text_length = len(text)
+
+        for word in _WORD_RUN_RE.finditer(text):
+            candidates = self._index.get(word.group())
+            if not candidates:
+                continue
+            start = word.start()
+            for term, term_cats in candidates:
+                end = start + len(term)
+                if end > text_length or not text.startswith(term, start):
+                    continue
+                # Trailing \b: word-ness must change between the last char and the next
+                next_is_word = end < text_length and _is_word_char(text[end])
+                if next_is_word == self._ends_with_word_char[term]:
+                    continue
+                for category in term_cats:
+                    found[category].setdefault(term, []).append(start)
+
+        return found
+
+    def terms_found(self, category: str, matches: Dict[str, Dict[str, List[int]]]) -> List[str]:
+        """Terms of a category present in scan() results, in vocabulary order"""
+        hits = matches.get(category, {})
+        return [term for term in self.categories[category] if term in hits]
@@ -0,0 +1,134 @@
+"""
+Synthetic Corpus Generator
+Deterministic fake job postings and resumes for parity checks, benchmarks and
+the autotuner's workload (autotune.py)
+"""
+
+import random
+from typing import Dict, List
+
+TITLE_PREFIXES = [
+    '', '', '', 'Senior ', 'Sr. ', 'Junior ', 'Jr ', 'Lead ', 'Principal ', 'Staff ',
+    'Associate ', 'Graduate ', 'Entry Level ', 'Head of ', 'VP ', 'Intern - ',
+    'Assistant ', 'Mid-Level ', 'Chief '
+]
+TITLE_ROLES = [
+    'Software Engineer', 'Backend Developer', 'Frontend Developer', 'Data Analyst',
+    'Data Scientist', 'DevOps Engineer', 'Cloud Architect', 'Product Designer',
+    'QA Specialist', 'Mobile Developer', 'Machine Learning Engineer', 'Consultant',
+    'Engineering Manager', 'Full Stack Programmer', 'Support Technician'
+]
+TITLE_SUFFIXES = ['', '', '', ' I', ' II', ' III', ' IV', ' 1', ' 2', ' 3', ' (Remote)', ' - Contract']
+
+DESCRIPTION_PHRASES = [
+    'We are looking for a motivated engineer to join our team.',
+    'You will collaborate with product managers and designers.',
+    'Experience with Python, React and AWS is a plus.',
+    'Requires 5+ years of professional experience.',
+    'Requires 3-5 years of experience building web services.',
+    'Requires 2 to 4 years of experience.',
+    'Requires 8 years experience in distributed systems.',
+    '10+ years leading large engineering organisations.',
+    'Training provided for the right candidate.',
+    'You will mentor junior engineers and drive code review.',
+    'Define architecture and strategic direction company-wide.',
+    'Contribute to our open source projects and participate in planning.',
+    'Great opportunity for a recent graduate or early career developer.',
+    'Graduate student researchers welcome to apply.',
+    'Work with team members across time zones.',
+    'Strong background in algorithms and a proven track record.',
+    'Eager to learn new technologies every day.',
+    'Shadowing senior staff during onboarding with guidance from the team.',
+    'This is a level ii position on our platform team.',
+    'Competitive salary, health insurance and stock options.',
+    'Docker, Kubernetes and Terraform experience preferred.',
+    'Experience with SQL, PostgreSQL and Redis.',
+    'Summer internship for undergraduate students.',
+    'You will own technical decisions for the payments platform.',
+    'Knowledge of machine learning and NLP is beneficial.',
+]
+
+SKILL_POOL = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'Django', 'Flask',
+    'AWS', 'Docker', 'Kubernetes', 'PostgreSQL', 'MongoDB', 'Redis', 'Git', 'Linux',
+    'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'C++', 'C#', 'Go', 'GraphQL', 'REST',
+    'CI/CD', 'Terraform', 'Spring Boot', 'Machine Learning', 'Agile', 'Scrum', 'Figma'
+]
+VERBS = [
+    'Developed', 'Implemented', 'Designed', 'Built', 'Led', 'Optimized', 'Improved',
+    'Reduced', 'Increased', 'Automated', 'Migrated', 'Deployed', 'Architected', 'Managed'
+]
+OBJECTS = [
+    'a REST API serving {n}+ users', 'the CI/CD pipeline', 'a React dashboard',
+    'data ingestion jobs', 'the payments service', 'an internal CLI tool',
+    'microservices on Kubernetes', 'the search ranking model'
+]
+RESULTS = [
+    'reducing latency by {n}%', 'saving ${n}k per year', 'across {n} teams',
+    'in {n} weeks', 'improving throughput {n}x', '', '', 'with {n} engineers'
+]
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'June', 'July', 'Aug', 'Sept', 'Oct', 'Nov', 'December']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries']
+CITIES = ['Austin, Texas', 'Seattle, WA', 'Bengaluru, Karnataka', 'New York, NY', 'Berlin, Germany']
+INSTITUTIONS = ['IIT Delhi', 'Stanford University', 'NIT Trichy', 'State College of Engineering']
+
+
+def generate_jobs(count: int, seed: int = 42) -> List[Dict[str, str]]:
+    """Generate job dicts with 'title' and 'description' (mix of snippets and full descriptions)"""
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(count):
+        title = f"{rng.choice(TITLE_PREFIXES)}{rng.choice(TITLE_ROLES)}{rng.choice(TITLE_SUFFIXES)}"
+        sentence_count = rng.choice([2, 3, 4, 12, 20, 30])
+        description = ' '.join(rng.choice(DESCRIPTION_PHRASES) for _ in range(sentence_count))
+        jobs.append({'title': title, 'description': description})
+    return jobs
+
+
+def _bullet(rng: random.Random) -> str:
+    result = rng.choice(RESULTS).format(n=rng.randint(2, 90))
+    line = f"{rng.choice(VERBS)} {rng.choice(OBJECTS).format(n=rng.randint(10, 5000))}"
+    return f"• {line} {result}".rstrip()
+
+
+def generate_resume(rng: random.Random) -> str:
+    """Generate one plain-text resume in the layouts the extractors understand"""
+    name = rng.choice(['Jane Doe', 'Arjun Mehta', 'Maria Garcia', 'Wei Chen'])
+    lines = [
+        name,
+        f"{name.split()[0].lower()}@example.com | +1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        rng.choice(CITIES),
+        f"linkedin.com/in/{name.split()[0].lower()}-{rng.randint(1, 99)} | github.com/{name.split()[1].lower()}",
+        '',
+        'SUMMARY',
+        'Software engineer passionate about building reliable systems and focused on backend services.',
+        '',
+        'WORK EXPERIENCE',
+    ]
+    for _ in range(rng.randint(1, 4)):
+        start_year = rng.randint(2015, 2022)
+        end = rng.choice(['Present', f"{rng.choice(MONTHS)} {start_year + rng.randint(1, 3)}"])
+        lines.append(f"{rng.choice(COMPANIES)} - Software Engineer {rng.choice(MONTHS)} {start_year} – {end}")
+        lines.extend(_bullet(rng) for _ in range(rng.randint(2, 5)))
+    lines += ['', 'PROJECTS']
+    for index in range(rng.randint(1, 5)):
+        lines.append(f"Project {index + 1} | {', '.join(rng.sample(SKILL_POOL, 3))}")
+        lines.extend(_bullet(rng) for _ in range(rng.randint(1, 3)))
+    lines += [
+        '',
+        'EDUCATION',
+        f"B.Tech in Computer Science, {rng.choice(INSTITUTIONS)} {rng.randint(2012, 2024)}",
+        '',
+        'SKILLS',
+        ', '.join(rng.sample(SKILL_POOL, rng.randint(6, 20))),
+        '',
+        'CERTIFICATIONS',
+        'AWS Certified Developer'
+    ]
+    return '\n'.join(lines)
+
+
+def generate_resumes(count: int, seed: int = 42) -> List[str]:
+    """Generate resume texts"""
+    rng = random.Random(seed)
+    return [generate_resume(rng) for _ in range(count)]
@@ -0,0 +1,122 @@
+"""
+Request Tracing
+Leveled, sampled tracing for the scoring hot path instead of per-job log lines:
+- one logger per module, levels from TRACE_LEVEL and per module from TRACE_LEVELS
+  (e.g. "job_matcher_ml=DEBUG,app=WARNING"); messages use logging's lazy %-formatting,
+  so a disabled level costs one level check
+- a score breakdown per request (Trace) that is only recorded when someone will read it:
+  for 1 in TRACE_SAMPLE_RATE requests (logged as one JSON line) or when the request
+  asks for it with debug=true (returned in the response)
+"""
+
+import os
+import json
+import time
+import itertools
+import threading
+import logging
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterator, Optional
+
+# Configuration
+TRACE_LEVEL = os.environ.get('TRACE_LEVEL', 'INFO')
+TRACE_LEVELS = os.environ.get('TRACE_LEVELS', '')
+# Log the score breakdown of 1 in this many requests (0 = never)
+TRACE_SAMPLE_RATE = int(os.environ.get('TRACE_SAMPLE_RATE', '100'))
+
+_configured = False
+_configure_lock = threading.Lock()
+_request_counter = itertools.count(1)
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """'module=LEVEL,...' -> {module: LEVEL}"""
+    levels = {}
+    for item in spec.split(','):
+        name, _, level = item.strip().partition('=')
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging() -> None:
+    """Root handler and per-module levels (once per process)"""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        logging.basicConfig(
+            level=TRACE_LEVEL.upper(),
+            format='[%(asctime)s] %(levelname)s %(name)s - %(message)s',
+            datefmt='%H:%M:%S'
+        )
+        for name, level in parse_levels(TRACE_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+        _configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a module (use with %-style arguments, not f-strings)"""
+    configure_logging()
+    return logging.getLogger(name)
+
+
+logger = get_logger(__name__)
+
+
+class Trace:
+    """
+    Score breakdown of one request
+
+    add() is a no-op unless the trace is enabled, and callers building per-job
+    breakdowns check `enabled` first, so unsampled requests skip the work entirely.
+    """
+
+    def __init__(self, name: str, debug: bool = False, sampled: Optional[bool] = None):
+        self.name = name
+        self.debug = debug
+        if sampled is None:
+            sampled = (TRACE_SAMPLE_RATE > 0 and logger.isEnabledFor(logging.INFO)
+                       and next(_request_counter) % TRACE_SAMPLE_RATE == 0)
+        self.sampled = sampled
+        self.enabled = debug or sampled
+        self.events: List[Dict[str, Any]] = []
+        self._start = time.perf_counter()
+
+    def add(self, event: str, **fields) -> None:
+        if self.enabled:
+            self.events.append({'event': event, **fields})
+
+    def breakdown(self) -> List[Dict[str, Any]]:
+        return self.events
+
+    def finish(self) -> None:
+        """Log the breakdown of a sampled request as one line"""
+        if self.sampled and self.events:
+            logger.info("trace %s %s", self.name, json.dumps({
+                'ms': round((time.perf_counter() - self._start) * 1000, 2),
+                'events': self.events
+            }, default=str))
+
+
+# Outside start_trace() nothing is recorded
+_DISABLED = Trace('disabled', sampled=False)
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('trace', default=_DISABLED)
+
+
+def current_trace() -> Trace:
+    """The trace of the running request (a disabled one outside start_trace)"""
+    return _current_trace.get()
+
+
+@contextmanager
+def start_trace(name: str, debug: bool = False) -> Iterator[Trace]:
+    """Trace one request; code called inside records to it through current_trace()"""
+    trace = Trace(name, debug)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.finish()